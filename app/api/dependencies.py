@@ -0,0 +1,70 @@
+from fastapi import Request
+from typing import Any, Awaitable, Callable, Dict
+import hmac
+
+from app.core.config import settings
+from app.core.exceptions import ForbiddenException, NotFoundException, UnauthorizedException
+from app.core.security.api_keys import api_key_authenticator
+from app.core.security.revocation import token_revocation_list
+from app.core.security.security import verify_token
+from app.models.domain.api_key import ApiKeyInDB
+
+async def require_debug_token(request: Request) -> None:
+    """Guard for the debug API, which does not exist unless DEBUG_API_TOKEN is set"""
+    expected = settings.monitoring.DEBUG_API_TOKEN
+    if not expected:
+        raise NotFoundException()
+
+    provided = request.headers.get(settings.monitoring.DEBUG_API_TOKEN_HEADER, "")
+    if not hmac.compare_digest(provided.encode(), expected.encode()):
+        raise UnauthorizedException("Invalid debug token")
+
+def require_api_key(*scopes: str) -> Callable[[Request], Awaitable[ApiKeyInDB]]:
+    """Dependency factory: a valid API key holding every one of ``scopes``"""
+    async def dependency(request: Request) -> ApiKeyInDB:
+        if not settings.security.API_KEY_ENABLED:
+            raise NotFoundException()
+
+        provided = request.headers.get(settings.security.API_KEY_HEADER_NAME)
+        if not provided:
+            raise UnauthorizedException("Missing API key", headers={"WWW-Authenticate": "ApiKey"})
+
+        api_key = await api_key_authenticator.authenticate(provided)
+        if api_key is None:
+            raise UnauthorizedException("Invalid API key", headers={"WWW-Authenticate": "ApiKey"})
+        if not set(scopes).issubset(api_key.scopes):
+            raise ForbiddenException("API key lacks a required scope")
+
+        request.state.api_key = api_key
+        return api_key
+
+    return dependency
+
+async def get_current_user(request: Request) -> Dict[str, Any]:
+    """
+    Claims of the caller's access token, from the Authorization header or
+    the access token cookie. Revoked tokens are refused; the check is
+    in-memory unless the token's JTI hits the revocation bloom filter.
+    """
+    token = request.cookies.get(settings.security.AUTH_COOKIE_NAME)
+    authorization = request.headers.get(settings.security.AUTH_HEADER_NAME)
+    if authorization:
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() == settings.security.AUTH_TOKEN_PREFIX.lower() and credentials:
+            token = credentials
+    if not token:
+        raise UnauthorizedException("Not authenticated")
+
+    from jose import ExpiredSignatureError
+
+    try:
+        claims = verify_token(token)
+    except ExpiredSignatureError:
+        raise UnauthorizedException("Token expired")
+    if claims is None or "sub" not in claims:
+        raise UnauthorizedException("Invalid token")
+    if await token_revocation_list.is_revoked(claims):
+        raise UnauthorizedException("Token revoked")
+
+    request.state.token_claims = claims
+    return claims
\ No newline at end of file
@@ -0,0 +1,57 @@
+from fastapi.routing import APIRoute
+from typing import Any, Callable, Coroutine
+from time import perf_counter
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.idempotency import idempotency_store
+from app.core.monitoring.timing import get_request_timings, track_timing
+
+class TimedRoute(APIRoute):
+    """
+    Route that splits its time into the endpoint itself ("handler") and the
+    FastAPI work around it ("serialize": body parsing, request validation
+    and response model serialization).
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        # include_router() re-creates routes from route.endpoint, so only wrap once
+        if not getattr(endpoint, "_timed_handler", False):
+            endpoint = track_timing("handler")(endpoint)
+            endpoint._timed_handler = True
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def timed_route_handler(request: Request) -> Response:
+            timings = get_request_timings()
+            if timings is None:
+                return await route_handler(request)
+
+            handler_before = timings.total("handler")
+            start = perf_counter()
+            response = await route_handler(request)
+            handler_time = timings.total("handler") - handler_before
+            timings.record("serialize", perf_counter() - start - handler_time)
+            return response
+
+        return timed_route_handler
+
+class IdempotentRoute(TimedRoute):
+    """
+    TimedRoute whose POST requests honour an Idempotency-Key header: the
+    endpoint runs once per caller, key and body, and retries get the stored
+    response back.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def idempotent_route_handler(request: Request) -> Response:
+            key = request.headers.get(settings.app.IDEMPOTENCY_HEADER)
+            if key is None or request.method != "POST" or not settings.app.IDEMPOTENCY_ENABLED:
+                return await route_handler(request)
+            return await idempotency_store.run(key, request, lambda: route_handler(request))
+
+        return idempotent_route_handler
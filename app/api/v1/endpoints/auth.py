@@ -1,13 +1,14 @@
 from fastapi import APIRouter, status
 
-from app.schemas.auth import TokenResponse
+from app.api.routing import IdempotentRoute
+from app.schemas.auth import MessageResponse
 from app.services.auth_service import AuthService
 from app.controllers.auth_controller import AuthController
 
 class AuthRouter:
     def __init__(self, auth_service: AuthService):
         self.controller = AuthController(auth_service)
-        self.router = APIRouter()
+        self.router = APIRouter(route_class=IdempotentRoute)
         self.setup_routes()
 
     def setup_routes(self):
@@ -15,18 +16,30 @@ class AuthRouter:
             "/register",
             self.controller.register,
             methods=["POST"],
-            response_model=TokenResponse,
+            response_model=MessageResponse,
             status_code=status.HTTP_201_CREATED
         )
         self.router.add_api_route(
             "/login",
             self.controller.login,
             methods=["POST"],
-            response_model=TokenResponse
+            response_model=MessageResponse
         )
         self.router.add_api_route(
             "/refresh",
             self.controller.refresh_token,
             methods=["POST"],
-            response_model=TokenResponse
+            response_model=MessageResponse
         )
+        self.router.add_api_route(
+            "/logout",
+            self.controller.logout,
+            methods=["POST"],
+            response_model=MessageResponse
+        )
+        self.router.add_api_route(
+            "/logout-all",
+            self.controller.logout_all,
+            methods=["POST"],
+            response_model=MessageResponse
+        )
\ No newline at end of file
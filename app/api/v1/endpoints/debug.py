@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies import require_debug_token
+from app.api.routing import TimedRoute
+from app.controllers.debug_controller import DebugController
+
+class DebugRouter:
+    def __init__(self):
+        self.controller = DebugController()
+        self.router = APIRouter(
+            route_class=TimedRoute,
+            dependencies=[Depends(require_debug_token)]
+        )
+        self.setup_routes()
+
+    def setup_routes(self):
+        self.router.add_api_route(
+            "/profiles",
+            self.controller.list_profiles,
+            methods=["GET"]
+        )
+        self.router.add_api_route(
+            "/profiles/{request_id}",
+            self.controller.get_profile,
+            methods=["GET"]
+        )
+        self.router.add_api_route(
+            "/memory",
+            self.controller.get_memory,
+            methods=["GET"]
+        )
+        self.router.add_api_route(
+            "/memory/tracemalloc/start",
+            self.controller.start_tracemalloc,
+            methods=["POST"]
+        )
+        self.router.add_api_route(
+            "/memory/tracemalloc/stop",
+            self.controller.stop_tracemalloc,
+            methods=["POST"]
+        )
+        self.router.add_api_route(
+            "/memory/snapshots",
+            self.controller.take_snapshot,
+            methods=["POST"]
+        )
+        self.router.add_api_route(
+            "/memory/snapshots/diff",
+            self.controller.diff_snapshots,
+            methods=["GET"]
+        )
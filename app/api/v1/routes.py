@@ -2,6 +2,7 @@ from fastapi import APIRouter
 from app.repositories import UserRepository, ProfileRepository
 from app.services.auth_service import AuthService
 from .endpoints.auth import AuthRouter
+from .endpoints.debug import DebugRouter
 from app.core.db import mongodb
 
 def create_api_router() -> APIRouter:
@@ -13,7 +14,9 @@ def create_api_router() -> APIRouter:
     auth_service = AuthService(user_repository, profile_repository)
     
     auth_router = AuthRouter(auth_service)
+    debug_router = DebugRouter()
     
     api_router.include_router(auth_router.router, prefix="/auth", tags=["Authentication"])
+    api_router.include_router(debug_router.router, prefix="/debug", tags=["Debug"], include_in_schema=False)
     
     return api_router
\ No newline at end of file
@@ -1,9 +1,10 @@
-from fastapi import Response
+from fastapi import Depends, Response
 from typing import Dict, Any
 
 from app.models.domain import SignupRequest
 from app.schemas.auth import UserLogin, RefreshTokenRequest
 from app.services.auth_service import AuthService
+from app.api.dependencies import get_current_user
 from app.core.config import settings
 from app.core.monitoring.decorators import monitor_transaction
 
@@ -34,7 +35,7 @@ class AuthController:
     def clear_auth_cookies(self, response: Response) -> None:
         """Clear authentication cookies"""
         response.delete_cookie(key="access_token", path="/")
-        response.delete_cookie(key="refresh_token", path="/api/v1/auth/refresh")
+        response.delete_cookie(key="refresh_token", path="/")
 
     # async def get_current_user(self, token: str):
     #     """Dependency to get current authenticated user"""
@@ -69,3 +70,15 @@ class AuthController:
         )
         self.set_auth_cookies(response, access_token, refresh_token)
         return {"message": "Token refresh successful"}
+
+    @monitor_transaction(op="api.auth.logout", tags={"endpoint": "auth->logout"})
+    async def logout(self, response: Response, claims: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+        await self.auth_service.logout(claims)
+        self.clear_auth_cookies(response)
+        return {"message": "Logout successful"}
+
+    @monitor_transaction(op="api.auth.logout_all", tags={"endpoint": "auth->logout_all"})
+    async def logout_all(self, response: Response, claims: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+        await self.auth_service.revoke_all_sessions(claims["sub"])
+        self.clear_auth_cookies(response)
+        return {"message": "All sessions revoked"}
\ No newline at end of file
@@ -0,0 +1,47 @@
+from typing import Dict, Any
+import asyncio
+
+from app.core.exceptions import BadRequestException, NotFoundException
+from app.core.monitoring.memory import memory_summary, tracemalloc_tracker
+from app.core.monitoring.profiler import profile_store
+
+class DebugController:
+    async def list_profiles(self) -> Dict[str, Any]:
+        """Summaries of stored request profiles, newest first"""
+        return {"profiles": [profile.summary() for profile in profile_store.list()]}
+
+    async def get_profile(self, request_id: str) -> Dict[str, Any]:
+        """Full call tree of the profile recorded for a request ID"""
+        profile = profile_store.get(request_id)
+        if not profile:
+            raise NotFoundException(f"No profile stored for request {request_id}")
+        return profile.to_dict()
+
+    async def get_memory(self) -> Dict[str, Any]:
+        """RSS, GC counters, in-memory structure sizes and tracemalloc status"""
+        return memory_summary()
+
+    async def start_tracemalloc(self, frames: int = 1) -> Dict[str, Any]:
+        tracemalloc_tracker.start(frames)
+        return tracemalloc_tracker.status()
+
+    async def stop_tracemalloc(self) -> Dict[str, Any]:
+        tracemalloc_tracker.stop()
+        return tracemalloc_tracker.status()
+
+    async def take_snapshot(self) -> Dict[str, Any]:
+        if not tracemalloc_tracker.status()["tracing"]:
+            raise BadRequestException("tracemalloc is not running")
+        snapshot_id = await asyncio.to_thread(tracemalloc_tracker.take_snapshot)
+        return {"snapshot_id": snapshot_id, **tracemalloc_tracker.status()}
+
+    async def diff_snapshots(self, base: int, target: int, limit: int = 25) -> Dict[str, Any]:
+        """Allocation growth between two snapshots, grouped by file and line"""
+        base_snapshot = tracemalloc_tracker.get(base)
+        target_snapshot = tracemalloc_tracker.get(target)
+        if not base_snapshot or not target_snapshot:
+            raise NotFoundException("Unknown snapshot id")
+        stats = await asyncio.to_thread(
+            tracemalloc_tracker.diff, base_snapshot, target_snapshot, limit
+        )
+        return {"base": base, "target": target, "stats": stats}
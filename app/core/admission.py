@@ -0,0 +1,114 @@
+from collections import deque
+from typing import Deque, Optional
+import asyncio
+
+from .monitoring.metrics import registry
+
+admission_limit = registry.gauge(
+    "admission_concurrency_limit",
+    "Current adaptive in-flight limit",
+    labelnames=("limiter",)
+)
+admission_in_flight = registry.gauge(
+    "admission_in_flight",
+    "Requests currently admitted",
+    labelnames=("limiter",)
+)
+admission_queued = registry.gauge(
+    "admission_queued",
+    "Requests waiting for an admission slot",
+    labelnames=("limiter",)
+)
+admission_shed_total = registry.counter(
+    "admission_shed_total",
+    "Requests rejected by admission control",
+    labelnames=("limiter", "reason")
+)
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter driven by observed latency.
+
+    Every completed request moves the limit: additively up by 1/limit when
+    it finished within ``target_latency``, multiplicatively down by
+    ``backoff`` when it was slower or failed. Requests over the limit wait
+    in a FIFO queue for at most ``queue_timeout`` seconds and are rejected
+    outright once ``max_queue`` requests are already waiting.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 50,
+        min_limit: int = 5,
+        max_limit: int = 500,
+        target_latency: float = 0.25,
+        queue_timeout: float = 0.5,
+        max_queue: int = 100,
+        backoff: float = 0.9
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.backoff = backoff
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        admission_limit.set(self.limit, limiter=name)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> Optional[str]:
+        """Take a slot; returns None on success or the reason it was refused."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self._admit()
+            return None
+        if len(self._waiters) >= self.max_queue:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        admission_queued.set(len(self._waiters), limiter=self.name)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+            return None
+        except asyncio.TimeoutError:
+            return "queue_timeout"
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before cancellation
+            if waiter.done() and not waiter.cancelled():
+                self.release(None)
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+            admission_queued.set(len(self._waiters), limiter=self.name)
+
+    def release(self, latency: Optional[float]) -> None:
+        """Return a slot; ``latency`` is None when the request failed."""
+        self.in_flight -= 1
+        if latency is not None and latency <= self.target_latency:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+        else:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        admission_limit.set(self.limit, limiter=self.name)
+        admission_in_flight.set(self.in_flight, limiter=self.name)
+        self._wake_waiters()
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        admission_in_flight.set(self.in_flight, limiter=self.name)
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._admit()
+                waiter.set_result(None)
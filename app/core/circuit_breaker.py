@@ -0,0 +1,211 @@
+from collections import deque
+from enum import Enum
+from functools import wraps
+from math import ceil
+from time import monotonic, perf_counter
+from typing import Callable, Deque, Dict, Optional, Tuple
+import logging
+
+from pymongo.errors import ConnectionFailure, ExecutionTimeout, PyMongoError, WTimeoutError
+
+from .config import settings
+from .exceptions import ConnectionException
+from .monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+STATE_VALUES = {BreakerState.CLOSED: 0, BreakerState.HALF_OPEN: 1, BreakerState.OPEN: 2}
+
+breaker_state = registry.gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    labelnames=("breaker",)
+)
+breaker_transitions_total = registry.counter(
+    "circuit_breaker_transitions_total",
+    "Circuit breaker state changes",
+    labelnames=("breaker", "state")
+)
+breaker_rejected_total = registry.counter(
+    "circuit_breaker_rejected_total",
+    "Calls rejected without reaching the database",
+    labelnames=("breaker",)
+)
+
+def is_connection_error(exc: Optional[BaseException]) -> bool:
+    """
+    Whether ``exc`` (or anything in its cause chain) means the database is
+    unhealthy, as opposed to a problem with the request itself such as a
+    duplicate key.
+    """
+    while exc is not None:
+        if isinstance(exc, (ConnectionFailure, ExecutionTimeout, WTimeoutError)):
+            return True
+        if isinstance(exc, PyMongoError) and exc.timeout:
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+class CircuitBreaker:
+    """
+    Count-based circuit breaker.
+
+    Closed: outcomes of the last ``window_size`` calls are kept, and once at
+    least ``min_calls`` are recorded the breaker opens when the failure rate
+    or the rate of calls slower than ``slow_call_threshold`` reaches its
+    threshold. Open: calls fail immediately for ``open_duration`` seconds.
+    Half-open: up to ``half_open_calls`` probes are let through; one failed
+    or slow probe reopens the breaker, all of them succeeding closes it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 50,
+        min_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        slow_call_threshold: float = 1.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_duration: float = 10.0,
+        half_open_calls: int = 3
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+
+        self.state = BreakerState.CLOSED
+        # (failed, slow) per call
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        breaker_state.set(STATE_VALUES[self.state], breaker=name)
+
+    def before_call(self) -> bool:
+        """
+        Admit a call or raise ``ConnectionException``.
+        Returns whether the call is a half-open probe.
+        """
+        if self.state == BreakerState.OPEN:
+            remaining = self._opened_at + self.open_duration - monotonic()
+            if remaining > 0:
+                self._reject(remaining)
+            self._transition(BreakerState.HALF_OPEN)
+
+        if self.state == BreakerState.HALF_OPEN:
+            if self._probes_in_flight + self._probe_successes >= self.half_open_calls:
+                self._reject(self.open_duration)
+            self._probes_in_flight += 1
+            return True
+        return False
+
+    def after_call(self, probe: bool, duration: float, failed: bool) -> None:
+        slow = duration >= self.slow_call_threshold
+        if probe:
+            if self.state != BreakerState.HALF_OPEN:
+                return
+            self._probes_in_flight -= 1
+            if failed or slow:
+                self._transition(BreakerState.OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_calls:
+                self._transition(BreakerState.CLOSED)
+            return
+
+        # Calls admitted before the breaker left the closed state are ignored
+        if self.state != BreakerState.CLOSED:
+            return
+        self._outcomes.append((failed, slow))
+        calls = len(self._outcomes)
+        if calls < self.min_calls:
+            return
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow_calls = sum(1 for _, slow in self._outcomes if slow)
+        if (
+            failures / calls >= self.failure_rate_threshold
+            or slow_calls / calls >= self.slow_call_rate_threshold
+        ):
+            self._transition(BreakerState.OPEN)
+
+    def abandon(self, probe: bool) -> None:
+        """A call ended without an outcome, e.g. it was cancelled."""
+        if probe and self.state == BreakerState.HALF_OPEN:
+            self._probes_in_flight -= 1
+
+    def _reject(self, retry_after: float) -> None:
+        breaker_rejected_total.inc(breaker=self.name)
+        raise ConnectionException(
+            message="Database temporarily unavailable",
+            headers={"Retry-After": str(max(1, ceil(retry_after)))}
+        )
+
+    def _transition(self, state: BreakerState) -> None:
+        previous = self.state
+        self.state = state
+        self._outcomes.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == BreakerState.OPEN:
+            self._opened_at = monotonic()
+        breaker_state.set(STATE_VALUES[state], breaker=self.name)
+        breaker_transitions_total.inc(breaker=self.name, state=state.value)
+        log = logger.warning if state == BreakerState.OPEN else logger.info
+        log(
+            f"Circuit breaker {self.name} {state.value}",
+            extra={"breaker": self.name, "from_state": previous.value, "to_state": state.value}
+        )
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(
+            name,
+            window_size=settings.db.MONGODB_BREAKER_WINDOW_SIZE,
+            min_calls=settings.db.MONGODB_BREAKER_MIN_CALLS,
+            failure_rate_threshold=settings.db.MONGODB_BREAKER_FAILURE_RATE,
+            slow_call_threshold=settings.db.MONGODB_BREAKER_SLOW_CALL_THRESHOLD,
+            slow_call_rate_threshold=settings.db.MONGODB_BREAKER_SLOW_CALL_RATE,
+            open_duration=settings.db.MONGODB_BREAKER_OPEN_SECONDS,
+            half_open_calls=settings.db.MONGODB_BREAKER_HALF_OPEN_CALLS
+        )
+    return breaker
+
+def circuit_breaker(name: str) -> Callable:
+    """
+    Guard an async repository method with the breaker called ``name``.
+    Methods doing the same kind of operation share one breaker.
+    """
+    def decorator(func: Callable) -> Callable:
+        if not settings.db.MONGODB_BREAKER_ENABLED:
+            return func
+        breaker = get_circuit_breaker(name)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            probe = breaker.before_call()
+            start_time = perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                breaker.after_call(probe, perf_counter() - start_time, is_connection_error(e))
+                raise
+            except BaseException:
+                breaker.abandon(probe)
+                raise
+            breaker.after_call(probe, perf_counter() - start_time, False)
+            return result
+
+        return wrapper
+    return decorator
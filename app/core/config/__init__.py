@@ -5,6 +5,7 @@ from .logging import LoggingSettings
 from .cache import CacheSettings
 from .email import EmailSettings
 from .aws import AWSSettings
+from .monitoring import MonitoringSettings
 from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Any, Dict, List
@@ -17,6 +18,7 @@ class Settings(BaseSettings):
     cache: CacheSettings = CacheSettings()
     email: EmailSettings = EmailSettings()
     aws: AWSSettings = AWSSettings()
+    monitoring: MonitoringSettings = MonitoringSettings()
 
     class Config:
         case_sensitive = True
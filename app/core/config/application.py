@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 
 class EnvironmentType(str, Enum):
@@ -23,26 +23,94 @@ class ApplicationSettings(BaseSettings):
     # Server Settings
     HOST: str = "0.0.0.0"
     PORT: int = 8000
-    WORKERS_COUNT: int = 4
+    WORKERS_COUNT: int = 0  # 0 sizes workers from the CPU quota
     RELOAD: bool = False
+    SERVER_PRELOAD: bool = True  # import the app in the master before forking
+    SERVER_REUSE_PORT: bool = False  # per-worker SO_REUSEPORT sockets instead of one shared socket
+    SERVER_BACKLOG: int = 2048
+    SERVER_MAX_REQUESTS: int = 0  # recycle a worker after this many requests, 0 never
+    SERVER_MAX_REQUESTS_JITTER: int = 0
+    SERVER_MAX_RSS_MB: int = 0  # recycle a worker above this RSS, 0 never
     
     # CORS Settings (TODO: add only allowed ones)
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
     ALLOWED_HOSTS: List[str] = ["*.myapp.com", "localhost"] 
+    CORS_MAX_AGE: int = 3600  # seconds browsers may cache a preflight (Chromium caps at 7200)
     
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_BURST: int = 100
     RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_MAX_CLIENTS: int = 100_000  # LRU bound on tracked clients
+    # Tokens a request costs (default 1); credential checks run bcrypt
+    RATE_LIMIT_ROUTE_COSTS: Dict[str, float] = {
+        "/api/v1/auth/login": 10,
+        "/api/v1/auth/register": 10,
+        "/api/v1/auth/refresh": 2,
+    }
+
+    # Admission Control
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_INITIAL_LIMIT: int = 50
+    ADMISSION_MIN_LIMIT: int = 5
+    ADMISSION_MAX_LIMIT: int = 500
+    ADMISSION_TARGET_LATENCY: float = 0.25
+    ADMISSION_QUEUE_TIMEOUT: float = 0.5
+    ADMISSION_MAX_QUEUE: int = 100
+    ADMISSION_RETRY_AFTER: int = 1
+    # Path -> overrides of the settings above (initial_limit, min_limit, ...)
+    ADMISSION_ROUTE_LIMITS: Dict[str, Dict[str, float]] = {
+        "/api/v1/auth/login": {
+            "initial_limit": 8, "min_limit": 2, "max_limit": 32, "target_latency": 0.6
+        },
+        "/api/v1/auth/register": {
+            "initial_limit": 4, "min_limit": 1, "max_limit": 16, "target_latency": 0.6
+        },
+    }
+    
+    # Priority Scheduling
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_CAPACITY: int = 64  # Shared concurrent request slots per worker
+    SCHEDULER_QUEUE_TIMEOUT: float = 5.0
+    SCHEDULER_MAX_QUEUE: int = 256
+    # Class -> weight (share under contention) and reserved slots outside the shared pool
+    SCHEDULER_CLASSES: Dict[str, Dict[str, float]] = {
+        "health": {"weight": 8, "reserved": 2},
+        "auth_refresh": {"weight": 4},
+        "login": {"weight": 1},
+        "default": {"weight": 4},
+    }
+    SCHEDULER_ROUTE_CLASSES: Dict[str, str] = {
+        "/health": "health",
+        "/metrics": "health",
+        "/api/v1/auth/refresh": "auth_refresh",
+        "/api/v1/auth/login": "login",
+        "/api/v1/auth/register": "login",
+    }
     
+    # Idempotency-Key support on POST routes using IdempotentRoute
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_HEADER: str = "Idempotency-Key"
+    IDEMPOTENCY_TTL: float = 3600.0  # seconds a completed response is replayed
+    IDEMPOTENCY_LEASE: float = 60.0  # seconds a pending key holds off retries, at least MIDDLEWARE_TIMEOUT
+
     # Documentation Settings
     DOCS_URL: str = "/api/docs"
     REDOC_URL: str = "/api/redoc"
     OPENAPI_URL: str = "/api/openapi.json"
     
+    # Warmup before reporting healthy
+    WARMUP_ENABLED: bool = True
+    WARMUP_TIMEOUT: float = 30.0
+    
+    # Graceful Shutdown
+    SHUTDOWN_DRAIN_DELAY: float = 5.0  # seconds readiness fails after SIGTERM before shutdown starts
+    SHUTDOWN_TIMEOUT: float = 20.0  # max wait for in-flight requests and background tasks
+    SHUTDOWN_FLUSH_TIMEOUT: float = 5.0
+    
     # Middleware Settings
     MIDDLEWARE_GZIP_MINIMUM_SIZE: int = 1000
-    MIDDLEWARE_TIMEOUT: int = 60
+    MIDDLEWARE_TIMEOUT: int = 60  # Per-request deadline in seconds, 0 disables it
 
     class Config:
         env_prefix = "APP_"
@@ -11,6 +11,24 @@ class DatabaseSettings(BaseSettings):
     MONGODB_TLS: bool = True  # Atlas requires TLS
     MONGODB_TLS_CERT_PATH: Optional[str] = None
     MONGODB_AUTH_SOURCE: str = "admin"
+
+    # Retries of transient errors in repository operations
+    MONGODB_RETRY_ENABLED: bool = True
+    MONGODB_RETRY_ATTEMPTS: int = 3  # Including the first attempt
+    MONGODB_RETRY_BASE_DELAY: float = 0.05  # Seconds
+    MONGODB_RETRY_MAX_DELAY: float = 1.0
+    MONGODB_RETRY_BUDGET_RATIO: float = 0.1  # Retries earned per successful call
+    MONGODB_RETRY_BUDGET_MAX_TOKENS: float = 10.0
+
+    # Circuit breaker around repository operations
+    MONGODB_BREAKER_ENABLED: bool = True
+    MONGODB_BREAKER_WINDOW_SIZE: int = 50  # Calls kept to compute the rates
+    MONGODB_BREAKER_MIN_CALLS: int = 10
+    MONGODB_BREAKER_FAILURE_RATE: float = 0.5
+    MONGODB_BREAKER_SLOW_CALL_THRESHOLD: float = 1.0  # Seconds
+    MONGODB_BREAKER_SLOW_CALL_RATE: float = 0.8
+    MONGODB_BREAKER_OPEN_SECONDS: float = 10.0
+    MONGODB_BREAKER_HALF_OPEN_CALLS: int = 3
     
     @property
     def mongodb_connection_params(self) -> Dict[str, Any]:
@@ -24,11 +24,29 @@ class LoggingSettings(BaseSettings):
     LOG_FILE_MAX_SIZE: int = 10485760
     LOG_FILE_BACKUP_COUNT: int = 5
     LOG_FILE_ENCODING: str = "utf-8"
+    LOG_FILE_COMPRESS: bool = True
     
     # Console Logging
     LOG_TO_CONSOLE: bool = True
     CONSOLE_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
+    # Access Log Sampling
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0  # fraction of fast 2xx/3xx requests logged
+    ACCESS_LOG_SLOW_THRESHOLD: float = 1.0  # seconds; slower requests are always logged
+    ACCESS_LOG_ROUTE_SAMPLE_RATES: Dict[str, float] = {}  # path -> sample rate override
+    
+    # Queued Logging
+    QUEUE_ENABLED: bool = True
+    QUEUE_SIZE: int = 10000
+    QUEUE_HEADROOM: int = 1000  # extra slots reserved for WARNING and above
+    QUEUE_BATCH_SIZE: int = 500
+    QUEUE_FLUSH_INTERVAL: float = 1.0
+    
+    # Error Log Aggregation (repeats of one error are summarized per interval)
+    ERROR_AGGREGATION_ENABLED: bool = True
+    ERROR_AGGREGATION_INTERVAL: float = 60.0
+    ERROR_AGGREGATION_MAX_FINGERPRINTS: int = 1000
+    
     # Sentry Integration
     SENTRY_ENABLED: bool = False
     SENTRY_DSN: Optional[str] = None
@@ -51,17 +69,18 @@ class LoggingSettings(BaseSettings):
             },
             "handlers": {
                 "console": {
-                    "class": "logging.StreamHandler",
+                    "class": "app.core.log_queue.BatchStreamHandler",
                     "formatter": "json" if self.FORMAT == LogFormat.JSON else "standard",
                     "level": self.LEVEL.value
                 },
                 "file": {
-                    "class": "logging.handlers.RotatingFileHandler",
+                    "class": "app.core.log_queue.CompressingRotatingFileHandler",
                     "filename": self.LOG_FILE_PATH,
                     "maxBytes": self.LOG_FILE_MAX_SIZE,
                     "backupCount": self.LOG_FILE_BACKUP_COUNT,
                     "formatter": "json" if self.FORMAT == LogFormat.JSON else "standard",
-                    "encoding": self.LOG_FILE_ENCODING
+                    "encoding": self.LOG_FILE_ENCODING,
+                    "compress": self.LOG_FILE_COMPRESS
                 }
             },
             "root": {
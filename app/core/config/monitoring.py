@@ -0,0 +1,48 @@
+from pydantic_settings import BaseSettings
+from typing import Dict, Optional
+
+class MonitoringSettings(BaseSettings):
+    # Request Timing
+    SERVER_TIMING_ENABLED: bool = True
+    SLOW_REQUEST_THRESHOLD: float = 0.5  # seconds
+
+    # Metrics
+    METRICS_ENABLED: bool = True
+    METRICS_PATH: str = "/metrics"
+
+    # Event Loop Monitor
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL: float = 0.1  # seconds between lag probes
+    LOOP_BLOCK_THRESHOLD: float = 0.1  # seconds a callback may hold the loop
+    LOOP_REPORT_INTERVAL: float = 60.0  # seconds between lag summary logs
+
+    # Health Probes
+    HEALTH_LIVE_PATH: str = "/health/live"
+    HEALTH_READY_PATH: str = "/health/ready"
+    HEALTH_REFRESH_INTERVAL: float = 2.0  # seconds between dependency checks
+    HEALTH_STALE_AFTER: float = 10.0  # snapshot older than this reports not ready
+    HEALTH_PING_TIMEOUT: float = 1.0
+    HEALTH_MAX_POOL_SATURATION: float = 0.95  # checked-out / max pool size
+    HEALTH_MAX_HASH_QUEUE: int = 32  # password hashes waiting for a worker
+    HEALTH_MAX_LOOP_LAG: float = 0.5  # seconds
+
+    # Request Profiling
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER_NAME: str = "X-Profile-Token"
+    PROFILING_ROUTE_SAMPLE_RATES: Dict[str, float] = {}  # path -> fraction profiled
+    PROFILING_SAMPLE_INTERVAL: float = 0.005  # seconds between stack samples
+    PROFILING_MAX_DURATION: float = 30.0  # stop sampling a request after this long
+    PROFILING_MAX_PROFILES: int = 50
+
+    # Memory Introspection
+    MEMORY_REPORTER_ENABLED: bool = True
+    MEMORY_REPORT_INTERVAL: float = 30.0  # seconds between RSS/GC metric updates
+    MEMORY_MAX_SNAPSHOTS: int = 5
+
+    # Debug API
+    DEBUG_API_TOKEN: Optional[str] = None  # debug endpoints are disabled when unset
+    DEBUG_API_TOKEN_HEADER: str = "X-Debug-Token"
+
+    class Config:
+        env_prefix = "MONITORING_"
+        extra = "allow"
@@ -1,19 +1,46 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from typing import Optional, List
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
+import hashlib
+import hmac
 
 class SecuritySettings(BaseSettings):
     # JWT Settings
     SECRET_KEY: str
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "ES256"  # ES256 signs with rotating keys published as a JWKS; HS256 signs with SECRET_KEY
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     COOKIE_SECURE: bool = False
 
+    # ES256 signing keys (kept in MongoDB, one per rotation period)
+    JWT_KEY_ROTATION_DAYS: float = 30.0
+    JWT_KEYRING_REFRESH_INTERVAL: float = 60.0  # seconds between keyring reloads
+    # Until when SECRET_KEY-signed tokens from before the switch are still
+    # accepted; unset, one token lifetime after startup. Pin it across restarts
+    JWT_LEGACY_HS256_ACCEPT_UNTIL: Optional[datetime] = None
+    JWKS_PATH: str = "/.well-known/jwks.json"
+    JWKS_MAX_AGE: int = 300  # Cache-Control max-age for JWKS consumers
+
+    # Access token revocation (jti denylist mirrored in a per-worker bloom filter)
+    REVOCATION_REFRESH_INTERVAL: float = 2.0  # seconds between incremental pulls
+    REVOCATION_REBUILD_INTERVAL: float = 1800.0  # seconds between full rebuilds
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+
     # Password Settings
     PASSWORD_MIN_LENGTH: int = 8
     PASSWORD_MAX_LENGTH: int = 50
     PASSWORD_REGEX: str = r"^(?=.*[A-Za-z])(?=.*\d)[A-Za-z\d]{8,}$"
+    PASSWORD_HASH_WORKERS: int = 4  # Threads running bcrypt off the event loop
+
+    # Failed-login throttle (per account, keyed on the normalized email)
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_FREE_ATTEMPTS: int = 5  # failures before delays start
+    LOGIN_BASE_DELAY: float = 1.0  # seconds, doubled per further failure
+    LOGIN_MAX_DELAY: float = 900.0
+    LOGIN_FAILURE_TTL: float = 3600.0  # forget an account's failures after this long
+    LOGIN_THROTTLE_MAX_ENTRIES: int = 100_000
     
     # Authentication Settings
     AUTH_HEADER_NAME: str = "Authorization"
@@ -26,6 +53,11 @@ class SecuritySettings(BaseSettings):
     # API Key Settings
     API_KEY_HEADER_NAME: str = "X-API-Key"
     API_KEY_ENABLED: bool = True
+    API_KEY_PREFIX: str = "ak_"
+    API_KEY_HMAC_SECRET: Optional[str] = None  # defaults to a key derived from SECRET_KEY
+    API_KEY_CACHE_TTL: float = 60.0  # seconds a resolved key is trusted without the DB
+    API_KEY_NEGATIVE_CACHE_TTL: float = 5.0  # seconds an unknown key is remembered
+    API_KEY_CACHE_MAX_ENTRIES: int = 10_000
     
     # CSRF Protection
     CSRF_ENABLED: bool = True
@@ -43,9 +75,16 @@ class SecuritySettings(BaseSettings):
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_STORAGE: str = "memory"
     
-    # IP Filtering
+    # IP Filtering (CIDRs; an empty whitelist allows everyone not blacklisted)
     IP_WHITELIST: List[str] = []
     IP_BLACKLIST: List[str] = []
+    IP_WHITELIST_FILE: Optional[str] = None  # one CIDR per line, reloaded on change
+    IP_BLACKLIST_FILE: Optional[str] = None
+    IP_LIST_RELOAD_INTERVAL: float = 5.0  # seconds between file mtime checks
+
+    # Proxies whose forwarded-for header is trusted for the client IP
+    TRUSTED_PROXIES: List[str] = []
+    FORWARDED_FOR_HEADER: str = "X-Forwarded-For"
     
     @property
     def access_token_expires(self) -> timedelta:
@@ -55,6 +94,30 @@ class SecuritySettings(BaseSettings):
     def refresh_token_expires(self) -> timedelta:
         return timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
 
+    @model_validator(mode="after")
+    def _legacy_hs256_window(self) -> "SecuritySettings":
+        accept_until = self.JWT_LEGACY_HS256_ACCEPT_UNTIL
+        if accept_until is None:
+            accept_until = datetime.utcnow() + self.access_token_expires
+        elif accept_until.tzinfo is not None:
+            accept_until = accept_until.astimezone(timezone.utc).replace(tzinfo=None)
+        self.JWT_LEGACY_HS256_ACCEPT_UNTIL = accept_until
+        return self
+
+    def derive_key(self, purpose: str, length: int = 32) -> bytes:
+        """
+        Key for one use of SECRET_KEY, so no two uses share key material
+
+        Args:
+            purpose: Label naming the use, e.g. "api-key-hmac"
+            length: Key length in bytes, at most 32
+
+        Returns:
+            HKDF-SHA256 (RFC 5869) output for the purpose
+        """
+        prk = hmac.new(b"\0" * hashlib.sha256().digest_size, self.SECRET_KEY.encode(), hashlib.sha256).digest()
+        return hmac.new(prk, purpose.encode() + b"\x01", hashlib.sha256).digest()[:length]
+
     class Config:
         env_prefix = "SECURITY_"
         extra = "allow"
\ No newline at end of file
@@ -1,16 +1,81 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional
+from pymongo import monitoring
+from typing import TYPE_CHECKING, Dict, Optional
 import logging
+import threading
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
 
 logger = logging.getLogger(__name__)
 
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Tracks connection pool usage across all servers from driver events."""
+
+    def __init__(self):
+        self.open_connections = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "open": self.open_connections,
+                "checked_out": self.checked_out,
+                "waiting": self.waiting
+            }
+
+    def _adjust(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def connection_created(self, event) -> None:
+        self._adjust(open_connections=1)
+
+    def connection_closed(self, event) -> None:
+        self._adjust(open_connections=-1)
+
+    def connection_check_out_started(self, event) -> None:
+        self._adjust(waiting=1)
+
+    def connection_check_out_failed(self, event) -> None:
+        self._adjust(waiting=-1)
+
+    def connection_checked_out(self, event) -> None:
+        self._adjust(waiting=-1, checked_out=1)
+
+    def connection_checked_in(self, event) -> None:
+        self._adjust(checked_out=-1)
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
 class MongoDBConnector:
-    client: Optional[AsyncIOMotorClient] = None
+    client: Optional["AsyncIOMotorClient"] = None
+    pool_monitor: PoolMonitor = PoolMonitor()
 
     async def connect_to_mongodb(self, db_url: str, **kwargs):
+        # Motor is only needed once we connect, not to import the app
+        from motor.motor_asyncio import AsyncIOMotorClient
+
         logger.info("Connecting to MongoDB...")
         try:
-            self.client = AsyncIOMotorClient(db_url, **kwargs)
+            self.client = AsyncIOMotorClient(
+                db_url, event_listeners=[self.pool_monitor], **kwargs
+            )
             await self.client.admin.command('ping')
             logger.info("Successfully connected to MongoDB")
         except Exception as e:
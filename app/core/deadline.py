@@ -0,0 +1,48 @@
+from contextlib import nullcontext
+from contextvars import ContextVar, Token
+from time import monotonic
+from typing import ContextManager, Optional
+
+import pymongo
+
+from .monitoring.metrics import registry
+
+# Minimum budget handed to the driver so an almost-expired deadline still
+# fails fast inside pymongo instead of meaning "no timeout"
+MIN_OPERATION_TIMEOUT = 0.001
+
+_request_deadline: ContextVar[Optional[float]] = ContextVar(
+    "request_deadline", default=None
+)
+
+deadline_exceeded_total = registry.counter(
+    "request_deadline_exceeded_total",
+    "Requests cancelled before completing, by reason",
+    labelnames=("reason",)
+)
+
+def start_deadline(timeout: float) -> Token:
+    """Give the current request ``timeout`` seconds from now."""
+    return _request_deadline.set(monotonic() + timeout)
+
+def reset_deadline(token: Token) -> None:
+    _request_deadline.reset(token)
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left before the request deadline, or None outside a request."""
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - monotonic()
+
+def operation_timeout() -> ContextManager:
+    """
+    Bound the MongoDB operations in the block by the remaining request budget.
+
+    Motor runs pymongo on an executor with a copy of the current context, so
+    ``pymongo.timeout`` set here applies to the wrapped call.
+    """
+    remaining = remaining_budget()
+    if remaining is None:
+        return nullcontext()
+    return pymongo.timeout(max(remaining, MIN_OPERATION_TIMEOUT))
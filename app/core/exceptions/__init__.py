@@ -9,7 +9,7 @@ from .http import (
     ValidationException,
     RateLimitException,
 )
-from .database import DatabaseException
+from .database import DatabaseException, ConnectionException
 from .auth import AuthenticationException, AuthorizationException
 from .service import ServiceException
 from .handlers import setup_exception_handlers
\ No newline at end of file
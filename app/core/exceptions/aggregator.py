@@ -0,0 +1,107 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+
+from ..config import settings
+from ..monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+errors_suppressed_total = registry.counter(
+    "error_log_suppressed_total",
+    "Error log records folded into a periodic summary instead of being written"
+)
+
+Fingerprint = Tuple[str, int, str, str, str]
+
+class ErrorLogAggregator:
+    """
+    Rate limits error logging per fingerprint.
+
+    The first occurrence of a fingerprint (exception type, status, route,
+    method, message) in each ``interval`` is logged in full; later ones are
+    only counted and reported as one summary record when the interval
+    ends. A storm of identical errors costs a dict lookup per request
+    instead of a formatted record each. At most ``max_fingerprints`` are
+    tracked per interval; occurrences beyond that are counted together.
+    """
+
+    def __init__(self, interval: float = 60.0, max_fingerprints: int = 1000, enabled: bool = True):
+        self.interval = interval
+        self.max_fingerprints = max_fingerprints
+        self.enabled = enabled
+        # fingerprint -> [suppressed count, level, message]
+        self._seen: Dict[Fingerprint, List[Any]] = {}
+        self._overflow = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def log(
+        self,
+        fingerprint: Fingerprint,
+        level: int,
+        message: str,
+        extra: Dict[str, Any],
+        exc_info: Optional[BaseException] = None
+    ) -> None:
+        if not self.enabled:
+            logger.log(level, message, extra=extra, exc_info=exc_info)
+            return
+
+        entry = self._seen.get(fingerprint)
+        if entry is not None:
+            entry[0] += 1
+            errors_suppressed_total.inc()
+            return
+        if len(self._seen) >= self.max_fingerprints:
+            self._overflow += 1
+            errors_suppressed_total.inc()
+            return
+
+        self._seen[fingerprint] = [0, level, message]
+        logger.log(level, message, extra=extra, exc_info=exc_info)
+
+    def flush(self) -> None:
+        seen, self._seen = self._seen, {}
+        overflow, self._overflow = self._overflow, 0
+        for (exception, status_code, route, method, _), (suppressed, level, message) in seen.items():
+            if suppressed:
+                logger.log(
+                    level,
+                    f"{message} (repeated {suppressed} more times)",
+                    extra={
+                        "error_summary": True,
+                        "exception": exception,
+                        "status_code": status_code,
+                        "route": route,
+                        "method": method,
+                        "suppressed": suppressed,
+                        "interval": self.interval
+                    }
+                )
+        if overflow:
+            logger.warning(
+                f"{overflow} errors not logged: more than {self.max_fingerprints} distinct errors",
+                extra={"error_summary": True, "suppressed": overflow, "interval": self.interval}
+            )
+
+    async def start(self) -> None:
+        if self._task is None and self.enabled:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+error_aggregator = ErrorLogAggregator(
+    interval=settings.logging.ERROR_AGGREGATION_INTERVAL,
+    max_fingerprints=settings.logging.ERROR_AGGREGATION_MAX_FINGERPRINTS,
+    enabled=settings.logging.ERROR_AGGREGATION_ENABLED
+)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import Any, Dict, Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 class ErrorDetail(BaseModel):
@@ -11,7 +11,7 @@ class ErrorResponse(BaseModel):
     status_code: int
     message: str
     details: Optional[List[ErrorDetail]] = None
-    timestamp: datetime = datetime.utcnow().isoformat()
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
     request_id: Optional[str] = None
     path: Optional[str] = None
     method: Optional[str] = None
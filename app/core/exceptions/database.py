@@ -21,12 +21,14 @@ class ConnectionException(DatabaseException):
     def __init__(
         self,
         message: str = "Database connection error",
-        details: Optional[List[ErrorDetail]] = None
+        details: Optional[List[ErrorDetail]] = None,
+        headers: Optional[Dict[str, str]] = None
     ):
         super().__init__(
-            status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
             message=message,
-            details=details
+            details=details,
+            headers=headers
         )
 
 class QueryException(DatabaseException):
@@ -1,102 +1,102 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from .base import AppException, ErrorResponse, ErrorDetail
+from starlette.responses import Response
+from .aggregator import error_aggregator
+from .base import AppException
 from pydantic import ValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.exceptions import RequestValidationError
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import json
 import logging
-import sys
-import traceback
 from http import HTTPStatus
 
-logger = logging.getLogger(__name__)
+Details = Tuple[Tuple[Optional[str], str], ...]
 
-async def app_exception_handler(request: Request, exc: AppException) -> JSONResponse:
-    error_response = exc.to_response(
-        request_id=request.state.request_id,
-        path=request.url.path,
-        method=request.method
-    )
-    
-    logger.error(
-        f"Application error occurred: {error_response.json()}",
+# Error bodies follow the ErrorResponse schema but are written straight to
+# bytes: no model is built, and the part before the timestamp is cached
+# per distinct error, so a flood of identical 401s costs two small encodes
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+@lru_cache(maxsize=1024)
+def _body_prefix(status_code: int, message: str, details: Details) -> bytes:
+    # No details is null, as in ErrorResponse, not an empty list
+    encoded_details = _dumps([{"field": field, "message": detail} for field, detail in details] or None)
+    return (
+        f'{{"status_code":{status_code},"message":{_dumps(message)},"details":'
+        f'{encoded_details},"timestamp":"'
+    ).encode()
+
+def error_response(
+    request: Request,
+    status_code: int,
+    message: str,
+    details: Details = (),
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    body = _body_prefix(int(status_code), message, details) + (
+        f'{datetime.utcnow().isoformat()}",'
+        f'"request_id":{_dumps(getattr(request.state, "request_id", None))},'
+        f'"path":{_dumps(request.scope["path"])},"method":{_dumps(request.method)}}}'
+    ).encode()
+    return Response(body, status_code=status_code, media_type="application/json", headers=headers)
+
+def _log_error(request: Request, exc: Exception, status_code: int, message: str) -> None:
+    # Client errors are expected traffic: no traceback, and below ERROR
+    status_code = int(status_code)
+    server_error = status_code >= 500
+    route = getattr(request.scope.get("route"), "path", request.scope["path"])
+    error_aggregator.log(
+        (type(exc).__name__, status_code, route, request.method, message),
+        logging.ERROR if server_error else logging.INFO,
+        f"{type(exc).__name__}: {message}",
         extra={
-            "request_id": request.state.request_id,
-            "error_code": HTTPStatus.INTERNAL_SERVER_ERROR,
-            "path": request.url.path,
+            "request_id": getattr(request.state, "request_id", None),
+            "status_code": status_code,
+            "path": request.scope["path"],
             "method": request.method
         },
-        exc_info=True
+        exc_info=exc if server_error else None
     )
-    
-    return JSONResponse(
-        status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-        content=error_response.json(),
-        headers=exc.headers
+
+async def app_exception_handler(request: Request, exc: AppException) -> Response:
+    _log_error(request, exc, exc.status_code, exc.message)
+    return error_response(
+        request,
+        exc.status_code,
+        exc.message,
+        tuple((detail.field, detail.message) for detail in exc.details),
+        exc.headers
     )
 
-async def validation_exception_handler(request: Request, exc: ValidationError) -> JSONResponse:
-    details = [
-        ErrorDetail(
-            field=".".join(str(loc) for loc in error["loc"] if loc != "body"),
-            message=error["msg"]
-        )
+async def validation_exception_handler(request: Request, exc: ValidationError) -> Response:
+    details = tuple(
+        (".".join(str(loc) for loc in error["loc"] if loc != "body"), error["msg"])
         for error in exc.errors()
-    ]
-    
-    error_response = ErrorResponse(
-        status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
-        message="Request validation failed",
-        details=details,
-        request_id=request.state.request_id,
-        path=request.url.path,
-        method=request.method
     )
-    
-    return JSONResponse(
-        status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
-        content=error_response.dict(),
-        headers=getattr(exc, "headers", None)
+    return error_response(
+        request,
+        HTTPStatus.UNPROCESSABLE_ENTITY,
+        "Request validation failed",
+        details,
+        getattr(exc, "headers", None)
     )
 
-async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> JSONResponse:
-    error_response = ErrorResponse(
-        status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-        message=str(exc.detail),
-        request_id=request.state.request_id,
-        path=request.url.path,
-        method=request.method
-    )
-
-    return JSONResponse(
-        status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-        content=error_response.dict(),
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> Response:
+    return error_response(
+        request,
+        exc.status_code,
+        str(exc.detail),
         headers=getattr(exc, "headers", None)
     )
 
-
-async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
-    error_response = ErrorResponse(
-        status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-        message="An unexpected error occurred",
-        request_id=request.state.request_id,
-        path=request.url.path,
-        method=request.method
-    )
-    
-    logger.error(
-        "Unhandled exception occurred",
-        extra={
-            "request_id": request.state.request_id,
-            "path": request.url.path,
-            "method": request.method,
-            "traceback": "".join(traceback.format_exception(*sys.exc_info()))
-        }
-    )
-    
-    return JSONResponse(
-        status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-        content=error_response.dict(),
+async def unhandled_exception_handler(request: Request, exc: Exception) -> Response:
+    _log_error(request, exc, HTTPStatus.INTERNAL_SERVER_ERROR, "Unhandled exception occurred")
+    return error_response(
+        request,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        "An unexpected error occurred",
         headers=getattr(exc, "headers", None)
     )
 
@@ -105,4 +105,3 @@ def setup_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
     app.add_exception_handler(StarletteHTTPException, http_exception_handler)
     app.add_exception_handler(Exception, unhandled_exception_handler)
-
@@ -0,0 +1,164 @@
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import hashlib
+import logging
+import secrets
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .config import settings
+from .db import mongodb
+from .exceptions import BadRequestException, ConflictException
+from .monitoring.metrics import registry
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+logger = logging.getLogger(__name__)
+
+idempotency_requests_total = registry.counter(
+    "idempotency_requests_total",
+    "Requests carrying an Idempotency-Key by how they were answered",
+    labelnames=("outcome",)
+)
+
+MAX_KEY_LENGTH = 255
+
+# Whoever presents these is the caller; a key only dedupes that caller's requests
+CREDENTIAL_COOKIES = (settings.security.AUTH_COOKIE_NAME, "refresh_token")
+
+class IdempotencyStore:
+    """
+    Executes a keyed request at most once and replays its response.
+
+    Records are keyed by the Idempotency-Key plus a digest of the caller's
+    credentials, method, path and body, so a key reused by another caller
+    or for a different payload is a different request. Within a worker, duplicates arriving while the first is still
+    running await its future; across workers a pending record in MongoDB
+    turns them away with 409. A pending record is only leased for
+    ``lease`` seconds, so a key whose worker died is free again once the
+    request could no longer be running. Completed responses (status below
+    500) are kept for ``ttl`` seconds, Set-Cookie headers included, and
+    replayed without running the endpoint again.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        lease: float = 60.0,
+        repository: Optional[IdempotencyRepository] = None
+    ):
+        self.ttl = timedelta(seconds=ttl)
+        self.lease = timedelta(seconds=lease)
+        self._repository = repository
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def repository(self) -> IdempotencyRepository:
+        if self._repository is None:
+            self._repository = IdempotencyRepository(mongodb.client)
+        return self._repository
+
+    async def run(self, key: str, request: Request, execute: Callable[[], Awaitable[Response]]) -> Response:
+        if not key or len(key) > MAX_KEY_LENGTH or not key.isprintable():
+            raise BadRequestException(f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} printable characters")
+
+        # Starlette caches the body on the request, so the endpoint can still read it
+        record_id = self._record_id(key, request, await request.body())
+
+        inflight = self._inflight.get(record_id)
+        if inflight is not None:
+            idempotency_requests_total.inc(outcome="joined")
+            return self._replay(await asyncio.shield(inflight))
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[record_id] = future
+        owner = secrets.token_hex(8)
+        reserved = False
+        try:
+            existing = await self.repository.reserve(record_id, owner, datetime.utcnow() + self.lease)
+            reserved = existing is None
+            if existing is not None:
+                if existing["status"] != "complete":
+                    idempotency_requests_total.inc(outcome="conflict")
+                    raise ConflictException("A request with this Idempotency-Key is still being processed")
+                idempotency_requests_total.inc(outcome="replayed")
+                future.set_result(existing["response"])
+                return self._replay(existing["response"])
+
+            idempotency_requests_total.inc(outcome="executed")
+            response = await execute()
+            stored = self._capture(response)
+            if stored is not None and stored["status_code"] < 500:
+                try:
+                    await self.repository.complete(record_id, owner, stored, datetime.utcnow() + self.ttl)
+                except Exception as e:
+                    # The endpoint's work is done; failing the response now would invite a retry
+                    logger.warning(f"Failed to store idempotent response: {str(e)}")
+                    await self._release(record_id, owner)
+            else:
+                # Server errors and streamed bodies are not replayed; a retry runs again
+                await self._release(record_id, owner)
+            if stored is None:
+                future.set_exception(ConflictException("The original request's response cannot be replayed"))
+                future.exception()
+            else:
+                future.set_result(stored)
+            return response
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e if isinstance(e, Exception) else ConflictException(
+                    "The original request with this Idempotency-Key was aborted"
+                ))
+                future.exception()  # waiters re-raise it; nobody else needs to retrieve it
+                if reserved:
+                    await self._release(record_id, owner)
+            raise
+        finally:
+            self._inflight.pop(record_id, None)
+
+    async def _release(self, record_id: str, owner: str) -> None:
+        try:
+            await self.repository.release(record_id, owner)
+        except Exception as e:
+            logger.warning(f"Failed to release idempotency key: {str(e)}")
+
+    @staticmethod
+    def _record_id(key: str, request: Request, body: bytes) -> str:
+        digest = hashlib.sha256()
+        credentials = (
+            request.headers.get(settings.security.AUTH_HEADER_NAME, ""),
+            *(request.cookies.get(name, "") for name in CREDENTIAL_COOKIES)
+        )
+        for part in (key, *credentials, request.method, request.url.path):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        digest.update(body)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _capture(response: Response) -> Optional[Dict[str, Any]]:
+        body = getattr(response, "body", None)
+        if body is None:
+            return None
+        return {
+            "status_code": response.status_code,
+            "headers": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in response.raw_headers],
+            "body": bytes(body)
+        }
+
+    @staticmethod
+    def _replay(stored: Dict[str, Any]) -> Response:
+        response = Response(status_code=stored["status_code"])
+        response.body = stored["body"]
+        response.raw_headers = [
+            (name.encode("latin-1"), value.encode("latin-1")) for name, value in stored["headers"]
+        ]
+        response.raw_headers.append((b"idempotent-replayed", b"true"))
+        return response
+
+idempotency_store = IdempotencyStore(
+    ttl=settings.app.IDEMPOTENCY_TTL,
+    # A lease shorter than the request deadline could let a retry run alongside
+    lease=max(settings.app.IDEMPOTENCY_LEASE, settings.app.MIDDLEWARE_TIMEOUT)
+)
\ No newline at end of file
@@ -0,0 +1,228 @@
+from ipaddress import IPv4Address, IPv6Address, ip_address, ip_network
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+import asyncio
+import logging
+import os
+
+from starlette.types import Scope
+
+from .config import settings
+from .monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+ip_filter_rejected_total = registry.counter(
+    "ip_filter_rejected_total",
+    "Requests refused by the IP allow/deny lists",
+    labelnames=("list",)
+)
+ip_filter_ranges = registry.gauge(
+    "ip_filter_ranges",
+    "CIDR ranges loaded into each IP list",
+    labelnames=("list",)
+)
+
+def parse_ip(value: str) -> Optional[Union[IPv4Address, IPv6Address]]:
+    try:
+        address = ip_address(value.strip())
+    except ValueError:
+        return None
+    if address.version == 6 and address.ipv4_mapped is not None:
+        return address.ipv4_mapped
+    return address
+
+class CIDRSet:
+    """
+    Set of IPv4 and IPv6 CIDR ranges with prefix-indexed lookups.
+
+    Ranges are stored as masked network integers in one hash set per
+    prefix length, so a lookup costs one mask-and-probe per distinct
+    prefix length (at most 33 for IPv4, 129 for IPv6) regardless of how
+    many ranges are loaded, and each range costs a single int.
+    """
+
+    def __init__(self, networks: Iterable[str] = ()):
+        # version -> {prefix length: set of network ints}
+        self._tables: Dict[int, Dict[int, Set[int]]] = {4: {}, 6: {}}
+        self._lengths: Dict[int, List[Tuple[int, Set[int]]]] = {4: [], 6: []}
+        self.size = 0
+        for network in networks:
+            self.add(network)
+
+    def add(self, network: str) -> None:
+        parsed = ip_network(network.strip(), strict=False)
+        table = self._tables[parsed.version]
+        if parsed.prefixlen not in table:
+            table[parsed.prefixlen] = set()
+            self._index(parsed.version)
+        networks = table[parsed.prefixlen]
+        if int(parsed.network_address) not in networks:
+            networks.add(int(parsed.network_address))
+            self.size += 1
+
+    def __contains__(self, address: Union[IPv4Address, IPv6Address]) -> bool:
+        value = int(address)
+        for mask, networks in self._lengths[address.version]:
+            if value & mask in networks:
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _index(self, version: int) -> None:
+        bits = 32 if version == 4 else 128
+        full = (1 << bits) - 1
+        self._lengths[version] = [
+            (full ^ ((1 << (bits - prefix)) - 1), networks)
+            for prefix, networks in sorted(self._tables[version].items())
+        ]
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], source: str = "") -> "CIDRSet":
+        """Build from one range per line; blank lines and ``#`` comments are skipped."""
+        cidr_set = cls()
+        for number, line in enumerate(lines, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            try:
+                cidr_set.add(line)
+            except ValueError:
+                logger.warning(f"Ignoring invalid range {line!r} at {source}:{number}")
+        return cidr_set
+
+class IPFilter:
+    """
+    Enforces the IP deny list and, when it is non-empty, the allow list.
+
+    Each list merges the ranges from settings with an optional file of
+    one range per line. ``start`` polls the files' mtimes and rebuilds a
+    list off the event loop when its file changes, then swaps it in, so
+    lists can be edited during an incident without a restart.
+    """
+
+    def __init__(
+        self,
+        whitelist: Iterable[str] = (),
+        blacklist: Iterable[str] = (),
+        whitelist_file: Optional[str] = None,
+        blacklist_file: Optional[str] = None,
+        reload_interval: float = 5.0
+    ):
+        self.static = {"whitelist": list(whitelist), "blacklist": list(blacklist)}
+        self.files = {"whitelist": whitelist_file, "blacklist": blacklist_file}
+        self.reload_interval = reload_interval
+        self.whitelist = CIDRSet(self.static["whitelist"])
+        self.blacklist = CIDRSet(self.static["blacklist"])
+        self._mtimes: Dict[str, Optional[float]] = {"whitelist": None, "blacklist": None}
+        self._task: Optional[asyncio.Task] = None
+        self._update_gauges()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(
+            self.static["whitelist"] or self.static["blacklist"]
+            or self.files["whitelist"] or self.files["blacklist"]
+        )
+
+    def check(self, client_ip: Optional[str]) -> Optional[str]:
+        """Return the list that refuses ``client_ip``, or None when it may pass."""
+        address = parse_ip(client_ip) if client_ip else None
+        if address is None:
+            return "whitelist" if len(self.whitelist) else None
+        if address in self.blacklist:
+            return "blacklist"
+        if len(self.whitelist) and address not in self.whitelist:
+            return "whitelist"
+        return None
+
+    async def start(self) -> None:
+        await self.reload()
+        if self._task is None and (self.files["whitelist"] or self.files["blacklist"]):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def reload(self) -> None:
+        for name, path in self.files.items():
+            if not path:
+                continue
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError as e:
+                logger.warning(f"Cannot read IP {name} file {path}: {str(e)}")
+                continue
+            if mtime == self._mtimes[name]:
+                continue
+            cidr_set = await asyncio.to_thread(self._load, name, path)
+            setattr(self, name, cidr_set)
+            self._mtimes[name] = mtime
+            logger.info(f"Loaded IP {name}", extra={"path": path, "ranges": len(cidr_set)})
+        self._update_gauges()
+
+    def _load(self, name: str, path: str) -> CIDRSet:
+        with open(path) as ranges_file:
+            cidr_set = CIDRSet.from_lines(ranges_file, source=path)
+        for network in self.static[name]:
+            cidr_set.add(network)
+        return cidr_set
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.error(f"IP list reload failed: {str(e)}", exc_info=True)
+
+    def _update_gauges(self) -> None:
+        ip_filter_ranges.set(len(self.whitelist), list="whitelist")
+        ip_filter_ranges.set(len(self.blacklist), list="blacklist")
+
+trusted_proxies = CIDRSet(settings.security.TRUSTED_PROXIES)
+
+def get_client_ip(scope: Scope) -> Optional[str]:
+    """
+    Client address for a request, honouring forwarded-for headers only
+    from ``TRUSTED_PROXIES``.
+
+    The forwarded chain is read right to left, skipping trusted proxies,
+    and the first untrusted hop is the client; a left-most value a client
+    sent itself is never trusted. The result is cached on the scope.
+    """
+    state = scope.setdefault("state", {})
+    if "client_ip" in state:
+        return state["client_ip"]
+
+    client = scope.get("client")
+    client_ip = client[0] if client else None
+    peer = parse_ip(client_ip) if client_ip else None
+    if peer is not None and len(trusted_proxies) and peer in trusted_proxies:
+        header = settings.security.FORWARDED_FOR_HEADER.lower().encode()
+        hops: List[str] = []
+        for name, value in scope["headers"]:
+            if name == header:
+                hops.extend(hop.strip() for hop in value.decode("latin-1").split(","))
+        for hop in reversed(hops):
+            address = parse_ip(hop)
+            if address is None:
+                break
+            client_ip = str(address)
+            if address not in trusted_proxies:
+                break
+
+    state["client_ip"] = client_ip
+    return client_ip
+
+ip_filter = IPFilter(
+    whitelist=settings.security.IP_WHITELIST,
+    blacklist=settings.security.IP_BLACKLIST,
+    whitelist_file=settings.security.IP_WHITELIST_FILE,
+    blacklist_file=settings.security.IP_BLACKLIST_FILE,
+    reload_interval=settings.security.IP_LIST_RELOAD_INTERVAL
+)
\ No newline at end of file
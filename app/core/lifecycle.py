@@ -0,0 +1,113 @@
+from time import monotonic
+from typing import Awaitable, Callable, Coroutine, Dict, Optional, Set
+import asyncio
+import logging
+import os
+import signal
+import threading
+
+from .monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+in_flight_requests = registry.gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled, including their background tasks"
+)
+
+class DrainController:
+    """
+    Tracks in-flight work so shutdown can wait for it.
+
+    Shutdown has two stages: ``start_draining`` makes readiness fail while
+    requests are still served, so the load balancer stops routing here;
+    ``stop_accepting`` then rejects whatever still arrives. ``wait_for_idle``
+    waits, bounded, for running requests and tracked tasks, and registered
+    flush hooks push out buffered work before connections close.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.draining = False
+        self.accepting = True
+        self._tasks: Set[asyncio.Task] = set()
+        self._flush_hooks: Dict[str, Callable[[], Awaitable]] = {}
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+        in_flight_requests.set(self.in_flight)
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+        in_flight_requests.set(self.in_flight)
+
+    def create_task(self, coro: Coroutine, name: Optional[str] = None) -> asyncio.Task:
+        """Start a background task that shutdown will wait for."""
+        task = asyncio.create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def register_flush_hook(self, name: str, hook: Callable[[], Awaitable]) -> None:
+        self._flush_hooks[name] = hook
+
+    def start_draining(self) -> None:
+        if not self.draining:
+            self.draining = True
+            logger.info("Draining: readiness now fails", extra={"in_flight": self.in_flight})
+
+    def stop_accepting(self) -> None:
+        self.start_draining()
+        self.accepting = False
+
+    async def wait_for_idle(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` for requests and tracked tasks; cancel leftover tasks."""
+        deadline = monotonic() + timeout
+        while self.in_flight and monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        pending: Set[asyncio.Task] = set()
+        if self._tasks:
+            _, pending = await asyncio.wait(
+                list(self._tasks), timeout=max(0.0, deadline - monotonic())
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if self.in_flight or pending:
+            logger.warning(
+                "Drain timeout exceeded",
+                extra={"in_flight": self.in_flight, "cancelled_tasks": len(pending)}
+            )
+            return False
+        return True
+
+    async def flush(self, timeout: float) -> None:
+        for name, hook in list(self._flush_hooks.items()):
+            try:
+                await asyncio.wait_for(hook(), timeout)
+            except Exception as e:
+                logger.error(f"Flush hook {name} failed: {str(e)}", exc_info=True)
+
+    def install_signal_handler(self, delay: float) -> None:
+        """
+        On SIGTERM, fail readiness for ``delay`` seconds while still serving,
+        then hand over to the server's normal graceful shutdown via SIGINT.
+        Replaces the server's SIGTERM handler, so only use it under uvicorn.
+        SIGINT keeps uvicorn's handling: readiness stays up while the worker
+        stops accepting, which is how the launcher recycles single workers.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = asyncio.get_running_loop()
+
+        def on_sigterm() -> None:
+            if self.draining:
+                return
+            self.start_draining()
+            loop.call_later(delay, os.kill, os.getpid(), signal.SIGINT)
+
+        loop.add_signal_handler(signal.SIGTERM, on_sigterm)
+
+drain_controller = DrainController()
@@ -0,0 +1,361 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging.handlers import QueueHandler, RotatingFileHandler
+from typing import List, Optional
+import atexit
+import gzip
+import logging
+import logging.config
+import os
+import queue
+import shutil
+import stat
+import threading
+
+from .config.logging import LoggingSettings
+
+logger = logging.getLogger(__name__)
+
+class DeferredFlushMixin:
+    """
+    Skip the flush StreamHandler.emit() does after every record.
+
+    The queue listener calls flush_batch() once per drained batch instead,
+    so a burst of access-log lines costs one write syscall, not one each.
+    Until a listener takes the handler over, it flushes per record as usual.
+    """
+
+    deferred = False
+
+    def flush(self) -> None:
+        if not self.deferred:
+            super().flush()
+
+    def flush_batch(self) -> None:
+        super().flush()
+
+    def close(self) -> None:
+        self.flush_batch()
+        super().close()
+
+class BatchStreamHandler(DeferredFlushMixin, logging.StreamHandler):
+    pass
+
+class CompressingRotatingFileHandler(DeferredFlushMixin, RotatingFileHandler):
+    """
+    RotatingFileHandler that gzips rotated files on a separate thread.
+
+    The rename happens inline (it is cheap); compression of the renamed file
+    is handed to a single-worker executor so a rollover never stalls the
+    log writer for the time it takes to gzip LOG_FILE_MAX_SIZE bytes.
+
+    Rotation assumes one writer per file, so a forked worker switches to
+    its own ``app.<pid>.log`` beside the parent's (see after_fork()).
+    Files of exited workers are left in place.
+    """
+
+    def __init__(self, *args, compress: bool = True, **kwargs):
+        # Size of the current file, tracked in memory; set by _open()
+        self._size = 0
+        self._regular_file = True
+        super().__init__(*args, **kwargs)
+        self._compressor: Optional[ThreadPoolExecutor] = None
+        self._pending: Optional[Future] = None
+        if compress:
+            self._compressor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="log-compress"
+            )
+            self.namer = self._gzip_namer
+            self.rotator = self._gzip_rotator
+
+    def _open(self):
+        stream = super()._open()
+        status = os.fstat(stream.fileno())
+        self._size = status.st_size
+        self._regular_file = stat.S_ISREG(status.st_mode)
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # RotatingFileHandler.shouldRollover() formats every record twice,
+        # stats the file and seeks the stream, which flushes it; with the
+        # size kept here a record is formatted once and batches stay batched
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if (
+                self.maxBytes > 0 and self._regular_file and self._size
+                and self._size + len(msg) >= self.maxBytes
+            ):
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._size += len(msg)
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def after_fork(self) -> None:
+        """Move a forked child onto its own file and compression thread."""
+        # The inherited stream's buffer holds the parent's records, which the
+        # parent writes itself; it is kept, never flushed, and dropped when the
+        # worker leaves through os._exit()
+        self._inherited_stream = self.stream
+        self.stream = None
+        root, ext = os.path.splitext(self.baseFilename)
+        self.baseFilename = f"{root}.{os.getpid()}{ext}"
+        self._size = 0
+        # Executor threads do not survive fork
+        self._pending = None
+        if self._compressor is not None:
+            self._compressor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="log-compress"
+            )
+
+    def doRollover(self) -> None:
+        # Backups are shifted during rollover; let the previous one finish first
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+        super().doRollover()
+
+    def close(self) -> None:
+        super().close()
+        if self._compressor is not None:
+            self._compressor.shutdown(wait=True)
+
+    @staticmethod
+    def _gzip_namer(name: str) -> str:
+        return f"{name}.gz"
+
+    def _gzip_rotator(self, source: str, dest: str) -> None:
+        uncompressed = dest[:-len(".gz")]
+        os.rename(source, uncompressed)
+        self._pending = self._compressor.submit(self._compress, uncompressed, dest)
+
+    @staticmethod
+    def _compress(source: str, dest: str) -> None:
+        with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Non-blocking QueueHandler with level-aware backpressure.
+
+    Once the queue holds ``capacity`` records, DEBUG and INFO records are
+    dropped (and counted); WARNING and above may still use the extra
+    ``headroom`` slots. Nothing ever blocks the calling thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue, capacity: int):
+        super().__init__(log_queue)
+        self.capacity = capacity
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting is the listener's job; only freeze the message so later
+        # mutation of the arguments by the caller cannot change the record.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno <= logging.INFO and self.queue.qsize() >= self.capacity:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class BatchingQueueListener:
+    """
+    Drains the log queue on a background thread, formatting and writing
+    records in batches and flushing each handler once per batch.
+    """
+
+    _sentinel = None
+
+    def __init__(
+        self,
+        queue_handler: DroppingQueueHandler,
+        handlers: List[logging.Handler],
+        batch_size: int = 500,
+        flush_interval: float = 1.0
+    ):
+        self.queue_handler = queue_handler
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._thread: Optional[threading.Thread] = None
+        self._reported_drops = 0
+        self._flushed_markers: List[threading.Event] = []
+
+    @property
+    def queue(self) -> queue.Queue:
+        return self.queue_handler.queue
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._monitor, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        try:
+            self.queue.put_nowait(self._sentinel)
+        except queue.Full:
+            # Never block shutdown on a full queue; drop the oldest record instead
+            try:
+                self.queue.get_nowait()
+                self.queue_handler.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(self._sentinel)
+            except queue.Full:
+                pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    def after_fork(self) -> None:
+        """Give a forked child its own queue and writer thread."""
+        self.queue_handler.queue = queue.Queue(maxsize=self.queue.maxsize)
+        self.queue_handler.dropped = 0
+        self._reported_drops = 0
+        if self._thread is not None:
+            self.start()
+
+    def _monitor(self) -> None:
+        log_queue = self.queue
+        while True:
+            try:
+                record = log_queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._report_drops()
+                continue
+
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = self._handle_batch(batch)
+            self._report_drops()
+            self._flush()
+            while self._flushed_markers:
+                self._flushed_markers.pop().set()
+            if stop:
+                return
+
+    def _handle_batch(self, batch: List[Optional[logging.LogRecord]]) -> bool:
+        for record in batch:
+            if record is self._sentinel:
+                return True
+            if record.__class__ is threading.Event:
+                # flush_logging() marker; set once this batch is flushed
+                self._flushed_markers.append(record)
+                continue
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+        return False
+
+    def _report_drops(self) -> None:
+        dropped = self.queue_handler.dropped
+        if dropped == self._reported_drops:
+            return
+        record = logger.makeRecord(
+            logger.name, logging.WARNING, __file__, 0,
+            "Log queue full, dropped %d DEBUG/INFO records",
+            (dropped - self._reported_drops,), None
+        )
+        self._reported_drops = dropped
+        self._handle_batch([record])
+
+    def _flush(self) -> None:
+        for handler in self.handlers:
+            flush = getattr(handler, "flush_batch", handler.flush)
+            try:
+                flush()
+            except Exception:
+                handler.handleError(None)
+
+_listener: Optional[BatchingQueueListener] = None
+_configured = False
+
+def configure_logging(logging_settings: LoggingSettings) -> None:
+    """
+    Apply the logging config and, when enabled, move the root handlers
+    behind a queue so formatting and file I/O leave the event loop thread.
+    """
+    global _listener, _configured
+
+    stop_logging()
+    logging.config.dictConfig(logging_settings.get_logging_config())
+    _configured = True
+    if not logging_settings.QUEUE_ENABLED:
+        return
+
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    for handler in handlers:
+        root.removeHandler(handler)
+        if isinstance(handler, DeferredFlushMixin):
+            handler.deferred = True
+
+    log_queue = queue.Queue(
+        maxsize=logging_settings.QUEUE_SIZE + logging_settings.QUEUE_HEADROOM
+    )
+    queue_handler = DroppingQueueHandler(log_queue, capacity=logging_settings.QUEUE_SIZE)
+    root.addHandler(queue_handler)
+
+    _listener = BatchingQueueListener(
+        queue_handler,
+        handlers,
+        batch_size=logging_settings.QUEUE_BATCH_SIZE,
+        flush_interval=logging_settings.QUEUE_FLUSH_INTERVAL
+    )
+    _listener.start()
+
+def ensure_logging(logging_settings: LoggingSettings) -> None:
+    """Configure logging unless an entry point such as app.server already did."""
+    if not _configured:
+        configure_logging(logging_settings)
+
+def flush_logging(timeout: float = 5.0) -> bool:
+    """
+    Block until every record queued so far is written and flushed,
+    without stopping the writer thread.
+    """
+    if _listener is None or _listener._thread is None:
+        return True
+    marker = threading.Event()
+    try:
+        _listener.queue.put(marker, timeout=timeout)
+    except queue.Full:
+        return False
+    return marker.wait(timeout)
+
+def stop_logging() -> None:
+    """Drain queued records to their handlers and stop the writer thread."""
+    if _listener is not None:
+        _listener.stop()
+
+def _after_fork_in_child() -> None:
+    handlers = _listener.handlers if _listener is not None else logging.getLogger().handlers
+    for handler in handlers:
+        if isinstance(handler, CompressingRotatingFileHandler):
+            handler.after_fork()
+    if _listener is not None:
+        _listener.after_fork()
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(stop_logging)
@@ -1,14 +1,30 @@
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import time
 import uuid
 import logging
-from typing import Optional, Dict, List
+from collections import OrderedDict
+from typing import Any, Optional, Dict, List, Tuple
 import json
+import math
 from datetime import datetime
 import asyncio
+import random
+import sys
 from ..core.config import settings
+from .admission import AdaptiveLimiter, admission_shed_total
+from .scheduler import PriorityScheduler
+from .deadline import start_deadline, reset_deadline, deadline_exceeded_total
+from .lifecycle import drain_controller
+from .ip_filter import IPFilter, get_client_ip, ip_filter_rejected_total
+from .security.api_keys import api_key_authenticator
+from .monitoring.memory import register_memory_reporter
+from .monitoring.timing import (
+    timed,
+    start_request_timings,
+    reset_request_timings,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -53,11 +69,17 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         self,
         app: ASGIApp,
         exclude_paths: Optional[List[str]] = None,
-        exclude_methods: Optional[List[str]] = None
+        exclude_methods: Optional[List[str]] = None,
+        sample_rate: float = 1.0,
+        slow_request_threshold: float = 1.0,
+        route_sample_rates: Optional[Dict[str, float]] = None
     ):
         super().__init__(app)
         self.exclude_paths = exclude_paths or ["/health", "/metrics"]
         self.exclude_methods = exclude_methods or ["OPTIONS"]
+        self.sample_rate = sample_rate
+        self.slow_request_threshold = slow_request_threshold
+        self.route_sample_rates = route_sample_rates or {}
 
     async def dispatch(
         self, request: Request, call_next: RequestResponseEndpoint
@@ -68,65 +90,94 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         ):
             return await call_next(request)
 
-        start_time = time.time()
-        
-        request_details = {
-            "request_id": getattr(request.state, "request_id", None),
-            "method": request.method,
-            "path": request.url.path,
-            "query_params": dict(request.query_params),
-            "client_ip": request.client.host,
-            "user_agent": request.headers.get("user-agent"),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        started_at = time.time()
+        start_time = time.perf_counter()
 
         try:
             response = await call_next(request)
-            
-            process_time = time.time() - start_time
-            
-            logger.info(
-                "Request processed",
-                extra={
-                    **request_details,
-                    "status_code": response.status_code,
-                    "process_time": process_time
-                }
-            )
-            
-            return response
-
         except Exception as e:
             logger.error(
                 "Request failed",
                 extra={
-                    **request_details,
+                    **self._request_details(request, started_at),
                     "error": str(e),
-                    "process_time": time.time() - start_time
+                    "process_time": time.perf_counter() - start_time
                 },
                 exc_info=True
             )
             raise
 
+        process_time = time.perf_counter() - start_time
+        sample_rate = self._sample_rate(request, response.status_code, process_time)
+
+        if sample_rate:
+            with timed("log"):
+                logger.info(
+                    "Request processed",
+                    extra={
+                        **self._request_details(request, started_at),
+                        "status_code": response.status_code,
+                        "process_time": process_time,
+                        "sample_rate": sample_rate
+                    }
+                )
+
+        return response
+
+    def _sample_rate(self, request: Request, status_code: int, process_time: float) -> float:
+        """
+        Rate the emitted record was sampled at, or 0 when it is skipped.
+        Errors and slow requests are always logged.
+        """
+        if not logger.isEnabledFor(logging.INFO):
+            return 0.0
+        if status_code >= 400 or process_time >= self.slow_request_threshold:
+            return 1.0
+
+        rate = self.route_sample_rates.get(request.url.path, self.sample_rate)
+        if rate >= 1.0 or (rate > 0.0 and random.random() < rate):
+            return rate
+        return 0.0
+
+    @staticmethod
+    def _request_details(request: Request, started_at: float) -> Dict[str, Any]:
+        return {
+            "request_id": getattr(request.state, "request_id", None),
+            "method": request.method,
+            "path": request.url.path,
+            "query_params": dict(request.query_params),
+            "client_ip": get_client_ip(request.scope),
+            "user_agent": request.headers.get("user-agent"),
+            "timestamp": datetime.utcfromtimestamp(started_at).isoformat()
+        }
+
 class ResponseTimeMiddleware(BaseHTTPMiddleware):
     def __init__(
         self,
         app: ASGIApp,
-        slow_request_threshold: float = 0.5  # 500ms
+        slow_request_threshold: float = 0.5,  # 500ms
+        server_timing: bool = True
     ):
         super().__init__(app)
         self.slow_request_threshold = slow_request_threshold
+        self.server_timing = server_timing
 
     async def dispatch(
         self, request: Request, call_next: RequestResponseEndpoint
     ) -> Response:
-        start_time = time.time()
-        
-        response = await call_next(request)
+        timings, token = start_request_timings()
+        start_time = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            reset_request_timings(token)
         
-        process_time = time.time() - start_time
+        process_time = time.perf_counter() - start_time
+        timings.record("app", process_time)
         
         response.headers["X-Process-Time"] = f"{process_time:.4f} seconds"
+        if self.server_timing:
+            response.headers["Server-Timing"] = timings.to_header()
         
         if process_time > self.slow_request_threshold:
             logger.warning(
@@ -136,25 +187,47 @@ class ResponseTimeMiddleware(BaseHTTPMiddleware):
                     "path": request.url.path,
                     "method": request.method,
                     "process_time": process_time,
-                    "threshold": self.slow_request_threshold
+                    "threshold": self.slow_request_threshold,
+                    "timings": timings.as_dict()
                 }
             )
         
         return response
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
+    """
+    Cost-weighted token bucket per client.
+
+    Each client gets ``burst`` tokens refilled at ``rate_limit`` per
+    ``window_size`` seconds; a request spends its route's cost from
+    ``route_costs`` (default 1), so a bcrypt-verifying login weighs more
+    than a cheap GET. Callers presenting an API key that is active in the
+    auth cache are bucketed by the key, at its own
+    ``rate_limit_per_minute``; everyone else, unknown keys included, by
+    client IP. Buckets live in an LRU capped at ``max_clients``.
+    """
+
     def __init__(
         self,
         app: ASGIApp,
         rate_limit: int = 60,
         window_size: int = 60, 
-        exclude_paths: Optional[List[str]] = None
+        exclude_paths: Optional[List[str]] = None,
+        burst: Optional[int] = None,
+        route_costs: Optional[Dict[str, float]] = None,
+        max_clients: int = 100_000
     ):
         super().__init__(app)
         self.rate_limit = rate_limit
         self.window_size = window_size
         self.exclude_paths = exclude_paths or ["/health", "/metrics"]
-        self.requests = {}
+        self.burst = burst or rate_limit
+        self.refill_rate = rate_limit / window_size
+        self.route_costs = route_costs or {}
+        self.max_clients = max_clients
+        # client id -> [tokens, updated_at]
+        self.buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        register_memory_reporter("rate_limiter", self.memory_stats)
 
     async def dispatch(
         self, request: Request, call_next: RequestResponseEndpoint
@@ -162,70 +235,533 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         if request.url.path in self.exclude_paths:
             return await call_next(request)
 
-        client_id = self._get_client_id(request)
-        
-        current_time = time.time()
-        if not self._check_rate_limit(client_id, current_time):
+        client_id, limit = self._get_client_id(request)
+        cost = min(self.route_costs.get(request.url.path, 1), limit or self.burst)
+
+        retry_after = self._take(client_id, cost, time.monotonic(), limit)
+        if retry_after:
             logger.warning(
                 "Rate limit exceeded",
                 extra={
                     "client_id": client_id,
-                    "path": request.url.path
+                    "path": request.url.path,
+                    "cost": cost
                 }
             )
             return Response(
                 content=json.dumps({
                     "error": "Rate limit exceeded",
-                    "retry_after": self._get_retry_after(client_id)
+                    "retry_after": math.ceil(retry_after)
                 }),
                 status_code=429,
+                headers={"Retry-After": str(math.ceil(retry_after))},
                 media_type="application/json"
             )
 
         return await call_next(request)
 
-    def _get_client_id(self, request: Request) -> str:
-
-        api_key = request.headers.get("X-API-Key")
+    def _get_client_id(self, request: Request) -> Tuple[str, Optional[int]]:
+        """Bucket key and, for a known API key with its own limit, that per-minute limit."""
+        api_key = request.headers.get(settings.security.API_KEY_HEADER_NAME)
         if api_key:
-            return f"api_key:{api_key}"
+            # Only a key already validated into the auth cache gets its own
+            # bucket; anything else would let a client dodge its IP limit by
+            # rotating made-up keys. Keyed by hash so raw keys are not kept
+            key_hash = api_key_authenticator.hash_key(api_key)
+            record = api_key_authenticator.cached(key_hash)
+            if record is not None:
+                return f"api_key:{key_hash}", record.rate_limit_per_minute
         
-        return f"ip:{request.client.host}"
+        return f"ip:{get_client_ip(request.scope)}", None
+
+    def _take(self, client_id: str, cost: float, now: float, limit: Optional[int] = None) -> float:
+        """
+        Spend ``cost`` tokens; return 0 on success, else seconds until affordable.
+        ``limit`` overrides the per-minute rate and burst for this bucket.
+        """
+        burst = limit or self.burst
+        refill_rate = limit / 60 if limit else self.refill_rate
+        bucket = self.buckets.get(client_id)
+        if bucket is None:
+            bucket = self.buckets[client_id] = [float(burst), now]
+            if len(self.buckets) > self.max_clients:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(client_id)
+
+        tokens = min(burst, bucket[0] + (now - bucket[1]) * refill_rate)
+        bucket[1] = now
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            return 0.0
+        bucket[0] = tokens
+        return (cost - tokens) / refill_rate
+
+    def memory_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.buckets),
+            "bytes": sys.getsizeof(self.buckets) + sum(
+                sys.getsizeof(client_id) + sys.getsizeof(bucket) + 2 * sys.getsizeof(0.0)
+                for client_id, bucket in self.buckets.items()
+            )
+        }
 
-    def _check_rate_limit(self, client_id: str, current_time: float) -> bool:
-        if client_id not in self.requests:
-            self.requests[client_id] = []
-        
-        self.requests[client_id] = [
-            req_time for req_time in self.requests[client_id]
-            if current_time - req_time <= self.window_size
+class AdmissionControlMiddleware(BaseHTTPMiddleware):
+    """
+    Sheds load with 503 once the adaptive in-flight limit is reached.
+
+    Paths listed in ``route_limits`` get their own limiter so expensive
+    routes cannot starve the rest; every other path shares the default one.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        initial_limit: int = 50,
+        min_limit: int = 5,
+        max_limit: int = 500,
+        target_latency: float = 0.25,
+        queue_timeout: float = 0.5,
+        max_queue: int = 100,
+        retry_after: int = 1,
+        route_limits: Optional[Dict[str, Dict[str, float]]] = None,
+        exclude_paths: Optional[List[str]] = None
+    ):
+        super().__init__(app)
+        self.retry_after = retry_after
+        self.exclude_paths = exclude_paths or ["/health", "/metrics"]
+        limiter_params = {
+            "initial_limit": initial_limit,
+            "min_limit": min_limit,
+            "max_limit": max_limit,
+            "target_latency": target_latency,
+            "queue_timeout": queue_timeout,
+            "max_queue": max_queue
+        }
+        self.default_limiter = AdaptiveLimiter("default", **limiter_params)
+        self.route_limiters = {
+            path: AdaptiveLimiter(path, **{**limiter_params, **overrides})
+            for path, overrides in (route_limits or {}).items()
+        }
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        if request.url.path in self.exclude_paths:
+            return await call_next(request)
+
+        limiter = self.route_limiters.get(request.url.path, self.default_limiter)
+        refused = await limiter.acquire()
+        if refused:
+            admission_shed_total.inc(limiter=limiter.name, reason=refused)
+            logger.warning(
+                "Request shed by admission control",
+                extra={
+                    "request_id": getattr(request.state, "request_id", None),
+                    "path": request.url.path,
+                    "limiter": limiter.name,
+                    "reason": refused,
+                    "limit": int(limiter.limit),
+                    "in_flight": limiter.in_flight
+                }
+            )
+            return Response(
+                content=json.dumps({
+                    "error": "Service overloaded",
+                    "retry_after": self.retry_after
+                }),
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+                media_type="application/json"
+            )
+
+        start_time = time.perf_counter()
+        latency = None
+        try:
+            response = await call_next(request)
+            # 503/504 from downstream are overload signals, like exceptions
+            if response.status_code not in (503, 504):
+                latency = time.perf_counter() - start_time
+            return response
+        finally:
+            limiter.release(latency)
+
+class EdgeMiddleware:
+    """
+    Front-of-stack fast path for host validation and CORS preflights.
+
+    ``allowed_hosts`` are compiled once into an exact-match set plus a
+    tuple of ``*.`` suffixes, and requests for other hosts are refused
+    from prebuilt bytes without building a Request. Preflights are
+    answered here with headers precomputed at startup, including
+    ``Access-Control-Max-Age``, so they never reach the rest of the stack;
+    CORSMiddleware further in still decorates the actual requests.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allowed_hosts: Optional[List[str]] = None,
+        allow_origins: Optional[List[str]] = None,
+        allow_methods: Optional[List[str]] = None,
+        allow_credentials: bool = False,
+        max_age: int = 600
+    ):
+        self.app = app
+
+        hosts = [host.lower() for host in (allowed_hosts or ["*"])]
+        self.allow_any_host = "*" in hosts
+        self.exact_hosts = frozenset(host for host in hosts if not host.startswith("*."))
+        self.host_suffixes = tuple(host[1:] for host in hosts if host.startswith("*."))
+
+        origins = allow_origins or []
+        self.allow_any_origin = "*" in origins
+        self.allowed_origins = frozenset(origins)
+        methods = allow_methods or ["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"]
+        self.allowed_methods = frozenset(method.encode() for method in methods)
+
+        # With credentials (or a fixed origin list) the origin must be echoed
+        self.echo_origin = allow_credentials or not self.allow_any_origin
+        self.preflight_headers = [
+            (b"access-control-allow-methods", ", ".join(methods).encode()),
+            (b"access-control-max-age", str(max_age).encode()),
+            (b"content-type", b"text/plain; charset=utf-8"),
         ]
-        
-        if len(self.requests[client_id]) >= self.rate_limit:
+        if allow_credentials:
+            self.preflight_headers.append((b"access-control-allow-credentials", b"true"))
+        if self.echo_origin:
+            self.preflight_headers.append((b"vary", b"Origin"))
+        else:
+            self.preflight_headers.append((b"access-control-allow-origin", b"*"))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        host = origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"host":
+                host = value
+            elif name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if not self._host_allowed(host):
+            if scope["type"] == "websocket":
+                await send({"type": "websocket.close", "code": 1008})
+                return
+            await self._respond(send, 400, [(b"content-type", b"text/plain; charset=utf-8")], b"Invalid host header")
+            return
+
+        if scope["type"] == "http" and scope["method"] == "OPTIONS" and origin and request_method:
+            await self._preflight(send, origin, request_method, request_headers)
+            return
+
+        await self.app(scope, receive, send)
+
+    def _host_allowed(self, host: Optional[bytes]) -> bool:
+        if self.allow_any_host:
+            return True
+        if not host:
             return False
-        
-        self.requests[client_id].append(current_time)
-        return True
+        name = host.decode("latin-1").split(":")[0].lower()
+        return name in self.exact_hosts or name.endswith(self.host_suffixes)
+
+    async def _preflight(
+        self, send: Send, origin: bytes, request_method: bytes, request_headers: Optional[bytes]
+    ) -> None:
+        headers = list(self.preflight_headers)
+        failures = []
+        if self.allow_any_origin or origin.decode("latin-1") in self.allowed_origins:
+            if self.echo_origin:
+                headers.append((b"access-control-allow-origin", origin))
+        else:
+            failures.append("origin")
+        if request_method not in self.allowed_methods:
+            failures.append("method")
+        if request_headers:
+            # Any requested header is allowed, as with allow_headers=["*"]
+            headers.append((b"access-control-allow-headers", request_headers))
+
+        if failures:
+            await self._respond(send, 400, headers, f"Disallowed CORS {', '.join(failures)}".encode())
+        else:
+            await self._respond(send, 200, headers, b"OK")
+
+    async def _respond(self, send: Send, status: int, headers: List[Any], body: bytes) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers + [(b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+class IPFilterMiddleware:
+    """
+    Refuses clients matched by the IP deny list, or missing from a
+    non-empty allow list, with 403 before any other work is done.
+    """
+
+    def __init__(self, app: ASGIApp, ip_filter: IPFilter):
+        self.app = app
+        self.ip_filter = ip_filter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        refused_by = self.ip_filter.check(get_client_ip(scope))
+        if refused_by is None:
+            await self.app(scope, receive, send)
+            return
+
+        ip_filter_rejected_total.inc(list=refused_by)
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1008})
+            return
+        await Response(
+            content=json.dumps({"error": "Forbidden"}),
+            status_code=403,
+            media_type="application/json"
+        )(scope, receive, send)
+
+class InFlightMiddleware:
+    """
+    Counts requests in flight for graceful shutdown and turns new ones
+    away with 503 once the drain controller stops accepting work. The
+    count lasts until the app returns, so it covers background tasks.
+    """
+
+    def __init__(self, app: ASGIApp, retry_after: int = 1):
+        self.app = app
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not drain_controller.accepting:
+            await Response(
+                content=json.dumps({"error": "Server shutting down"}),
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after), "Connection": "close"},
+                media_type="application/json"
+            )(scope, receive, send)
+            return
+
+        drain_controller.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            drain_controller.request_finished()
+
+class PrioritySchedulingMiddleware:
+    """
+    Runs requests through a weighted fair ``PriorityScheduler``.
+
+    Requests are classified by exact path via ``route_classes``; anything
+    unlisted belongs to ``default_class``. Plain ASGI so it can sit right
+    in front of the router without adding a task per request.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        capacity: int = 64,
+        classes: Optional[Dict[str, Dict[str, float]]] = None,
+        route_classes: Optional[Dict[str, str]] = None,
+        default_class: str = "default",
+        queue_timeout: float = 5.0,
+        max_queue: int = 256,
+        retry_after: int = 1
+    ):
+        self.app = app
+        self.route_classes = route_classes or {}
+        self.retry_after = retry_after
+        self.scheduler = PriorityScheduler(
+            capacity,
+            classes or {},
+            default_class=default_class,
+            queue_timeout=queue_timeout,
+            max_queue=max_queue
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        priority_class = self.route_classes.get(scope["path"], self.scheduler.default_class)
+        refused = await self.scheduler.acquire(priority_class)
+        if refused:
+            logger.warning(
+                "Request rejected by priority scheduler",
+                extra={
+                    "path": scope["path"],
+                    "priority_class": priority_class,
+                    "reason": refused
+                }
+            )
+            await Response(
+                content=json.dumps({
+                    "error": "Service overloaded",
+                    "retry_after": self.retry_after
+                }),
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+                media_type="application/json"
+            )(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.scheduler.release(priority_class)
+
+class DeadlineMiddleware:
+    """
+    Enforces a per-request time budget.
 
-    def _get_retry_after(self, client_id: str) -> int:
-        if not self.requests[client_id]:
-            return 0
-        oldest_request = min(self.requests[client_id])
-        return int(oldest_request + self.window_size - time.time())
+    The handler runs in its own task. It is cancelled with a 504 once
+    ``timeout`` seconds pass without a complete response, or silently as
+    soon as the client disconnects. The deadline is published through a
+    contextvar so downstream calls can bound themselves by what is left.
+    Work after the response has been sent (background tasks) is left alone.
+
+    Written as a plain ASGI middleware because it needs to own ``receive``
+    to notice disconnects while the handler is still running.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        timeout: float = 60,
+        exclude_paths: Optional[List[str]] = None
+    ):
+        self.app = app
+        self.timeout = timeout
+        self.exclude_paths = exclude_paths or ["/health", "/metrics"]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+        response_complete = False
+        # maxsize=1 keeps backpressure on the request body
+        messages: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        async def pump_receive() -> None:
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    if not response_complete and not handler.done():
+                        handler.cancel()
+                        deadline_exceeded_total.inc(reason="client_disconnect")
+                        logger.info(
+                            "Client disconnected, request cancelled",
+                            extra={"method": scope["method"], "path": scope["path"]}
+                        )
+                    await messages.put(message)
+                    return
+                await messages.put(message)
+
+        token = start_deadline(self.timeout)
+        try:
+            handler = asyncio.create_task(self.app(scope, messages.get, send_wrapper))
+        finally:
+            reset_deadline(token)
+        pump = asyncio.create_task(pump_receive())
+
+        try:
+            await asyncio.wait({handler}, timeout=self.timeout)
+            if not handler.done() and not response_complete:
+                handler.cancel()
+                await asyncio.gather(handler, return_exceptions=True)
+                deadline_exceeded_total.inc(reason="timeout")
+                logger.warning(
+                    "Request deadline exceeded",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "timeout": self.timeout,
+                        "response_started": response_started
+                    }
+                )
+                if not response_started:
+                    await Response(
+                        content=json.dumps({"error": "Request deadline exceeded"}),
+                        status_code=504,
+                        media_type="application/json"
+                    )(scope, receive, send)
+                return
+
+            try:
+                await handler
+            except asyncio.CancelledError:
+                # Cancelled by a client disconnect; nobody is listening for a response
+                if asyncio.current_task().cancelling():
+                    raise
+        finally:
+            pump.cancel()
+            if not handler.done():
+                handler.cancel()
 
 class CacheMiddleware(BaseHTTPMiddleware):
+    """
+    Caches successful GET responses in memory for ``cache_time`` seconds.
+
+    This sits outside GZip, CORS, request ID and timing, so an entry keeps
+    only the headers describing the body; the rest would be stale or
+    belong to another request. Encoded and CORS headers depend on the
+    request, so Accept-Encoding and Origin are part of the key. Responses
+    setting cookies are never stored.
+    """
+
+    cacheable_headers = frozenset({
+        b"content-type",
+        b"content-encoding",
+        b"content-language",
+        b"content-disposition",
+        b"cache-control",
+        b"etag",
+        b"last-modified",
+        b"vary",
+        b"access-control-allow-origin",
+        b"access-control-allow-credentials",
+        b"access-control-expose-headers"
+    })
+
     def __init__(
         self,
         app: ASGIApp,
         cache_time: int = 300,
         exclude_paths: Optional[List[str]] = None,
-        exclude_query_params: Optional[List[str]] = None
+        exclude_query_params: Optional[List[str]] = None,
+        exclude_prefixes: Optional[List[str]] = None
     ):
         super().__init__(app)
         self.cache_time = cache_time
         self.exclude_paths = exclude_paths or []
+        self.exclude_prefixes = tuple(exclude_prefixes or [])
         self.exclude_query_params = exclude_query_params or ["nocache"]
         self.cache = {}
+        register_memory_reporter("response_cache", self.memory_stats)
 
     async def dispatch(
         self, request: Request, call_next: RequestResponseEndpoint
@@ -236,6 +772,9 @@ class CacheMiddleware(BaseHTTPMiddleware):
         if request.url.path in self.exclude_paths:
             return await call_next(request)
 
+        if self.exclude_prefixes and request.url.path.startswith(self.exclude_prefixes):
+            return await call_next(request)
+
         if any(param in request.query_params for param in self.exclude_query_params):
             return await call_next(request)
 
@@ -248,30 +787,58 @@ class CacheMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
         
         if response.status_code == 200:
-            await self._cache_response(cache_key, response)
+            response = await self._cache_response(cache_key, response)
         
         return response
 
+    def memory_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.cache),
+            "bytes": sys.getsizeof(self.cache) + sum(
+                sys.getsizeof(key) + len(body)
+                for key, (_, _, body, _) in self.cache.items()
+            )
+        }
+
     def _generate_cache_key(self, request: Request) -> str:
-        return f"{request.method}:{request.url.path}:{str(request.query_params)}"
+        # Same test GZipMiddleware applies, so one entry per encoding it picks
+        encoding = "gzip" if "gzip" in request.headers.get("Accept-Encoding", "") else "identity"
+        origin = request.headers.get("Origin", "")
+        return f"{request.method}:{request.url.path}:{str(request.query_params)}:{encoding}:{origin}"
 
     def _get_cached_response(self, cache_key: str) -> Optional[Response]:
         if cache_key in self.cache:
-            cached_time, response = self.cache[cache_key]
+            cached_time, status_code, body, raw_headers = self.cache[cache_key]
             if time.time() - cached_time <= self.cache_time:
+                # A fresh Response per hit; outer middlewares mutate headers
+                response = Response(body, status_code=status_code)
+                response.raw_headers = list(raw_headers)
                 return response
             del self.cache[cache_key]
         return None
 
-    async def _cache_response(self, cache_key: str, response: Response) -> None:
-        self.cache[cache_key] = (time.time(), response)
+    async def _cache_response(self, cache_key: str, response: Response) -> Response:
+        # call_next hands back a streaming response; buffer it once so the
+        # entry can be replayed and its size is known
+        if any(name == b"set-cookie" for name, _ in response.raw_headers):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        raw_headers = tuple(
+            (name, value) for name, value in response.raw_headers if name.lower() in self.cacheable_headers
+        )
+        self.cache[cache_key] = (time.time(), response.status_code, body, raw_headers)
         
-        asyncio.create_task(self._cleanup_cache())
+        drain_controller.create_task(self._cleanup_cache())
+
+        buffered = Response(body, status_code=response.status_code, background=response.background)
+        buffered.raw_headers = list(response.raw_headers)
+        return buffered
 
     async def _cleanup_cache(self) -> None:
         current_time = time.time()
         expired_keys = [
-            key for key, (cached_time, _) in self.cache.items()
+            key for key, (cached_time, _, _, _) in self.cache.items()
             if current_time - cached_time > self.cache_time
         ]
         for key in expired_keys:
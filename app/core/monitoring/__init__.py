@@ -1,5 +1,5 @@
 from .sentry import get_sentry_service, SentryService, SentryConfig
-from .middleware import SentryContextMiddleware
+from .middleware import SentryContextMiddleware, ProfilingMiddleware, HealthProbeMiddleware
 from .decorators import monitor_transaction
 
 __all__ = [
@@ -7,5 +7,7 @@ __all__ = [
     "SentryService",
     "SentryConfig",
     "SentryContextMiddleware",
+    "ProfilingMiddleware",
+    "HealthProbeMiddleware",
     "monitor_transaction"
 ]
\ No newline at end of file
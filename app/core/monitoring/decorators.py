@@ -1,14 +1,21 @@
-import sentry_sdk
 from functools import wraps
 from typing import Callable, Optional, Any
 import inspect
 
+from ..config import settings
+
 def monitor_transaction(
     name: Optional[str] = None,
     op: Optional[str] = None,
     tags: Optional[dict] = None
 ):
     def decorator(func: Callable) -> Callable:
+        # Without Sentry there is nothing to record: skip the wrapper and the SDK import
+        if not settings.logging.SENTRY_ENABLED:
+            return func
+
+        import sentry_sdk
+
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
             transaction_name = name or f"{func.__module__}.{func.__name__}"
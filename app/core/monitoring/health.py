@@ -0,0 +1,130 @@
+from time import monotonic, time
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import json
+import logging
+
+from ..config import settings
+from ..db import mongodb
+from ..security.security import hash_queue_depth
+from .loop_monitor import loop_monitor
+
+logger = logging.getLogger(__name__)
+
+class HealthMonitor:
+    """
+    Keeps a readiness snapshot refreshed in the background.
+
+    Every ``refresh_interval`` seconds it pings MongoDB and reads pool
+    saturation, hash-pool queue depth and event loop lag, then serializes
+    the result once. Probes are answered from that snapshot; a snapshot
+    older than ``stale_after`` counts as not ready.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = 2.0,
+        stale_after: float = 10.0,
+        ping_timeout: float = 1.0,
+        max_pool_size: int = 100,
+        max_pool_saturation: float = 0.95,
+        max_hash_queue: int = 32,
+        max_loop_lag: float = 0.5
+    ):
+        self.refresh_interval = refresh_interval
+        self.stale_after = stale_after
+        self.ping_timeout = ping_timeout
+        self.max_pool_size = max_pool_size
+        self.max_pool_saturation = max_pool_saturation
+        self.max_hash_queue = max_hash_queue
+        self.max_loop_lag = max_loop_lag
+
+        self.ready = False
+        self.snapshot: Dict[str, Any] = {"status": "starting", "checks": {}}
+        self._body = json.dumps(self.snapshot).encode()
+        self._refreshed_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def readiness(self) -> Tuple[bool, bytes]:
+        """Current readiness and its pre-serialized JSON body."""
+        if monotonic() - self._refreshed_at > self.stale_after:
+            return False, json.dumps({**self.snapshot, "status": "stale"}).encode()
+        return self.ready, self._body
+
+    async def refresh(self) -> None:
+        checks = {
+            "mongodb": await self._check_mongodb(),
+            "connection_pool": self._check_pool(),
+            "hash_pool": self._check_hash_pool(),
+            "event_loop": self._check_event_loop()
+        }
+        ready = all(check["ok"] for check in checks.values())
+        if ready != self.ready:
+            log = logger.info if ready else logger.warning
+            log(f"Readiness changed to {ready}", extra={"checks": checks})
+
+        self.ready = ready
+        self.snapshot = {
+            "status": "ready" if ready else "not_ready",
+            "checked_at": time(),
+            "checks": checks
+        }
+        self._body = json.dumps(self.snapshot).encode()
+        self._refreshed_at = monotonic()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health refresh failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(self.refresh_interval)
+
+    async def _check_mongodb(self) -> Dict[str, Any]:
+        if mongodb.client is None:
+            return {"ok": False, "error": "not connected"}
+        start_time = monotonic()
+        try:
+            await asyncio.wait_for(mongodb.client.admin.command("ping"), self.ping_timeout)
+        except Exception as e:
+            return {"ok": False, "error": str(e) or type(e).__name__}
+        return {"ok": True, "latency_ms": round((monotonic() - start_time) * 1000, 3)}
+
+    def _check_pool(self) -> Dict[str, Any]:
+        stats = mongodb.pool_monitor.stats()
+        saturation = stats["checked_out"] / self.max_pool_size if self.max_pool_size else 0.0
+        return {
+            "ok": saturation < self.max_pool_saturation,
+            "saturation": round(saturation, 3),
+            **stats
+        }
+
+    def _check_hash_pool(self) -> Dict[str, Any]:
+        queued = hash_queue_depth()
+        return {"ok": queued <= self.max_hash_queue, "queued": queued}
+
+    def _check_event_loop(self) -> Dict[str, Any]:
+        if not loop_monitor.running:
+            return {"ok": True, "lag_ms": None}
+        lag = loop_monitor.last_lag
+        return {"ok": lag <= self.max_loop_lag, "lag_ms": round(lag * 1000, 3)}
+
+health_monitor = HealthMonitor(
+    refresh_interval=settings.monitoring.HEALTH_REFRESH_INTERVAL,
+    stale_after=settings.monitoring.HEALTH_STALE_AFTER,
+    ping_timeout=settings.monitoring.HEALTH_PING_TIMEOUT,
+    max_pool_size=settings.db.MONGODB_MAX_POOL_SIZE,
+    max_pool_saturation=settings.monitoring.HEALTH_MAX_POOL_SATURATION,
+    max_hash_queue=settings.monitoring.HEALTH_MAX_HASH_QUEUE,
+    max_loop_lag=settings.monitoring.HEALTH_MAX_LOOP_LAG
+)
@@ -0,0 +1,183 @@
+from collections import Counter as SiteCounter
+from time import perf_counter
+from types import FrameType
+from typing import List, Optional, Tuple
+import asyncio
+import logging
+import os
+import sys
+import threading
+import traceback
+
+from ..config import settings
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+loop_lag_seconds = registry.histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled event loop wakeup and when it actually ran",
+    buckets=LAG_BUCKETS
+)
+loop_blocked_total = registry.counter(
+    "event_loop_blocked_total",
+    "Times a callback held the event loop longer than the block threshold",
+    labelnames=("site",)
+)
+
+class EventLoopMonitor:
+    """
+    Measures event loop lag and catches callbacks that block the loop.
+
+    A probe task sleeps for ``interval`` and records how late it woke up.
+    A watchdog thread checks the probe's heartbeat; when it is overdue by
+    more than ``block_threshold`` the loop thread is stuck in a synchronous
+    call, so the watchdog grabs that thread's current stack and attributes
+    the stall to the innermost frame from this application.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        block_threshold: float = 0.1,
+        report_interval: float = 60.0,
+        top_sites: int = 5
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.report_interval = report_interval
+        self.top_sites = top_sites
+
+        self.blocking_sites: SiteCounter = SiteCounter()
+        self.last_lag = 0.0
+        self._window_max_lag = 0.0
+        self._window_lag_total = 0.0
+        self._window_samples = 0
+
+        self._heartbeat = 0.0
+        self._captured_heartbeat: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._report_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._probe_task is not None
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = perf_counter()
+        self._stopped.clear()
+        self._probe_task = asyncio.create_task(self._probe())
+        self._report_task = asyncio.create_task(self._report())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="event-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            "Event loop monitor started",
+            extra={"interval": self.interval, "block_threshold": self.block_threshold}
+        )
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._stopped.set()
+        for task in (self._probe_task, self._report_task):
+            task.cancel()
+        await asyncio.gather(self._probe_task, self._report_task, return_exceptions=True)
+        self._probe_task = self._report_task = None
+        self._log_summary()
+
+    def top_blocking_sites(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        return self.blocking_sites.most_common(n or self.top_sites)
+
+    async def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled)
+            self._heartbeat = perf_counter()
+
+            self.last_lag = lag
+            self._window_samples += 1
+            self._window_lag_total += lag
+            if lag > self._window_max_lag:
+                self._window_max_lag = lag
+            loop_lag_seconds.observe(lag)
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self._log_summary()
+
+    def _log_summary(self) -> None:
+        samples = self._window_samples
+        logger.info(
+            "Event loop lag summary",
+            extra={
+                "lag_max_ms": round(self._window_max_lag * 1000, 3),
+                "lag_mean_ms": round(self._window_lag_total / samples * 1000, 3) if samples else 0.0,
+                "samples": samples,
+                "top_blocking_sites": [
+                    {"site": site, "count": count}
+                    for site, count in self.top_blocking_sites()
+                ]
+            }
+        )
+        self._window_max_lag = 0.0
+        self._window_lag_total = 0.0
+        self._window_samples = 0
+
+    def _watch(self) -> None:
+        poll = min(self.interval, self.block_threshold) / 2
+        while not self._stopped.wait(poll):
+            heartbeat = self._heartbeat
+            stalled = perf_counter() - heartbeat - self.interval
+            if stalled < self.block_threshold or heartbeat == self._captured_heartbeat:
+                continue
+
+            # One capture per stall: the heartbeat only moves once the loop runs again
+            self._captured_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            site = self._blocking_site(frame)
+            self.blocking_sites[site] += 1
+            loop_blocked_total.inc(site=site)
+            logger.warning(
+                "Event loop blocked",
+                extra={
+                    "blocked_for_ms": round(stalled * 1000, 3),
+                    "site": site,
+                    "stack": "".join(traceback.format_stack(frame))
+                }
+            )
+
+    @staticmethod
+    def _blocking_site(frame: FrameType) -> str:
+        app_frame = frame
+        while app_frame is not None and not app_frame.f_code.co_filename.startswith(APP_ROOT):
+            app_frame = app_frame.f_back
+        frame = app_frame or frame
+
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_ROOT):
+            filename = os.path.relpath(filename, os.path.dirname(APP_ROOT.rstrip(os.sep)))
+        return f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+loop_monitor = EventLoopMonitor(
+    interval=settings.monitoring.LOOP_MONITOR_INTERVAL,
+    block_threshold=settings.monitoring.LOOP_BLOCK_THRESHOLD,
+    report_interval=settings.monitoring.LOOP_REPORT_INTERVAL
+)
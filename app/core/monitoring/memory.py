@@ -0,0 +1,180 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import gc
+import logging
+import os
+import resource
+import threading
+import tracemalloc
+
+from ..config import settings
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+resident_memory_bytes = registry.gauge(
+    "process_resident_memory_bytes",
+    "Resident set size of the worker process"
+)
+gc_counts = registry.gauge(
+    "python_gc_generation_count",
+    "Collection threshold counters per generation (gc.get_count)",
+    labelnames=("generation",)
+)
+gc_collections = registry.gauge(
+    "python_gc_collections",
+    "Garbage collections run since start, per generation",
+    labelnames=("generation",)
+)
+structure_entries = registry.gauge(
+    "app_structure_entries",
+    "Entries held by in-memory application structures",
+    labelnames=("structure",)
+)
+structure_bytes = registry.gauge(
+    "app_structure_bytes",
+    "Approximate bytes held by in-memory application structures",
+    labelnames=("structure",)
+)
+
+_memory_reporters: Dict[str, Callable[[], Dict[str, int]]] = {}
+
+def register_memory_reporter(name: str, reporter: Callable[[], Dict[str, int]]) -> None:
+    """
+    Register a callable describing an in-memory structure.
+
+    It must return at least ``entries`` and ``bytes``; any extra keys are
+    included in the debug API output.
+    """
+    _memory_reporters[name] = reporter
+
+def structure_stats() -> Dict[str, Dict[str, int]]:
+    stats = {}
+    for name, reporter in list(_memory_reporters.items()):
+        try:
+            stats[name] = reporter()
+        except Exception as e:
+            logger.warning(f"Memory reporter {name} failed: {str(e)}")
+    return stats
+
+def resident_memory() -> int:
+    """Current RSS in bytes; falls back to peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def memory_summary() -> Dict[str, Any]:
+    return {
+        "rss_bytes": resident_memory(),
+        "gc": {
+            "counts": gc.get_count(),
+            "collections": [generation["collections"] for generation in gc.get_stats()],
+            "uncollectable": [generation["uncollectable"] for generation in gc.get_stats()]
+        },
+        "structures": structure_stats(),
+        "tracemalloc": tracemalloc_tracker.status()
+    }
+
+class TracemallocTracker:
+    """Start/stop tracemalloc and keep a few numbered snapshots to diff."""
+
+    def __init__(self, max_snapshots: int = 5):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[int, tracemalloc.Snapshot]" = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def start(self, frames: int = 1) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        traced, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshot_ids = list(self._snapshots)
+        return {
+            "tracing": tracing,
+            "traced_bytes": traced,
+            "peak_bytes": peak,
+            "snapshots": snapshot_ids
+        }
+
+    def take_snapshot(self) -> int:
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot_id
+
+    def get(self, snapshot_id: int) -> Optional[tracemalloc.Snapshot]:
+        with self._lock:
+            return self._snapshots.get(snapshot_id)
+
+    @staticmethod
+    def diff(
+        base: tracemalloc.Snapshot,
+        target: tracemalloc.Snapshot,
+        limit: int = 25
+    ) -> List[Dict[str, Any]]:
+        stats = target.compare_to(base, "lineno")
+        return [
+            {
+                "file": stat.traceback[0].filename,
+                "line": stat.traceback[0].lineno,
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+                "count": stat.count
+            }
+            for stat in stats[:limit]
+        ]
+
+class MemoryReporter:
+    """Periodically publishes RSS, GC and structure-size gauges."""
+
+    def __init__(self, interval: float = 30.0):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def publish(self) -> None:
+        resident_memory_bytes.set(resident_memory())
+        for generation, (count, stats) in enumerate(zip(gc.get_count(), gc.get_stats())):
+            gc_counts.set(count, generation=generation)
+            gc_collections.set(stats["collections"], generation=generation)
+        for name, stats in structure_stats().items():
+            structure_entries.set(stats.get("entries", 0), structure=name)
+            structure_bytes.set(stats.get("bytes", 0), structure=name)
+
+    async def _run(self) -> None:
+        while True:
+            self.publish()
+            await asyncio.sleep(self.interval)
+
+tracemalloc_tracker = TracemallocTracker(max_snapshots=settings.monitoring.MEMORY_MAX_SNAPSHOTS)
+memory_reporter = MemoryReporter(interval=settings.monitoring.MEMORY_REPORT_INTERVAL)
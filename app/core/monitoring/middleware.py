@@ -1,15 +1,32 @@
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
-import sentry_sdk
-from typing import Callable, Awaitable
+from typing import Callable, Awaitable, Dict, Optional
 import time
+import uuid
+from starlette.datastructures import MutableHeaders
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..lifecycle import drain_controller
+from .health import health_monitor
+from .profiler import Profile, profile_store, profiler, should_profile
+
+PROBE_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"cache-control", b"no-store"),
+]
 
 class SentryContextMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app: ASGIApp):
+        super().__init__(app)
+        # Only added when Sentry is enabled, so the SDK is imported here, not at module load
+        import sentry_sdk
+        self.sentry_sdk = sentry_sdk
+
     async def dispatch(
         self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
     ) -> Response:
-        with sentry_sdk.configure_scope() as scope:
+        with self.sentry_sdk.configure_scope() as scope:
             scope.set_extra("request_id", request.state.request_id)
             scope.set_tag("http_method", request.method)
             scope.set_tag("path", request.url.path)
@@ -29,4 +46,110 @@ class SentryContextMiddleware(BaseHTTPMiddleware):
                 scope.set_tag("error_type", type(e).__name__)
                 raise
             finally:
-                scope.set_extra("response_time", time.time() - start_time)
\ No newline at end of file
+                scope.set_extra("response_time", time.time() - start_time)
+
+class ProfilingMiddleware:
+    """
+    Runs opted-in requests under the sampling profiler.
+
+    A request is profiled when it carries a valid signed ``header_name``
+    token or is picked by its route's sample rate. The profile is stored
+    under the request ID set by RequestIDMiddleware, which is also echoed
+    back in ``X-Profile-ID`` so it can be matched to the access-log line.
+
+    This is a plain ASGI middleware and must sit inside the BaseHTTP
+    middlewares so it shares the endpoint's task.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        header_name: str = "X-Profile-Token",
+        route_sample_rates: Optional[Dict[str, float]] = None
+    ):
+        self.app = app
+        self.header_name = header_name.lower().encode("latin-1")
+        self.route_sample_rates = route_sample_rates or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = None
+        for name, value in scope["headers"]:
+            if name == self.header_name:
+                token = value.decode("latin-1")
+                break
+
+        trigger = should_profile(scope["path"], token, self.route_sample_rates)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = scope.get("state", {}).get("request_id") or str(uuid.uuid4())
+        profile = Profile(request_id, scope["method"], scope["path"], trigger, profiler.interval)
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Profile-ID", request_id)
+            await send(message)
+
+        profiler.start(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop(profile)
+            profile.finish(status_code)
+            profile_store.add(profile)
+
+
+class HealthProbeMiddleware:
+    """
+    Answers liveness and readiness probes before any other middleware runs.
+
+    Liveness only proves the event loop is serving requests. Readiness is
+    read from the background-refreshed ``health_monitor`` snapshot and also
+    requires the application warmup to have finished and the process not
+    to be draining. Neither touches the database on the request path. Add
+    it last so it is the outermost layer.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        live_path: str = "/health/live",
+        ready_path: str = "/health/ready"
+    ):
+        self.app = app
+        self.live_path = live_path
+        self.ready_path = ready_path
+        self.live_body = b'{"status": "alive"}'
+        self.warming_up_body = b'{"status": "warming_up"}'
+        self.draining_body = b'{"status": "draining"}'
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in (self.live_path, self.ready_path):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"] == self.live_path:
+            status_code, body = 200, self.live_body
+        elif drain_controller.draining:
+            status_code, body = 503, self.draining_body
+        elif not getattr(scope["app"].state, "warmup_complete", False):
+            status_code, body = 503, self.warming_up_body
+        else:
+            ready, body = health_monitor.readiness()
+            status_code = 200 if ready else 503
+
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": PROBE_HEADERS + [(b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
\ No newline at end of file
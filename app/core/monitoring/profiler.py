@@ -0,0 +1,216 @@
+from collections import OrderedDict
+from time import perf_counter, sleep, time
+from types import FrameType
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import hmac
+import os
+import random
+import sys
+import threading
+
+from ..config import settings
+
+class CallNode:
+    __slots__ = ("name", "samples", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.samples = 0
+        self.children: Dict[str, "CallNode"] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "samples": self.samples,
+            "children": [
+                child.to_dict()
+                for child in sorted(self.children.values(), key=lambda c: -c.samples)
+            ]
+        }
+
+class Profile:
+    """Call tree of samples taken while one request held the event loop."""
+
+    def __init__(self, request_id: str, method: str, path: str, trigger: str, interval: float):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.interval = interval
+        self.started_at = time()
+        self.duration: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.root = CallNode("<request>")
+        self._start = perf_counter()
+
+    def add_stack(self, stack: List[str]) -> None:
+        node = self.root
+        node.samples += 1
+        for name in stack:
+            child = node.children.get(name)
+            if child is None:
+                child = node.children[name] = CallNode(name)
+            child.samples += 1
+            node = child
+
+    def elapsed(self) -> float:
+        return perf_counter() - self._start
+
+    def finish(self, status_code: Optional[int]) -> None:
+        self.duration = perf_counter() - self._start
+        self.status_code = status_code
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "samples": self.root.samples,
+            "sample_interval_ms": self.interval * 1000
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.summary(), "call_tree": self.root.to_dict()}
+
+class ProfileStore:
+    """Keeps the most recent ``max_profiles`` finished profiles, keyed by request ID."""
+
+    def __init__(self, max_profiles: int = 50):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles[profile.request_id] = profile
+            self._profiles.move_to_end(profile.request_id)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[Profile]:
+        with self._lock:
+            return self._profiles.get(request_id)
+
+    def list(self) -> List[Profile]:
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+class SamplingProfiler:
+    """
+    Samples the event loop thread's stack from a background thread.
+
+    A sample is attributed to a profile only when the task that owns it is
+    the one currently running on the loop, so concurrent requests do not
+    pollute each other's call trees. The sampler thread only runs while at
+    least one profile is active.
+    """
+
+    def __init__(self, interval: float = 0.005, max_duration: float = 30.0):
+        self.interval = interval
+        self.max_duration = max_duration
+        self._active: Dict[asyncio.Task, Profile] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def start(self, profile: Profile) -> None:
+        task = asyncio.current_task()
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+            self._active[task] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def stop(self, profile: Profile) -> None:
+        with self._lock:
+            for task, active in list(self._active.items()):
+                if active is profile:
+                    del self._active[task]
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._wakeup.clear()
+            if not self._wakeup.wait(timeout=60):
+                with self._lock:
+                    if not self._active:
+                        self._thread = None
+                        return
+                continue
+            self._sample()
+            sleep(self.interval)
+
+    def _sample(self) -> None:
+        task = asyncio.current_task(self._loop)
+        profile = self._active.get(task) if task is not None else None
+        if profile is None:
+            return
+        if profile.elapsed() > self.max_duration:
+            self.stop(profile)
+            return
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is not None:
+            profile.add_stack(self._stack(frame))
+
+    @staticmethod
+    def _stack(frame: Optional[FrameType]) -> List[str]:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            # Everything below the task step is event loop machinery
+            if code.co_name == "_run" and code.co_filename.endswith(os.path.join("asyncio", "events.py")):
+                break
+            stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+def create_profile_token(ttl: int = 600) -> str:
+    """Token for the profiling header, valid for ``ttl`` seconds."""
+    expires = str(int(time()) + ttl)
+    signature = hmac.new(
+        settings.security.derive_key("profile-token"), expires.encode(), hashlib.sha256
+    ).hexdigest()
+    return f"{expires}.{signature}"
+
+def verify_profile_token(token: str) -> bool:
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time():
+        return False
+    expected = hmac.new(
+        settings.security.derive_key("profile-token"), expires.encode(), hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+def should_profile(path: str, token: Optional[str], route_sample_rates: Dict[str, float]) -> Optional[str]:
+    """Return why a request should be profiled ("header" or "sampled"), or None."""
+    if token and verify_profile_token(token):
+        return "header"
+    rate = route_sample_rates.get(path, 0.0)
+    if rate > 0.0 and random.random() < rate:
+        return "sampled"
+    return None
+
+profiler = SamplingProfiler(
+    interval=settings.monitoring.PROFILING_SAMPLE_INTERVAL,
+    max_duration=settings.monitoring.PROFILING_MAX_DURATION
+)
+profile_store = ProfileStore(max_profiles=settings.monitoring.PROFILING_MAX_PROFILES)
+
+if __name__ == "__main__":
+    ttl = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    print(create_profile_token(ttl))
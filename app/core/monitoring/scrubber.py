@@ -0,0 +1,26 @@
+from sentry_sdk.scrubber import EventScrubber
+from typing import Any, Dict, Set
+import re
+
+class CustomEventScrubber(EventScrubber):
+    def __init__(self, sensitive_fields: Set[str]):
+        super().__init__()
+        self.sensitive_fields = sensitive_fields
+        pattern = '|'.join(field for field in sensitive_fields)
+        self.sensitive_pattern = re.compile(pattern, re.IGNORECASE)
+
+    def scrub_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(data, dict):
+            return data
+
+        scrubbed_data = data.copy()
+        for key, value in data.items():
+            if isinstance(value, (dict, list)):
+                scrubbed_data[key] = self.scrub_data(value)
+            elif isinstance(key, str) and self.sensitive_pattern.search(key):
+                scrubbed_data[key] = "[Filtered]"
+            elif isinstance(value, str) and any(
+                field in value.lower() for field in self.sensitive_fields
+            ):
+                scrubbed_data[key] = "[Filtered]"
+        return scrubbed_data
\ No newline at end of file
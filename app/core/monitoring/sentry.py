@@ -1,13 +1,6 @@
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration
-from sentry_sdk.integrations.asyncio import AsyncioIntegration
-from sentry_sdk.integrations.logging import LoggingIntegration
-from sentry_sdk.integrations.stdlib import StdlibIntegration
-from sentry_sdk.scrubber import EventScrubber
 from functools import lru_cache
 from typing import Optional, List, Dict, Any, Set
 import logging
-import re
 from ..config import settings
 
 logger = logging.getLogger(__name__)
@@ -44,29 +37,6 @@ class SentryConfig:
         self.ignore_errors = ignore_errors or []
         self.custom_tags = custom_tags or {}
 
-class CustomEventScrubber(EventScrubber):
-    def __init__(self, sensitive_fields: Set[str]):
-        super().__init__()
-        self.sensitive_fields = sensitive_fields
-        pattern = '|'.join(field for field in sensitive_fields)
-        self.sensitive_pattern = re.compile(pattern, re.IGNORECASE)
-
-    def scrub_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        if not isinstance(data, dict):
-            return data
-
-        scrubbed_data = data.copy()
-        for key, value in data.items():
-            if isinstance(value, (dict, list)):
-                scrubbed_data[key] = self.scrub_data(value)
-            elif isinstance(key, str) and self.sensitive_pattern.search(key):
-                scrubbed_data[key] = "[Filtered]"
-            elif isinstance(value, str) and any(
-                field in value.lower() for field in self.sensitive_fields
-            ):
-                scrubbed_data[key] = "[Filtered]"
-        return scrubbed_data
-
 class SentryService:
     def __init__(self, config: SentryConfig):
         self.config = config
@@ -77,6 +47,10 @@ class SentryService:
             logger.warning("Sentry is already initialized")
             return
 
+        # Imported here so the SDK and its integrations load only when enabled
+        import sentry_sdk
+        from .scrubber import CustomEventScrubber
+
         try:
             sentry_sdk.init(
                 dsn=self.config.dsn,
@@ -110,7 +84,18 @@ class SentryService:
             logger.error(f"Failed to initialize Sentry: {str(e)}", exc_info=True)
             raise
 
+    def flush(self, timeout: float = 2.0) -> None:
+        """Block until queued events are sent or ``timeout`` passes."""
+        if self._initialized:
+            import sentry_sdk
+            sentry_sdk.flush(timeout=timeout)
+
     def _get_integrations(self) -> List[Any]:
+        from sentry_sdk.integrations.fastapi import FastApiIntegration
+        from sentry_sdk.integrations.asyncio import AsyncioIntegration
+        from sentry_sdk.integrations.logging import LoggingIntegration
+        from sentry_sdk.integrations.stdlib import StdlibIntegration
+
         return [
             FastApiIntegration(transaction_style="url"),
             AsyncioIntegration(),
@@ -168,4 +153,15 @@ def get_sentry_service() -> SentryService:
             "app_version": settings.app.VERSION
         }
     )
-    return SentryService(config)
\ No newline at end of file
+    return SentryService(config)
+
+def capture_exception(error: BaseException) -> None:
+    """Report ``error`` to Sentry; does nothing (without importing the SDK) when disabled."""
+    if settings.logging.SENTRY_ENABLED:
+        import sentry_sdk
+        sentry_sdk.capture_exception(error)
+
+def add_breadcrumb(**kwargs: Any) -> None:
+    if settings.logging.SENTRY_ENABLED:
+        import sentry_sdk
+        sentry_sdk.add_breadcrumb(**kwargs)
\ No newline at end of file
@@ -0,0 +1,93 @@
+from contextvars import ContextVar, Token
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+import inspect
+
+_request_timings: ContextVar[Optional["RequestTimings"]] = ContextVar(
+    "request_timings", default=None
+)
+
+class RequestTimings:
+    """Accumulates per-phase durations (in seconds) for a single request."""
+
+    __slots__ = ("phases",)
+
+    def __init__(self):
+        # phase name -> [total seconds, call count]
+        self.phases: Dict[str, List[float]] = {}
+
+    def record(self, name: str, duration: float) -> None:
+        phase = self.phases.get(name)
+        if phase is None:
+            self.phases[name] = [duration, 1]
+        else:
+            phase[0] += duration
+            phase[1] += 1
+
+    def total(self, name: str) -> float:
+        phase = self.phases.get(name)
+        return phase[0] if phase else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            name: round(duration * 1000, 3)
+            for name, (duration, _) in self.phases.items()
+        }
+
+    def to_header(self) -> str:
+        entries = []
+        for name, (duration, count) in self.phases.items():
+            entry = f"{name};dur={duration * 1000:.3f}"
+            if count > 1:
+                entry += f';desc="{int(count)} calls"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+def start_request_timings() -> Tuple[RequestTimings, Token]:
+    timings = RequestTimings()
+    return timings, _request_timings.set(timings)
+
+def reset_request_timings(token: Token) -> None:
+    _request_timings.reset(token)
+
+def get_request_timings() -> Optional[RequestTimings]:
+    return _request_timings.get()
+
+class timed:
+    """
+    Context manager recording the duration of a block under ``name``.
+
+    A no-op when no request is being timed, so it is safe to use from code
+    that also runs outside the request cycle (startup, scripts).
+    """
+
+    __slots__ = ("name", "timings", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "timed":
+        self.timings = _request_timings.get()
+        if self.timings is not None:
+            self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.timings is not None:
+            self.timings.record(self.name, perf_counter() - self.start)
+
+def track_timing(name: str):
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with timed(name):
+                return await func(*args, **kwargs)
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with timed(name):
+                return func(*args, **kwargs)
+
+        return async_wrapper if inspect.iscoroutinefunction(func) else sync_wrapper
+    return decorator
@@ -0,0 +1,64 @@
+from typing import Optional
+import gzip
+import hashlib
+import json
+import logging
+
+from fastapi import FastAPI
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+class OpenAPICache:
+    """
+    Serves the OpenAPI schema from bytes built once.
+
+    ``build`` generates the schema after every router is included, then
+    keeps the serialized JSON, a gzip variant and a strong ETag, so a
+    docs load costs a header comparison instead of a walk over every
+    route and model.
+    """
+
+    def __init__(self):
+        self.body: Optional[bytes] = None
+        self.gzipped: Optional[bytes] = None
+        self.etag: Optional[str] = None
+
+    def build(self, app: FastAPI) -> None:
+        app.openapi_schema = None  # drop anything generated before all routes were in
+        schema = app.openapi()
+        self.body = json.dumps(schema, ensure_ascii=False, separators=(",", ":")).encode()
+        self.gzipped = gzip.compress(self.body, compresslevel=9, mtime=0)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        logger.info(
+            "OpenAPI schema built",
+            extra={"bytes": len(self.body), "gzip_bytes": len(self.gzipped)}
+        )
+
+    async def endpoint(self, request: Request) -> Response:
+        if self.body is None:
+            self.build(request.app)
+
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding"
+        }
+        if self._matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(self.gzipped, media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+    def _matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = (tag.strip() for tag in if_none_match.split(","))
+        return any(tag.removeprefix("W/") == self.etag for tag in tags)
+
+openapi_cache = OpenAPICache()
\ No newline at end of file
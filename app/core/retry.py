@@ -0,0 +1,159 @@
+from functools import wraps
+from typing import Callable, Optional
+import asyncio
+import logging
+import random
+
+from pymongo.errors import (
+    AutoReconnect,
+    NotPrimaryError,
+    OperationFailure,
+    PyMongoError,
+    ServerSelectionTimeoutError,
+)
+
+from .config import settings
+from .deadline import remaining_budget
+from .monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Server error codes meaning the operation was refused before being applied
+# (not primary / node shutting down), so retrying cannot apply it twice
+REJECTED_ERROR_CODES = frozenset({
+    91,     # ShutdownInProgress
+    189,    # PrimarySteppedDown
+    10107,  # NotWritablePrimary
+    11600,  # InterruptedAtShutdown
+    11602,  # InterruptedDueToReplStateChange
+    13435,  # NotPrimaryNoSecondaryOk
+    13436,  # NotPrimaryOrSecondary
+})
+
+retries_total = registry.counter(
+    "db_retries_total",
+    "Repository operation retries",
+    labelnames=("operation", "error")
+)
+retries_denied_total = registry.counter(
+    "db_retries_denied_total",
+    "Retryable failures that were not retried",
+    labelnames=("operation", "reason")
+)
+
+def classify_error(exc: Optional[BaseException]) -> Optional[str]:
+    """
+    Classify a failure by walking its cause chain.
+
+    Returns "rejected" when the server refused the operation (safe to retry
+    anything), "transient" when the outcome is unknown, e.g. the connection
+    dropped mid-flight (safe to retry idempotent operations only), or None
+    when a retry would not help.
+    """
+    while exc is not None:
+        if isinstance(exc, NotPrimaryError):
+            return "rejected"
+        if isinstance(exc, OperationFailure) and exc.code in REJECTED_ERROR_CODES:
+            return "rejected"
+        if isinstance(exc, PyMongoError) and exc.has_error_label("RetryableWriteError"):
+            return "rejected"
+        if isinstance(exc, ServerSelectionTimeoutError):
+            # The driver already waited for a server; retrying only doubles the wait
+            return None
+        if isinstance(exc, AutoReconnect):
+            return "transient"
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of successful calls.
+
+    Every success deposits ``ratio`` tokens, up to ``max_tokens``, and every
+    retry spends one. During an outage successes stop, the bucket drains,
+    and failures go back to the caller instead of multiplying the load.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+retry_budget = RetryBudget(
+    ratio=settings.db.MONGODB_RETRY_BUDGET_RATIO,
+    max_tokens=settings.db.MONGODB_RETRY_BUDGET_MAX_TOKENS
+)
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Exponential backoff with full jitter for the given (0-based) retry."""
+    return random.uniform(0.0, min(max_delay, base_delay * (2 ** attempt)))
+
+def retryable(
+    idempotent: bool,
+    max_attempts: Optional[int] = None,
+    budget: RetryBudget = retry_budget
+) -> Callable:
+    """
+    Retry an async repository method on transient MongoDB errors.
+
+    ``idempotent`` states whether running the method twice is harmless;
+    non-idempotent methods are only retried when the server rejected the
+    first attempt outright. No retry is made when the budget is exhausted
+    or the backoff would overrun the request deadline.
+    """
+    def decorator(func: Callable) -> Callable:
+        if not settings.db.MONGODB_RETRY_ENABLED:
+            return func
+        attempts = max_attempts or settings.db.MONGODB_RETRY_ATTEMPTS
+        operation = func.__qualname__
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            attempt = 0
+            while True:
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    error = classify_error(e)
+                    if error is None or (error == "transient" and not idempotent):
+                        raise
+                    if attempt + 1 >= attempts:
+                        retries_denied_total.inc(operation=operation, reason="attempts")
+                        raise
+
+                    delay = backoff_delay(
+                        attempt,
+                        settings.db.MONGODB_RETRY_BASE_DELAY,
+                        settings.db.MONGODB_RETRY_MAX_DELAY
+                    )
+                    remaining = remaining_budget()
+                    if remaining is not None and delay >= remaining:
+                        retries_denied_total.inc(operation=operation, reason="deadline")
+                        raise
+                    if not budget.withdraw():
+                        retries_denied_total.inc(operation=operation, reason="budget")
+                        raise
+
+                    attempt += 1
+                    retries_total.inc(operation=operation, error=error)
+                    logger.warning(
+                        f"Retrying {operation} after {error} error",
+                        extra={"attempt": attempt, "delay": round(delay, 4), "error": str(e)}
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+
+                budget.deposit()
+                return result
+
+        return wrapper
+    return decorator
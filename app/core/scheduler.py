@@ -0,0 +1,152 @@
+from collections import deque
+from time import perf_counter
+from typing import Deque, Dict, Optional
+import asyncio
+
+from .monitoring.metrics import registry
+
+scheduler_in_flight = registry.gauge(
+    "scheduler_in_flight",
+    "Requests running per priority class",
+    labelnames=("priority_class",)
+)
+scheduler_queued = registry.gauge(
+    "scheduler_queued",
+    "Requests waiting per priority class",
+    labelnames=("priority_class",)
+)
+scheduler_wait_seconds = registry.histogram(
+    "scheduler_wait_seconds",
+    "Time spent waiting for a slot, per priority class",
+    labelnames=("priority_class",)
+)
+scheduler_rejected_total = registry.counter(
+    "scheduler_rejected_total",
+    "Requests rejected by the priority scheduler",
+    labelnames=("priority_class", "reason")
+)
+
+class PriorityClass:
+    __slots__ = ("name", "weight", "reserved", "shared_in_flight", "reserved_in_flight", "waiters")
+
+    def __init__(self, name: str, weight: float = 1.0, reserved: int = 0):
+        self.name = name
+        self.weight = weight
+        self.reserved = int(reserved)
+        self.shared_in_flight = 0
+        self.reserved_in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        return self.shared_in_flight + self.reserved_in_flight
+
+    def share(self) -> float:
+        """In-flight requests relative to weight; the lowest is served next."""
+        return self.in_flight / self.weight
+
+class PriorityScheduler:
+    """
+    Weighted fair sharing of a fixed number of request slots.
+
+    When slots are free every class is admitted immediately. Under
+    contention freed slots go to the waiting class whose in-flight count is
+    smallest relative to its weight. A class can also hold ``reserved`` slots
+    outside the shared pool, so e.g. health checks keep running while the
+    shared pool is saturated by logins.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        classes: Dict[str, Dict[str, float]],
+        default_class: str = "default",
+        queue_timeout: float = 5.0,
+        max_queue: int = 256
+    ):
+        self.capacity = capacity
+        self.default_class = default_class
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.shared_in_flight = 0
+        self.classes: Dict[str, PriorityClass] = {
+            name: PriorityClass(name, **params) for name, params in classes.items()
+        }
+        self.classes.setdefault(default_class, PriorityClass(default_class))
+
+    def get_class(self, name: str) -> PriorityClass:
+        return self.classes.get(name) or self.classes[self.default_class]
+
+    async def acquire(self, name: str) -> Optional[str]:
+        """Take a slot for class ``name``; returns None or the reason it was refused."""
+        priority_class = self.get_class(name)
+        if not priority_class.waiters and self._try_admit(priority_class):
+            return None
+        if len(priority_class.waiters) >= self.max_queue:
+            scheduler_rejected_total.inc(priority_class=priority_class.name, reason="queue_full")
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        priority_class.waiters.append(waiter)
+        self._publish(priority_class)
+        start_time = perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+            return None
+        except asyncio.TimeoutError:
+            scheduler_rejected_total.inc(priority_class=priority_class.name, reason="queue_timeout")
+            return "queue_timeout"
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(name)
+            raise
+        finally:
+            scheduler_wait_seconds.observe(perf_counter() - start_time, priority_class=priority_class.name)
+            try:
+                priority_class.waiters.remove(waiter)
+            except ValueError:
+                pass
+            self._publish(priority_class)
+
+    def release(self, name: str) -> None:
+        priority_class = self.get_class(name)
+        # Give back a shared slot first so the reserved one stays available to this class
+        if priority_class.shared_in_flight:
+            priority_class.shared_in_flight -= 1
+            self.shared_in_flight -= 1
+        else:
+            priority_class.reserved_in_flight -= 1
+        self._publish(priority_class)
+        self._dispatch()
+
+    def _try_admit(self, priority_class: PriorityClass) -> bool:
+        if priority_class.reserved_in_flight < priority_class.reserved:
+            priority_class.reserved_in_flight += 1
+        elif self.shared_in_flight < self.capacity:
+            priority_class.shared_in_flight += 1
+            self.shared_in_flight += 1
+        else:
+            return False
+        self._publish(priority_class)
+        return True
+
+    def _dispatch(self) -> None:
+        while True:
+            waiting = [c for c in self.classes.values() if c.waiters]
+            if not waiting:
+                return
+            # Classes with a free reserved slot first, then the most underserved one
+            waiting.sort(key=lambda c: (c.reserved_in_flight >= c.reserved, c.share()))
+            priority_class = waiting[0]
+            waiter = priority_class.waiters.popleft()
+            if waiter.done():
+                continue
+            if not self._try_admit(priority_class):
+                priority_class.waiters.appendleft(waiter)
+                return
+            waiter.set_result(None)
+
+    @staticmethod
+    def _publish(priority_class: PriorityClass) -> None:
+        scheduler_in_flight.set(priority_class.in_flight, priority_class=priority_class.name)
+        scheduler_queued.set(len(priority_class.waiters), priority_class=priority_class.name)
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, Optional, Tuple
+import hashlib
+import hmac
+import secrets
+import sys
+
+from app.core.config import settings
+from app.core.db import mongodb
+from app.core.monitoring.memory import register_memory_reporter
+from app.core.monitoring.metrics import registry
+from app.models.domain.api_key import ApiKeyInDB
+from app.repositories.api_key_repository import ApiKeyRepository
+
+api_key_lookups_total = registry.counter(
+    "api_key_lookups_total",
+    "API key resolutions by where the answer came from",
+    labelnames=("source",)
+)
+
+def generate_api_key() -> str:
+    """
+    Create a new random API key
+
+    Returns:
+        The key, shown to its owner once and never stored
+    """
+    return settings.security.API_KEY_PREFIX + secrets.token_urlsafe(32)
+
+class ApiKeyAuthenticator:
+    """
+    Resolves presented API keys to their stored records.
+
+    Keys carry 256 random bits, so a slow password hash buys nothing:
+    they are stored and looked up as HMAC-SHA256 under a server-side
+    secret, which costs about a microsecond. Resolved keys, and misses
+    for ``negative_ttl``, sit in a TTL cache so repeat callers cost no
+    database round trip; a revocation reaches other workers within
+    ``ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        secret: bytes,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        max_entries: int = 10_000,
+        repository: Optional[ApiKeyRepository] = None
+    ):
+        self._secret = secret
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._repository = repository
+        # key hash -> (expires_at, record or None for unknown keys)
+        self._cache: "OrderedDict[str, Tuple[float, Optional[ApiKeyInDB]]]" = OrderedDict()
+        register_memory_reporter("api_key_cache", self.memory_stats)
+
+    @property
+    def repository(self) -> ApiKeyRepository:
+        if self._repository is None:
+            self._repository = ApiKeyRepository(mongodb.client)
+        return self._repository
+
+    def hash_key(self, key: str) -> str:
+        return hmac.new(self._secret, key.encode(), hashlib.sha256).hexdigest()
+
+    def cached(self, key_hash: str) -> Optional[ApiKeyInDB]:
+        """The cached active record for ``key_hash``, without touching the database."""
+        entry = self._cache.get(key_hash)
+        if entry is None or entry[0] < monotonic() or entry[1] is None:
+            return None
+        return entry[1] if entry[1].is_active() else None
+
+    async def authenticate(self, key: str) -> Optional[ApiKeyInDB]:
+        """
+        Resolve a presented API key
+
+        Args:
+            key: The raw key from the request
+
+        Returns:
+            The key's record if it exists, is not revoked and has not expired
+        """
+        key_hash = self.hash_key(key)
+        entry = self._cache.get(key_hash)
+        if entry is not None and entry[0] >= monotonic():
+            api_key_lookups_total.inc(source="cache")
+            self._cache.move_to_end(key_hash)
+            api_key = entry[1]
+        else:
+            api_key_lookups_total.inc(source="db")
+            api_key = await self.repository.get_by_hash(key_hash)
+            self._store(key_hash, api_key)
+
+        if api_key is None or not api_key.is_active():
+            return None
+        return api_key
+
+    def invalidate(self, key_hash: str) -> None:
+        self._cache.pop(key_hash, None)
+
+    def _store(self, key_hash: str, api_key: Optional[ApiKeyInDB]) -> None:
+        ttl = self.ttl if api_key is not None else self.negative_ttl
+        self._cache[key_hash] = (monotonic() + ttl, api_key)
+        self._cache.move_to_end(key_hash)
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def memory_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._cache),
+            "bytes": sys.getsizeof(self._cache) + sum(
+                sys.getsizeof(key_hash) + sys.getsizeof(entry)
+                for key_hash, entry in self._cache.items()
+            )
+        }
+
+api_key_authenticator = ApiKeyAuthenticator(
+    secret=(
+        settings.security.API_KEY_HMAC_SECRET.encode() if settings.security.API_KEY_HMAC_SECRET
+        else settings.security.derive_key("api-key-hmac")
+    ),
+    ttl=settings.security.API_KEY_CACHE_TTL,
+    negative_ttl=settings.security.API_KEY_NEGATIVE_CACHE_TTL,
+    max_entries=settings.security.API_KEY_CACHE_MAX_ENTRIES
+)
\ No newline at end of file
@@ -0,0 +1,249 @@
+from datetime import datetime, timedelta, timezone
+from time import time
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.db import mongodb
+from app.core.monitoring.metrics import registry
+from app.models.domain.signing_key import SigningKeyInDB
+from app.repositories.signing_key_repository import SigningKeyRepository
+
+logger = logging.getLogger(__name__)
+
+jwt_signing_keys = registry.gauge(
+    "jwt_signing_keys",
+    "Signing keys currently published in the JWKS"
+)
+jwt_unknown_kid_total = registry.counter(
+    "jwt_unknown_kid_total",
+    "Access tokens refused because their kid is not in the keyring"
+)
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def _epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+class SigningKeyring:
+    """
+    Rotating ES256 keys for access tokens, shared by every worker through
+    MongoDB.
+
+    Time is cut into ``rotation_interval`` generations and each generation
+    has exactly one key (a unique index settles races between workers).
+    The next generation's key is created and published a full period
+    before it starts signing, so services caching the JWKS already hold
+    it at the switch; a retired key stays published until every token it
+    signed has expired. Verification looks the token's ``kid`` up in a
+    dict of preparsed public keys and never leaves the process.
+    """
+
+    algorithm = "ES256"
+
+    def __init__(
+        self,
+        secret: bytes,
+        rotation_interval: timedelta,
+        token_lifetime: timedelta,
+        refresh_interval: float = 60.0,
+        jwks_max_age: int = 300,
+        repository: Optional[SigningKeyRepository] = None
+    ):
+        self._secret = secret
+        self.rotation_interval = rotation_interval
+        self.token_lifetime = token_lifetime
+        self.refresh_interval = refresh_interval
+        self.jwks_max_age = jwks_max_age
+        self._repository = repository
+
+        self._records: Dict[str, SigningKeyInDB] = {}
+        self._verifiers: Dict[str, Any] = {}  # kid -> preparsed public key
+        # (activates_at, retires_at, kid, preparsed private key), by activation
+        self._signers: List[Tuple[float, float, str, Any]] = []
+        self.jwks: Optional[bytes] = None
+        self.etag: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def repository(self) -> SigningKeyRepository:
+        if self._repository is None:
+            self._repository = SigningKeyRepository(mongodb.client)
+        return self._repository
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._signers)
+
+    def generation_at(self, when: datetime) -> int:
+        return int(_epoch(when) // self.rotation_interval.total_seconds())
+
+    def signer(self) -> Tuple[str, Any]:
+        """
+        Key to sign a token with now
+
+        Returns:
+            Tuple of (kid, preparsed private key)
+
+        Raises:
+            RuntimeError: If no key has been loaded
+        """
+        now = time()
+        current = None
+        for activates_at, retires_at, kid, key in self._signers:
+            if activates_at > now:
+                break
+            current = (kid, key)
+            if now < retires_at:
+                break
+        # Past every retirement only if refreshes have been failing; keep
+        # signing with the newest key, which is still published
+        if current is None:
+            raise RuntimeError("Signing keyring is not loaded")
+        return current
+
+    def verifier(self, kid: str) -> Optional[Any]:
+        key = self._verifiers.get(kid)
+        if key is None:
+            jwt_unknown_kid_total.inc()
+        return key
+
+    async def start(self) -> None:
+        await self.repository.ensure_indexes()
+        await self.refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def refresh(self) -> None:
+        """Create this and the next generation's keys if missing, then load the published set."""
+        generation = self.generation_at(datetime.utcnow())
+        records = await self.repository.list_published()
+        existing = {record.generation for record in records}
+        missing = [g for g in (generation, generation + 1) if g not in existing]
+        if missing:
+            for g in missing:
+                signing_key = await asyncio.to_thread(self._generate, g)
+                if await self.repository.insert_if_absent(signing_key):
+                    logger.info("Created signing key", extra={"kid": signing_key.kid, "generation": g})
+            records = await self.repository.list_published()
+        await self._load(records, generation)
+
+    async def _load(self, records: List[SigningKeyInDB], generation: int) -> None:
+        from jose import jwk
+
+        published = {record.kid: record for record in records}
+        if published.keys() != self._records.keys():
+            self._verifiers = {
+                kid: self._verifiers.get(kid) or jwk.construct(record.public_jwk, self.algorithm)
+                for kid, record in published.items()
+            }
+            self._build_jwks(records)
+            jwt_signing_keys.set(len(records))
+
+        signers = []
+        loaded = {kid: key for _, _, kid, key in self._signers}
+        for record in records:
+            if record.generation > generation + 1:
+                continue
+            key = loaded.get(record.kid)
+            if key is None:
+                # Decrypting the PEM runs a KDF; keep it off the event loop
+                key = await asyncio.to_thread(self._load_private_key, record)
+            signers.append((_epoch(record.activates_at), _epoch(record.retires_at), record.kid, key))
+        signers.sort(key=lambda signer: signer[0])
+
+        self._records = published
+        self._signers = signers
+
+    def _generate(self, generation: int) -> SigningKeyInDB:
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        numbers = private_key.public_key().public_numbers()
+        public_jwk = {
+            "crv": "P-256",
+            "kty": "EC",
+            "x": _b64url(numbers.x.to_bytes(32, "big")),
+            "y": _b64url(numbers.y.to_bytes(32, "big"))
+        }
+        # RFC 7638 thumbprint: required members, sorted, no whitespace
+        kid = _b64url(hashlib.sha256(
+            json.dumps(public_jwk, sort_keys=True, separators=(",", ":")).encode()
+        ).digest())
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.BestAvailableEncryption(self._secret)
+        )
+
+        period = self.rotation_interval.total_seconds()
+        activates_at = datetime.utcfromtimestamp(generation * period)
+        retires_at = datetime.utcfromtimestamp((generation + 1) * period)
+        return SigningKeyInDB(
+            kid=kid,
+            alg=self.algorithm,
+            generation=generation,
+            private_key=pem.decode(),
+            public_jwk={**public_jwk, "kid": kid, "alg": self.algorithm, "use": "sig"},
+            activates_at=activates_at,
+            retires_at=retires_at,
+            # Tokens signed just before retirement stay verifiable until they expire
+            expires_at=retires_at + self.token_lifetime + timedelta(seconds=self.refresh_interval)
+        )
+
+    def _load_private_key(self, record: SigningKeyInDB) -> Any:
+        from cryptography.hazmat.primitives import serialization
+        from jose.backends import ECKey
+
+        private_key = serialization.load_pem_private_key(record.private_key.encode(), self._secret)
+        return ECKey(private_key, self.algorithm)
+
+    def _build_jwks(self, records: List[SigningKeyInDB]) -> None:
+        self.jwks = json.dumps(
+            {"keys": [record.public_jwk for record in records]},
+            separators=(",", ":")
+        ).encode()
+        self.etag = f'"{hashlib.sha256(self.jwks).hexdigest()[:32]}"'
+
+    async def endpoint(self, request: Request) -> Response:
+        if self.jwks is None:
+            return Response(status_code=503, headers={"Retry-After": "1"})
+
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={self.jwks_max_age}"
+        }
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=304, headers=headers)
+        return Response(self.jwks, media_type="application/json", headers=headers)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Signing keyring refresh failed: {str(e)}")
+
+signing_keyring = SigningKeyring(
+    secret=settings.security.derive_key("jwt-signing-key-encryption"),
+    rotation_interval=timedelta(days=settings.security.JWT_KEY_ROTATION_DAYS),
+    token_lifetime=settings.security.access_token_expires,
+    refresh_interval=settings.security.JWT_KEYRING_REFRESH_INTERVAL,
+    jwks_max_age=settings.security.JWKS_MAX_AGE
+)
\ No newline at end of file
@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, List
+import sys
+import unicodedata
+
+from app.core.config import settings
+from app.core.monitoring.memory import register_memory_reporter
+from app.core.monitoring.metrics import registry
+
+login_throttled_total = registry.counter(
+    "login_throttled_total",
+    "Login attempts refused before password verification by the per-account throttle"
+)
+
+def normalize_email(email: str) -> str:
+    return unicodedata.normalize("NFKC", email).strip().lower()
+
+class LoginThrottle:
+    """
+    Per-account failed-login counters keyed on the normalized email.
+
+    The first ``free_attempts`` failures cost nothing; after that each
+    failure locks the account out for ``base_delay`` doubling per extra
+    failure, up to ``max_delay``. An attempt reserves a slot with
+    ``acquire`` before the user lookup and bcrypt, and only
+    ``free_attempts`` minus the failures so far (at least one) may be in
+    flight at once, so a burst of concurrent guesses cannot all slip past
+    the lockout before their failures are recorded. Counters live in an
+    LRU of ``max_entries`` accounts and are forgotten ``failure_ttl``
+    seconds after the last failure.
+    """
+
+    def __init__(
+        self,
+        free_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 900.0,
+        failure_ttl: float = 3600.0,
+        max_entries: int = 100_000
+    ):
+        self.free_attempts = free_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_ttl = failure_ttl
+        self.max_entries = max_entries
+        # account -> [failures, last_failure_at, locked_until, in_flight]
+        self.accounts: "OrderedDict[str, List[float]]" = OrderedDict()
+        register_memory_reporter("login_throttle", self.memory_stats)
+
+    def acquire(self, email: str) -> float:
+        """
+        Reserve an attempt slot for the account
+
+        Args:
+            email: Email as submitted
+
+        Returns:
+            0 when the attempt may proceed (release it with ``release``),
+            otherwise the seconds to wait
+        """
+        now = monotonic()
+        entry = self._entry(normalize_email(email), now)
+        wait = entry[2] - now
+        if wait <= 0 and entry[3] >= max(1, self.free_attempts - entry[0]):
+            wait = self.base_delay
+        if wait > 0:
+            login_throttled_total.inc()
+            return wait
+        entry[3] += 1
+        return 0.0
+
+    def release(self, email: str) -> None:
+        entry = self.accounts.get(normalize_email(email))
+        if entry is not None and entry[3] > 0:
+            entry[3] -= 1
+
+    def record_failure(self, email: str) -> None:
+        now = monotonic()
+        entry = self._entry(normalize_email(email), now)
+        entry[0] += 1
+        entry[1] = now
+        excess = entry[0] - self.free_attempts
+        if excess > 0:
+            entry[2] = now + min(self.max_delay, self.base_delay * 2 ** (excess - 1))
+
+    def record_success(self, email: str) -> None:
+        account = normalize_email(email)
+        entry = self.accounts.get(account)
+        if entry is None:
+            return
+        if entry[3] > 0:
+            # Other attempts still hold slots; keep the entry for their release
+            entry[0], entry[2] = 0, 0.0
+        else:
+            del self.accounts[account]
+
+    def _entry(self, account: str, now: float) -> List[float]:
+        entry = self.accounts.get(account)
+        if entry is None:
+            entry = self.accounts[account] = [0, now, 0.0, 0]
+            if len(self.accounts) > self.max_entries:
+                self.accounts.popitem(last=False)
+        else:
+            self.accounts.move_to_end(account)
+            if now - entry[1] > self.failure_ttl:
+                entry[0], entry[1], entry[2] = 0, now, 0.0
+        return entry
+
+    def memory_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.accounts),
+            "bytes": sys.getsizeof(self.accounts) + sum(
+                sys.getsizeof(account) + sys.getsizeof(entry) + 4 * sys.getsizeof(0.0)
+                for account, entry in self.accounts.items()
+            )
+        }
+
+login_throttle = LoginThrottle(
+    free_attempts=settings.security.LOGIN_FREE_ATTEMPTS,
+    base_delay=settings.security.LOGIN_BASE_DELAY,
+    max_delay=settings.security.LOGIN_MAX_DELAY,
+    failure_ttl=settings.security.LOGIN_FAILURE_TTL,
+    max_entries=settings.security.LOGIN_THROTTLE_MAX_ENTRIES
+)
\ No newline at end of file
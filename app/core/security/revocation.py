@@ -0,0 +1,207 @@
+from datetime import datetime, timedelta, timezone
+from math import ceil, log
+from time import monotonic
+from typing import Any, Dict, Optional
+import asyncio
+import hashlib
+import logging
+
+from app.core.config import settings
+from app.core.db import mongodb
+from app.core.monitoring.metrics import registry
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+
+logger = logging.getLogger(__name__)
+
+revocation_checks_total = registry.counter(
+    "token_revocation_checks_total",
+    "Access token revocation checks by how they were answered",
+    labelnames=("result",)
+)
+revocation_entries = registry.gauge(
+    "token_revocation_bloom_entries",
+    "Revoked JTIs loaded into this worker's bloom filter"
+)
+
+def _epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+def _issued_before(claims: Dict[str, Any], cutoff: float) -> bool:
+    # iat is whole seconds, so only a token from the cutoff's own second is
+    # ambiguous; iat_ms settles it. Tokens without it predate the claim and
+    # so were issued before any revoke that shares their second
+    revoked_second = int(cutoff)
+    iat = claims.get("iat", 0)
+    if iat != revoked_second:
+        return iat < revoked_second
+    issued_ms = claims.get("iat_ms")
+    return issued_ms is None or issued_ms / 1000 <= cutoff
+
+class BloomFilter:
+    """Bloom filter over strings, sized for ``capacity`` items at ``error_rate``."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(64, ceil(-capacity * log(error_rate) / log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def add(self, item: str) -> None:
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        # Re-adding a known item (refresh overlap) does not count twice
+        if added:
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+class TokenRevocationList:
+    """
+    This worker's view of the revoked access token denylist.
+
+    Revoked JTIs are kept in a bloom filter, so the common case of a
+    token that was never revoked costs a few hashes and no I/O; only a
+    filter hit is confirmed against MongoDB. Revoke-all-sessions cutoffs
+    are kept exactly, per user. A background task pulls entries revoked
+    since the last poll (with ``clock_skew`` of overlap, since other
+    workers stamp them) and rebuilds everything every
+    ``rebuild_interval`` so expired entries drop out. Until the first
+    load succeeds every check goes to the database, failing closed.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = 2.0,
+        rebuild_interval: float = 1800.0,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        clock_skew: float = 5.0,
+        repository: Optional[RevokedTokenRepository] = None
+    ):
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.clock_skew = timedelta(seconds=clock_skew)
+        self._repository = repository
+
+        self.ready = False
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._user_cutoffs: Dict[str, float] = {}
+        self._watermark: Optional[datetime] = None
+        self._rebuilt_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def repository(self) -> RevokedTokenRepository:
+        if self._repository is None:
+            self._repository = RevokedTokenRepository(mongodb.client)
+        return self._repository
+
+    async def start(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f"Initial revocation list load failed: {str(e)}")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        if not self.ready:
+            await self.refresh()
+
+        cutoff = self._user_cutoffs.get(claims.get("sub"))
+        if cutoff is not None and _issued_before(claims, cutoff):
+            revocation_checks_total.inc(result="user_revoked")
+            return True
+
+        jti = claims.get("jti")
+        if not jti or jti not in self._bloom:
+            revocation_checks_total.inc(result="bloom_miss")
+            return False
+        revoked = await self.repository.is_revoked(jti)
+        revocation_checks_total.inc(result="revoked" if revoked else "false_positive")
+        return revoked
+
+    async def revoke_token(self, claims: Dict[str, Any]) -> None:
+        expires_at = datetime.utcfromtimestamp(claims["exp"])
+        await self.repository.revoke_token(claims["jti"], claims["sub"], expires_at)
+        self._bloom.add(claims["jti"])
+
+    async def revoke_user(self, user_id: str) -> None:
+        # Every access token issued so far expires within its lifetime
+        expires_at = datetime.utcnow() + settings.security.access_token_expires
+        revoked_at = await self.repository.revoke_user(user_id, expires_at)
+        self._user_cutoffs[user_id] = max(self._user_cutoffs.get(user_id, 0.0), _epoch(revoked_at))
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            if not self.ready or monotonic() - self._rebuilt_at > self.rebuild_interval:
+                await self._rebuild()
+            else:
+                await self._pull()
+
+    async def _rebuild(self) -> None:
+        entries = await self.repository.changed_since(datetime.min)
+        tokens = [entry["jti"] for entry in entries if entry.get("kind") == "token"]
+        bloom = BloomFilter(max(self.capacity, 2 * len(tokens)), self.error_rate)
+        for jti in tokens:
+            bloom.add(jti)
+        cutoffs: Dict[str, float] = {}
+        for entry in entries:
+            if entry.get("kind") == "user":
+                cutoffs[entry["user_id"]] = max(cutoffs.get(entry["user_id"], 0.0), _epoch(entry["revoked_at"]))
+
+        self._bloom, self._user_cutoffs = bloom, cutoffs
+        self._watermark = entries[-1]["revoked_at"] if entries else datetime.utcnow()
+        self._rebuilt_at = monotonic()
+        self.ready = True
+        revocation_entries.set(bloom.count)
+
+    async def _pull(self) -> None:
+        entries = await self.repository.changed_since(self._watermark - self.clock_skew)
+        for entry in entries:
+            if entry.get("kind") == "token":
+                self._bloom.add(entry["jti"])
+            elif entry.get("kind") == "user":
+                user_id = entry["user_id"]
+                self._user_cutoffs[user_id] = max(
+                    self._user_cutoffs.get(user_id, 0.0), _epoch(entry["revoked_at"])
+                )
+        if entries:
+            self._watermark = max(self._watermark, entries[-1]["revoked_at"])
+        revocation_entries.set(self._bloom.count)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Revocation list refresh failed: {str(e)}")
+
+token_revocation_list = TokenRevocationList(
+    refresh_interval=settings.security.REVOCATION_REFRESH_INTERVAL,
+    rebuild_interval=settings.security.REVOCATION_REBUILD_INTERVAL,
+    capacity=settings.security.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.security.REVOCATION_BLOOM_ERROR_RATE
+)
\ No newline at end of file
@@ -1,18 +1,42 @@
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional, Dict, Tuple, Any
-from jose import jwt, JWTError, ExpiredSignatureError
+import asyncio
+import hashlib
 from app.core.config import settings
 import secrets
-from passlib.context import CryptContext
-
-# Create CryptContext once
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=12,
-    bcrypt__ident="2b"
+from app.core.monitoring.timing import track_timing
+
+# python-jose (with its crypto backend) and passlib are imported on first use
+# rather than at startup; warmup exercises both before the app reports ready
+
+@lru_cache
+def pwd_context():
+    """
+    Create the CryptContext once, on first use
+    
+    Returns:
+        The shared passlib CryptContext
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=12,
+        bcrypt__ident="2b"
+    )
+
+# bcrypt holds a core for ~250ms per call; a bounded pool keeps it off the
+# event loop and caps how many run at once
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.security.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
 )
+_hash_pending = 0
 
+@track_timing("jwt")
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a new access token
@@ -24,13 +48,24 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     Returns:
         Encoded JWT token
     """
+    from jose import jwt
+    from app.core.security.keyring import signing_keyring
+
     to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.security.ACCESS_TOKEN_EXPIRE_MINUTES))
+    issued_at = datetime.utcnow()
+    expire = issued_at + (expires_delta or timedelta(minutes=settings.security.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({
         "exp": expire,
         "type": "access",
-        "iat": datetime.utcnow()
+        "iat": issued_at,
+        # iat is whole seconds; revoke-all cutoffs need to order tokens
+        # issued within the same second
+        "iat_ms": int(issued_at.replace(tzinfo=timezone.utc).timestamp()) * 1000 + issued_at.microsecond // 1000,
+        "jti": secrets.token_hex(16)
     })
+    if settings.security.ALGORITHM == signing_keyring.algorithm:
+        kid, key = signing_keyring.signer()
+        return jwt.encode(to_encode, key, algorithm=signing_keyring.algorithm, headers={"kid": kid})
     return jwt.encode(
         to_encode, 
         settings.security.SECRET_KEY, 
@@ -48,6 +83,7 @@ def create_refresh_token() -> Tuple[str, datetime]:
     expires = datetime.utcnow() + timedelta(days=settings.security.REFRESH_TOKEN_EXPIRE_DAYS)
     return token, expires
 
+@track_timing("jwt")
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Verify and decode a JWT token
@@ -62,14 +98,17 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
         JWTError: If token is malformed
         ExpiredSignatureError: If token has expired
     """
+    from jose import jwt, JWTError, ExpiredSignatureError
+
     try:
-        payload = jwt.decode(
-            token, 
-            settings.security.SECRET_KEY, 
-            algorithms=[settings.security.ALGORITHM]
-        )
+        key, algorithm = _verification_key(jwt.get_unverified_header(token))
+        if key is None:
+            return None
+        payload = jwt.decode(token, key, algorithms=[algorithm])
         if payload.get("type") != "access":
             return None
+        # Tokens issued before jti existed are revoked by their digest
+        payload.setdefault("jti", hashlib.sha256(token.encode()).hexdigest())
         return payload
     except ExpiredSignatureError:
         # Handle expired tokens explicitly
@@ -77,6 +116,20 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
     except JWTError:
         return None
 
+def _verification_key(header: Dict[str, Any]) -> Tuple[Optional[Any], str]:
+    # The algorithm is pinned by where the key came from, never by the header
+    from app.core.security.keyring import signing_keyring
+
+    if settings.security.ALGORITHM != signing_keyring.algorithm:
+        return settings.security.SECRET_KEY, settings.security.ALGORITHM
+    kid = header.get("kid")
+    if kid is not None:
+        return signing_keyring.verifier(kid), signing_keyring.algorithm
+    if datetime.utcnow() < settings.security.JWT_LEGACY_HS256_ACCEPT_UNTIL:
+        return settings.security.SECRET_KEY, "HS256"
+    return None, signing_keyring.algorithm
+
+@track_timing("bcrypt")
 def get_password_hash(password: str) -> str:
     """
     Hash a password using bcrypt
@@ -87,8 +140,9 @@ def get_password_hash(password: str) -> str:
     Returns:
         Hashed password
     """
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
+@track_timing("bcrypt")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash
@@ -100,4 +154,48 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context().verify(plain_password, hashed_password)
+
+def hash_queue_depth() -> int:
+    """
+    Number of password hash operations waiting for a free worker
+    
+    Returns:
+        Queued operations, not counting the ones already running
+    """
+    return max(0, _hash_pending - settings.security.PASSWORD_HASH_WORKERS)
+
+async def _run_in_hash_pool(func, *args) -> Any:
+    global _hash_pending
+    _hash_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_pending -= 1
+
+@track_timing("bcrypt")
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the bounded hash pool
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        Hashed password
+    """
+    return await _run_in_hash_pool(pwd_context().hash, password)
+
+@track_timing("bcrypt")
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash on the bounded hash pool
+    
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password to check against
+        
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await _run_in_hash_pool(pwd_context().verify, plain_password, hashed_password)
\ No newline at end of file
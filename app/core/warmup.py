@@ -0,0 +1,70 @@
+from time import perf_counter
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterable
+import asyncio
+import logging
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+from .security.security import (
+    create_access_token,
+    verify_token,
+    get_password_hash,
+    verify_password,
+)
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+logger = logging.getLogger(__name__)
+
+async def warm_connection_pool(client: "AsyncIOMotorClient", size: int) -> None:
+    """Open ``size`` connections by running that many pings at once."""
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(max(size, 1))))
+
+async def warm_queries(probes: Iterable[Callable[[], Awaitable]]) -> None:
+    """Run one representative query per repository."""
+    for probe in probes:
+        await probe()
+
+def warm_route_models(app: FastAPI) -> None:
+    """
+    Exercise request/response validation for every route and build the
+    OpenAPI schema, so neither happens for the first time on a request.
+    """
+    app.openapi()
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for field in (route.body_field, route.response_field):
+            if field is not None:
+                # An empty payload walks the validator and its error path
+                field.validate({}, {}, loc=("warmup",))
+
+def warm_security() -> None:
+    """Load the JWT and bcrypt backends with one round trip each."""
+    verify_token(create_access_token({"sub": "warmup"}))
+    verify_password("warmup", get_password_hash("warmup"))
+
+async def run_warmup(
+    app: FastAPI,
+    client: "AsyncIOMotorClient",
+    pool_size: int,
+    query_probes: Iterable[Callable[[], Awaitable]]
+) -> Dict[str, float]:
+    """Run every warmup step and return how long each took, in ms."""
+    durations: Dict[str, float] = {}
+
+    async def step(name: str, coro: Awaitable) -> None:
+        start_time = perf_counter()
+        try:
+            await coro
+        except Exception as e:
+            logger.warning(f"Warmup step {name} failed: {str(e)}")
+        durations[name] = round((perf_counter() - start_time) * 1000, 3)
+
+    await step("connection_pool", warm_connection_pool(client, pool_size))
+    await step("queries", warm_queries(query_probes))
+    await step("route_models", asyncio.to_thread(warm_route_models, app))
+    await step("security", asyncio.to_thread(warm_security))
+    return durations
@@ -1,39 +1,70 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-import logging.config
+import asyncio
+import logging
 from typing import Dict, Any
 from datetime import datetime
 
 # Internal imports
 from app.core.config import settings
 from app.core.exceptions import setup_exception_handlers
-from app.core.monitoring import get_sentry_service, SentryContextMiddleware
+from app.core.exceptions.aggregator import error_aggregator
+from app.core.monitoring import (
+    get_sentry_service,
+    SentryContextMiddleware,
+    ProfilingMiddleware,
+    HealthProbeMiddleware,
+)
+from app.core.monitoring.metrics import registry
+from app.core.monitoring.loop_monitor import loop_monitor
+from app.core.monitoring.memory import memory_reporter
+from app.core.monitoring.health import health_monitor
 from app.core.middlewares import (
     RequestLoggingMiddleware,
     ResponseTimeMiddleware,
     RequestIDMiddleware,
     RateLimitMiddleware,
     CacheMiddleware,
+    AdmissionControlMiddleware,
+    DeadlineMiddleware,
+    PrioritySchedulingMiddleware,
+    InFlightMiddleware,
+    EdgeMiddleware,
+    IPFilterMiddleware,
 )
+from app.core.ip_filter import ip_filter
+from app.core.security.revocation import token_revocation_list
+from app.core.security.keyring import signing_keyring
 from app.core.db import mongodb
-from app.core.config.logging import LoggingSettings
+from app.core.openapi import openapi_cache
+from app.core.warmup import run_warmup
+from app.repositories import UserRepository, ProfileRepository, ApiKeyRepository, RevokedTokenRepository, IdempotencyRepository
+from app.core.log_queue import ensure_logging, flush_logging
+from app.core.lifecycle import drain_controller
 from app.api.v1.routes import create_api_router
 
-logging_settings = LoggingSettings()
-logging.config.dictConfig(logging_settings.get_logging_config())
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    
+    # Not done at import time; app.server configures it before importing us
+    ensure_logging(settings.logging)
     logger.info("Starting up application...")
     
     if settings.logging.SENTRY_ENABLED:
         sentry_service = get_sentry_service()
         sentry_service.initialize()
+        drain_controller.register_flush_hook(
+            "sentry", lambda: asyncio.to_thread(sentry_service.flush)
+        )
         logger.info("Sentry initialized successfully")
 
     try:
@@ -58,9 +89,27 @@ async def lifespan(app: FastAPI):
 
     api_router = create_api_router()
     app.include_router(api_router, prefix='/api/v1')
+    if settings.app.OPENAPI_URL:
+        openapi_cache.build(app)
+
+    # Runs after the server starts listening so liveness passes meanwhile;
+    # /health reports 503 until it is done
+    app.state.warmup_complete = False
+    app.state.warmup_task = asyncio.create_task(warmup_application(app))
     yield
 
     logger.info("Shutting down application...")
+    app.state.warmup_task.cancel()
+
+    # Finish in-flight work and flush buffers while MongoDB is still open
+    drain_controller.stop_accepting()
+    await drain_controller.wait_for_idle(settings.app.SHUTDOWN_TIMEOUT)
+    await drain_controller.flush(settings.app.SHUTDOWN_FLUSH_TIMEOUT)
+
+    try:
+        await cleanup_tasks(app)
+    except Exception as e:
+        logger.error(f"Error during cleanup tasks: {str(e)}", exc_info=True)
 
     try:
         await mongodb.close_mongodb_connection()
@@ -68,31 +117,71 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error closing MongoDB connection: {str(e)}", exc_info=True)
 
-    try:
-        await cleanup_tasks(app)
-    except Exception as e:
-        logger.error(f"Error during cleanup tasks: {str(e)}", exc_info=True)
+    await asyncio.to_thread(flush_logging, settings.app.SHUTDOWN_FLUSH_TIMEOUT)
+
+async def warmup_application(app: FastAPI) -> None:
+    """Pre-open the pool and exercise queries, models and security before reporting ready"""
+    if settings.app.WARMUP_ENABLED:
+        user_repository = UserRepository(mongodb.client)
+        profile_repository = ProfileRepository(mongodb.client)
+        try:
+            durations = await asyncio.wait_for(
+                run_warmup(
+                    app,
+                    mongodb.client,
+                    settings.db.MONGODB_MIN_POOL_SIZE,
+                    [
+                        lambda: user_repository.get_by_email("warmup@example.invalid"),
+                        lambda: profile_repository.get_by_user_id("warmup"),
+                    ]
+                ),
+                settings.app.WARMUP_TIMEOUT
+            )
+            logger.info("Warmup complete", extra={"durations_ms": durations})
+        except asyncio.TimeoutError:
+            logger.warning(f"Warmup did not finish within {settings.app.WARMUP_TIMEOUT}s")
+    app.state.warmup_complete = True
 
 async def startup_tasks(app: FastAPI) -> None:
     """Additional startup tasks"""
-    # Initialize any background tasks
-    # Setup any additional services
-    pass
+    if settings.security.ALGORITHM == signing_keyring.algorithm:
+        await signing_keyring.start()
+    if settings.security.API_KEY_ENABLED:
+        await ApiKeyRepository(mongodb.client).ensure_indexes()
+    await RevokedTokenRepository(mongodb.client).ensure_indexes()
+    if settings.app.IDEMPOTENCY_ENABLED:
+        await IdempotencyRepository(mongodb.client).ensure_indexes()
+    await token_revocation_list.start()
+    if settings.app.SHUTDOWN_DRAIN_DELAY > 0 and not settings.app.RELOAD:
+        drain_controller.install_signal_handler(settings.app.SHUTDOWN_DRAIN_DELAY)
+    if settings.monitoring.LOOP_MONITOR_ENABLED:
+        await loop_monitor.start()
+    if settings.monitoring.MEMORY_REPORTER_ENABLED:
+        await memory_reporter.start()
+    await health_monitor.start()
+    await error_aggregator.start()
+    if ip_filter.enabled:
+        await ip_filter.start()
 
 async def cleanup_tasks(app: FastAPI) -> None:
     """Additional cleanup tasks"""
-    # Cleanup any background tasks
-    # Cleanup any additional services
-    pass
+    await loop_monitor.stop()
+    await memory_reporter.stop()
+    await health_monitor.stop()
+    await error_aggregator.stop()
+    await ip_filter.stop()
+    await token_revocation_list.stop()
+    await signing_keyring.stop()
 
 def create_application() -> FastAPI:
     app = FastAPI(
         title=settings.app.PROJECT_NAME,
         description=settings.app.DESCRIPTION,
         version=settings.app.VERSION,
-        docs_url=settings.app.DOCS_URL,
-        redoc_url=settings.app.REDOC_URL,
-        openapi_url=settings.app.OPENAPI_URL,
+        # Served by setup_docs_routes from a schema prebuilt at startup
+        docs_url=None,
+        redoc_url=None,
+        openapi_url=None,
         lifespan=lifespan,
         debug=settings.app.DEBUG
     )
@@ -100,11 +189,33 @@ def create_application() -> FastAPI:
     setup_exception_handlers(app)
     setup_middlewares(app)
     setup_base_routes(app)
+    setup_docs_routes(app)
     setup_event_handlers(app)
+    setup_edge_middlewares(app)
 
     return app
 
 def setup_middlewares(app: FastAPI) -> None:
+    # Innermost so it runs in the same task as the endpoint
+    if settings.monitoring.PROFILING_ENABLED:
+        app.add_middleware(
+            ProfilingMiddleware,
+            header_name=settings.monitoring.PROFILING_HEADER_NAME,
+            route_sample_rates=settings.monitoring.PROFILING_ROUTE_SAMPLE_RATES
+        )
+
+    # Right in front of the router, so slots are only held for handler work
+    if settings.app.SCHEDULER_ENABLED:
+        app.add_middleware(
+            PrioritySchedulingMiddleware,
+            capacity=settings.app.SCHEDULER_CAPACITY,
+            classes=settings.app.SCHEDULER_CLASSES,
+            route_classes=settings.app.SCHEDULER_ROUTE_CLASSES,
+            queue_timeout=settings.app.SCHEDULER_QUEUE_TIMEOUT,
+            max_queue=settings.app.SCHEDULER_MAX_QUEUE
+        )
+
+    # Preflights are answered by EdgeMiddleware; this decorates actual requests
     app.add_middleware(
         CORSMiddleware,
         allow_origins=[str(origin) for origin in settings.app.BACKEND_CORS_ORIGINS],
@@ -113,11 +224,6 @@ def setup_middlewares(app: FastAPI) -> None:
         allow_headers=["*"],
     )
 
-    app.add_middleware(
-        TrustedHostMiddleware, 
-        allowed_hosts=settings.app.ALLOWED_HOSTS
-    )
-
     app.add_middleware(
         GZipMiddleware, 
         minimum_size=settings.app.MIDDLEWARE_GZIP_MINIMUM_SIZE
@@ -126,19 +232,73 @@ def setup_middlewares(app: FastAPI) -> None:
     if settings.logging.SENTRY_ENABLED:
         app.add_middleware(SentryContextMiddleware)
 
+    # Inside RequestIDMiddleware so shed responses are still tagged and logged
+    if settings.app.ADMISSION_CONTROL_ENABLED:
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            initial_limit=settings.app.ADMISSION_INITIAL_LIMIT,
+            min_limit=settings.app.ADMISSION_MIN_LIMIT,
+            max_limit=settings.app.ADMISSION_MAX_LIMIT,
+            target_latency=settings.app.ADMISSION_TARGET_LATENCY,
+            queue_timeout=settings.app.ADMISSION_QUEUE_TIMEOUT,
+            max_queue=settings.app.ADMISSION_MAX_QUEUE,
+            retry_after=settings.app.ADMISSION_RETRY_AFTER,
+            route_limits=settings.app.ADMISSION_ROUTE_LIMITS,
+            exclude_paths=["/health", settings.monitoring.METRICS_PATH]
+        )
+
+    # Outside admission control so time spent queued counts against the budget
+    if settings.app.MIDDLEWARE_TIMEOUT > 0:
+        app.add_middleware(
+            DeadlineMiddleware,
+            timeout=settings.app.MIDDLEWARE_TIMEOUT,
+            exclude_paths=["/health", settings.monitoring.METRICS_PATH]
+        )
+
     app.add_middleware(RequestIDMiddleware)
-    app.add_middleware(RequestLoggingMiddleware)
-    app.add_middleware(ResponseTimeMiddleware)
+    app.add_middleware(
+        RequestLoggingMiddleware,
+        sample_rate=settings.logging.ACCESS_LOG_SAMPLE_RATE,
+        slow_request_threshold=settings.logging.ACCESS_LOG_SLOW_THRESHOLD,
+        route_sample_rates=settings.logging.ACCESS_LOG_ROUTE_SAMPLE_RATES
+    )
+    app.add_middleware(
+        ResponseTimeMiddleware,
+        slow_request_threshold=settings.monitoring.SLOW_REQUEST_THRESHOLD,
+        server_timing=settings.monitoring.SERVER_TIMING_ENABLED
+    )
 
     if settings.app.RATE_LIMIT_ENABLED:
-        app.add_middleware(RateLimitMiddleware)
+        app.add_middleware(
+            RateLimitMiddleware,
+            rate_limit=settings.app.RATE_LIMIT_PER_MINUTE,
+            window_size=60,
+            burst=settings.app.RATE_LIMIT_BURST,
+            route_costs=settings.app.RATE_LIMIT_ROUTE_COSTS,
+            max_clients=settings.app.RATE_LIMIT_MAX_CLIENTS
+        )
 
     if settings.cache.ENABLED:
-        app.add_middleware(CacheMiddleware)
+        app.add_middleware(
+            CacheMiddleware,
+            # The OpenAPI and JWKS routes do their own ETag negotiation
+            exclude_paths=[
+                "/health",
+                settings.monitoring.METRICS_PATH,
+                settings.app.OPENAPI_URL,
+                settings.security.JWKS_PATH
+            ],
+            exclude_prefixes=[f"{settings.app.API_V1_STR}/debug"]
+        )
 
 def setup_base_routes(app: FastAPI) -> None:
     @app.get("/health", tags=["Health"])
-    async def health_check() -> Dict[str, Any]:
+    async def health_check(request: Request) -> Dict[str, Any]:
+        if not getattr(request.app.state, "warmup_complete", False):
+            return JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"status": "warming_up", "version": settings.app.VERSION}
+            )
         return {
             "status": "healthy",
             "version": settings.app.VERSION,
@@ -146,6 +306,68 @@ def setup_base_routes(app: FastAPI) -> None:
             "timestamp": datetime.utcnow().isoformat()
         }
 
+    if settings.security.ALGORITHM == signing_keyring.algorithm:
+        app.add_route(
+            settings.security.JWKS_PATH,
+            signing_keyring.endpoint,
+            methods=["GET", "HEAD"],
+            include_in_schema=False
+        )
+
+    if settings.monitoring.METRICS_ENABLED:
+        @app.get(settings.monitoring.METRICS_PATH, tags=["Health"], include_in_schema=False)
+        async def metrics() -> PlainTextResponse:
+            return PlainTextResponse(
+                registry.render(),
+                media_type="text/plain; version=0.0.4"
+            )
+
+def setup_docs_routes(app: FastAPI) -> None:
+    openapi_url = settings.app.OPENAPI_URL
+    if not openapi_url:
+        return
+    app.add_route(openapi_url, openapi_cache.endpoint, methods=["GET", "HEAD"], include_in_schema=False)
+
+    if settings.app.DOCS_URL:
+        oauth2_redirect_url = app.swagger_ui_oauth2_redirect_url
+
+        @app.get(settings.app.DOCS_URL, include_in_schema=False)
+        async def swagger_ui_html() -> HTMLResponse:
+            return get_swagger_ui_html(
+                openapi_url=openapi_url,
+                title=f"{app.title} - Swagger UI",
+                oauth2_redirect_url=oauth2_redirect_url
+            )
+
+        if oauth2_redirect_url:
+            @app.get(oauth2_redirect_url, include_in_schema=False)
+            async def swagger_ui_redirect() -> HTMLResponse:
+                return get_swagger_ui_oauth2_redirect_html()
+
+    if settings.app.REDOC_URL:
+        @app.get(settings.app.REDOC_URL, include_in_schema=False)
+        async def redoc_html() -> HTMLResponse:
+            return get_redoc_html(openapi_url=openapi_url, title=f"{app.title} - ReDoc")
+
+def setup_edge_middlewares(app: FastAPI) -> None:
+    # Added last so they wrap every other middleware
+    app.add_middleware(InFlightMiddleware)
+    # Inside the probes, which kubelets send with the pod IP as Host
+    app.add_middleware(
+        EdgeMiddleware,
+        allowed_hosts=settings.app.ALLOWED_HOSTS,
+        allow_origins=[str(origin) for origin in settings.app.BACKEND_CORS_ORIGINS],
+        allow_credentials=True,
+        max_age=settings.app.CORS_MAX_AGE
+    )
+    if ip_filter.enabled:
+        app.add_middleware(IPFilterMiddleware, ip_filter=ip_filter)
+    app.add_middleware(
+        HealthProbeMiddleware,
+        live_path=settings.monitoring.HEALTH_LIVE_PATH,
+        ready_path=settings.monitoring.HEALTH_READY_PATH
+    )
+
 def setup_event_handlers(app: FastAPI) -> None:
     @app.middleware("http")
     async def add_request_id_to_response(request: Request, call_next):
@@ -156,15 +378,8 @@ def setup_event_handlers(app: FastAPI) -> None:
 app = create_application()
 
 if __name__ == "__main__":
-    import uvicorn
-    
-    uvicorn.run(
-        "main:app",
-        host=settings.app.HOST,
-        port=settings.app.PORT,
-        reload=settings.app.RELOAD,
-        workers=settings.app.WORKERS_COUNT,
-        log_config=settings.logging.get_logging_config()
-    )
+    from app.server import run
+
+    run(app)
 
 application = app
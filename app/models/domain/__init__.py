@@ -1,3 +1,5 @@
 from .auth import SignupRequest
 from .profile import ProfileInDB, ProfileResponse
-from .user import UserStatus, UserBase, UserCreate, UserInDB, UserResponse
\ No newline at end of file
+from .user import UserStatus, UserBase, UserCreate, UserInDB, UserResponse
+from .api_key import ApiKeyBase, ApiKeyInDB
+from .signing_key import SigningKeyInDB
\ No newline at end of file
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import List, Optional
+from bson import ObjectId
+from pydantic import BaseModel, Field
+
+class ApiKeyBase(BaseModel):
+    name: str = Field(min_length=1, max_length=100)
+    scopes: List[str] = []
+    rate_limit_per_minute: Optional[int] = Field(None, gt=0)  # None uses the global limit
+    owner_id: Optional[str] = None
+    expires_at: Optional[datetime] = None
+
+class ApiKeyInDB(ApiKeyBase):
+    id: str = Field(default_factory=lambda: str(ObjectId()))
+    key_prefix: str  # first characters of the key, to tell keys apart in listings
+    key_hash: str  # HMAC-SHA256 of the full key; the key itself is never stored
+    revoked: bool = False
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    model_config = {
+        "from_attributes": True
+    }
+
+    def is_active(self) -> bool:
+        if self.revoked:
+            return False
+        return self.expires_at is None or self.expires_at > datetime.utcnow()
\ No newline at end of file
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Dict
+from pydantic import BaseModel, Field
+
+class SigningKeyInDB(BaseModel):
+    kid: str  # RFC 7638 thumbprint of the public key
+    alg: str = "ES256"
+    generation: int  # rotation period the key signs in; unique, so workers agree on one key per period
+    private_key: str  # PKCS#8 PEM, encrypted under a key derived from SECRET_KEY
+    public_jwk: Dict[str, str]
+    activates_at: datetime  # starts signing
+    retires_at: datetime  # stops signing; the next generation takes over
+    expires_at: datetime  # leaves the JWKS once every token it signed has expired
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    model_config = {
+        "from_attributes": True
+    }
\ No newline at end of file
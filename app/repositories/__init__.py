@@ -1,2 +1,6 @@
 from .profile_repository import ProfileRepository
-from .user_repository import UserRepository
\ No newline at end of file
+from .user_repository import UserRepository
+from .api_key_repository import ApiKeyRepository
+from .revoked_token_repository import RevokedTokenRepository
+from .signing_key_repository import SigningKeyRepository
+from .idempotency_repository import IdempotencyRepository
\ No newline at end of file
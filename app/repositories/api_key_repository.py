@@ -0,0 +1,67 @@
+from typing import TYPE_CHECKING, Optional
+from app.models.domain.api_key import ApiKeyInDB
+from app.core.monitoring.decorators import monitor_transaction
+from app.core.monitoring.timing import timed
+from app.core.deadline import operation_timeout
+from app.core.circuit_breaker import circuit_breaker
+from app.core.retry import retryable
+from app.core.exceptions import DatabaseException
+from app.core.config import settings
+from bson import ObjectId
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+
+class ApiKeyRepository:
+    def __init__(self, client: "AsyncIOMotorClient"):
+        self.client: "AsyncIOMotorClient" = client
+        self.database: "AsyncIOMotorDatabase" = client[settings.db.MONGODB_DB_NAME]
+        self.collection: "AsyncIOMotorCollection" = self.database["api_keys"]
+
+    async def ensure_indexes(self) -> None:
+        try:
+            await self.collection.create_index("key_hash", unique=True)
+        except Exception as e:
+            raise DatabaseException(f"Failed to create api key indexes: {str(e)}") from e
+
+    @monitor_transaction(op="db.api_key.create")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=False)
+    async def create(self, api_key: ApiKeyInDB) -> ApiKeyInDB:
+        try:
+            with timed("pydantic"):
+                document = api_key.dict(exclude={"id"})
+            with timed("db"), operation_timeout():
+                result = await self.collection.insert_one(document)
+            api_key.id = str(result.inserted_id)
+            return api_key
+        except Exception as e:
+            raise DatabaseException(f"Failed to create api key: {str(e)}") from e
+
+    @monitor_transaction(op="db.api_key.get_by_hash")
+    @circuit_breaker("mongodb.read")
+    @retryable(idempotent=True)
+    async def get_by_hash(self, key_hash: str) -> Optional[ApiKeyInDB]:
+        try:
+            with timed("db"), operation_timeout():
+                key_data = await self.collection.find_one({"key_hash": key_hash})
+            with timed("pydantic"):
+                if not key_data:
+                    return None
+                return ApiKeyInDB(**{**key_data, "id": str(key_data.pop("_id"))})
+        except Exception as e:
+            raise DatabaseException(f"Failed to get api key: {str(e)}") from e
+
+    @monitor_transaction(op="db.api_key.revoke")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=True)
+    async def revoke(self, key_id: str) -> bool:
+        try:
+            with timed("db"), operation_timeout():
+                result = await self.collection.update_one(
+                    {"_id": ObjectId(key_id), "revoked": False},
+                    {"$set": {"revoked": True}}
+                )
+            return result.modified_count > 0
+        except Exception as e:
+            raise DatabaseException(f"Failed to revoke api key: {str(e)}") from e
\ No newline at end of file
@@ -0,0 +1,98 @@
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from datetime import datetime
+from pymongo.errors import DuplicateKeyError
+from app.core.monitoring.decorators import monitor_transaction
+from app.core.monitoring.timing import timed
+from app.core.deadline import operation_timeout
+from app.core.circuit_breaker import circuit_breaker
+from app.core.retry import retryable
+from app.core.exceptions import DatabaseException
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+
+class IdempotencyRepository:
+    """
+    Stored responses for requests sent with an Idempotency-Key.
+
+    A record is inserted as pending, leased to one execution for a short
+    while, when a request starts executing and completed with its response
+    for the full TTL; a TTL index on ``expires_at`` drops it either way.
+    """
+
+    def __init__(self, client: "AsyncIOMotorClient"):
+        self.client: "AsyncIOMotorClient" = client
+        self.database: "AsyncIOMotorDatabase" = client[settings.db.MONGODB_DB_NAME]
+        self.collection: "AsyncIOMotorCollection" = self.database["idempotency_keys"]
+
+    async def ensure_indexes(self) -> None:
+        try:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        except Exception as e:
+            raise DatabaseException(f"Failed to create idempotency indexes: {str(e)}") from e
+
+    @monitor_transaction(op="db.idempotency.reserve")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=True)
+    async def reserve(self, record_id: str, owner: str, lease_until: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Claim a record as pending for ``owner`` until ``lease_until``.
+
+        A pending record whose lease has run out (its worker died or could
+        not release it) is taken over, as is one already held by ``owner``
+        (an insert that succeeded before a retried call). Returns None once
+        claimed, else the record that holds the key.
+        """
+        try:
+            with timed("db"), operation_timeout():
+                now = datetime.utcnow()
+                for _ in range(2):
+                    try:
+                        await self.collection.find_one_and_update(
+                            {
+                                "_id": record_id,
+                                "status": "pending",
+                                "$or": [{"owner": owner}, {"expires_at": {"$lte": now}}]
+                            },
+                            {"$set": {
+                                "status": "pending",
+                                "owner": owner,
+                                "created_at": now,
+                                "expires_at": lease_until
+                            }},
+                            upsert=True
+                        )
+                        return None
+                    except DuplicateKeyError:
+                        existing = await self.collection.find_one({"_id": record_id})
+                        if existing is not None:
+                            return existing
+                        # Released between the two calls; claim it again
+                raise DatabaseException("key changed hands while reserving it")
+        except Exception as e:
+            raise DatabaseException(f"Failed to reserve idempotency key: {str(e)}") from e
+
+    @monitor_transaction(op="db.idempotency.complete")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=True)
+    async def complete(self, record_id: str, owner: str, response: Dict[str, Any], expires_at: datetime) -> None:
+        """Store the response and keep the record until ``expires_at``, if ``owner`` still holds it."""
+        try:
+            with timed("db"), operation_timeout():
+                await self.collection.update_one(
+                    {"_id": record_id, "status": "pending", "owner": owner},
+                    {"$set": {"status": "complete", "response": response, "expires_at": expires_at}}
+                )
+        except Exception as e:
+            raise DatabaseException(f"Failed to store idempotent response: {str(e)}") from e
+
+    @monitor_transaction(op="db.idempotency.release")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=True)
+    async def release(self, record_id: str, owner: str) -> None:
+        try:
+            with timed("db"), operation_timeout():
+                await self.collection.delete_one({"_id": record_id, "status": "pending", "owner": owner})
+        except Exception as e:
+            raise DatabaseException(f"Failed to release idempotency key: {str(e)}") from e
\ No newline at end of file
@@ -1,12 +1,19 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from datetime import datetime
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
 from app.models.domain.profile import ProfileInDB
 from app.core.monitoring.decorators import monitor_transaction
+from app.core.monitoring.timing import timed
+from app.core.deadline import operation_timeout
+from app.core.circuit_breaker import circuit_breaker
+from app.core.retry import retryable
 from app.core.exceptions import DatabaseException
 from app.core.config import settings
 from bson import ObjectId
 
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+
+
 class ProfileRepository:
     def __init__(self, client: "AsyncIOMotorClient"):
         self.client: "AsyncIOMotorClient" = client
@@ -14,18 +21,27 @@ class ProfileRepository:
         self.collection: "AsyncIOMotorCollection" = self.database["profiles"]
 
     @monitor_transaction(op="db.profile.create")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=False)
     async def create(self, profile: ProfileInDB) -> ProfileInDB:
         try:
-            result = await self.collection.insert_one(profile.dict(exclude={"id"}))
+            with timed("pydantic"):
+                document = profile.dict(exclude={"id"})
+            with timed("db"), operation_timeout():
+                result = await self.collection.insert_one(document)
             profile.id = str(result.inserted_id)
             return profile
         except Exception as e:
-            raise DatabaseException(f"Failed to create profile: {str(e)}")
+            raise DatabaseException(f"Failed to create profile: {str(e)}") from e
 
     @monitor_transaction(op="db.profile.get_by_user_id")
+    @circuit_breaker("mongodb.read")
+    @retryable(idempotent=True)
     async def get_by_user_id(self, user_id: str) -> Optional[ProfileInDB]:
         try:
-            profile_data = await self.collection.find_one({"user_id": user_id})
-            return ProfileInDB(**profile_data) if profile_data else None
+            with timed("db"), operation_timeout():
+                profile_data = await self.collection.find_one({"user_id": user_id})
+            with timed("pydantic"):
+                return ProfileInDB(**profile_data) if profile_data else None
         except Exception as e:
-            raise DatabaseException(f"Failed to get profile by user_id: {str(e)}")
\ No newline at end of file
+            raise DatabaseException(f"Failed to get profile by user_id: {str(e)}") from e
\ No newline at end of file
@@ -0,0 +1,98 @@
+from typing import TYPE_CHECKING, Any, Dict, List
+from datetime import datetime
+from app.core.monitoring.decorators import monitor_transaction
+from app.core.monitoring.timing import timed
+from app.core.deadline import operation_timeout
+from app.core.circuit_breaker import circuit_breaker
+from app.core.retry import retryable
+from app.core.exceptions import DatabaseException
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+
+class RevokedTokenRepository:
+    """
+    Denylist of revoked access tokens.
+
+    ``kind: "token"`` entries revoke one ``jti``; ``kind: "user"`` entries
+    revoke every token of a user issued up to ``revoked_at``. Each entry
+    expires with the tokens it covers through a TTL index on ``expires_at``.
+    """
+
+    def __init__(self, client: "AsyncIOMotorClient"):
+        self.client: "AsyncIOMotorClient" = client
+        self.database: "AsyncIOMotorDatabase" = client[settings.db.MONGODB_DB_NAME]
+        self.collection: "AsyncIOMotorCollection" = self.database["revoked_tokens"]
+
+    async def ensure_indexes(self) -> None:
+        try:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+            await self.collection.create_index("revoked_at")
+            await self.collection.create_index("jti", sparse=True)
+        except Exception as e:
+            raise DatabaseException(f"Failed to create revoked token indexes: {str(e)}") from e
+
+    @monitor_transaction(op="db.revoked_token.revoke")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=True)
+    async def revoke_token(self, jti: str, user_id: str, expires_at: datetime) -> datetime:
+        revoked_at = datetime.utcnow()
+        try:
+            with timed("db"), operation_timeout():
+                await self.collection.update_one(
+                    {"jti": jti},
+                    {"$setOnInsert": {
+                        "kind": "token",
+                        "jti": jti,
+                        "user_id": user_id,
+                        "revoked_at": revoked_at,
+                        "expires_at": expires_at
+                    }},
+                    upsert=True
+                )
+            return revoked_at
+        except Exception as e:
+            raise DatabaseException(f"Failed to revoke token: {str(e)}") from e
+
+    @monitor_transaction(op="db.revoked_token.revoke_user")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=False)
+    async def revoke_user(self, user_id: str, expires_at: datetime) -> datetime:
+        revoked_at = datetime.utcnow()
+        try:
+            with timed("db"), operation_timeout():
+                await self.collection.insert_one({
+                    "kind": "user",
+                    "user_id": user_id,
+                    "revoked_at": revoked_at,
+                    "expires_at": expires_at
+                })
+            return revoked_at
+        except Exception as e:
+            raise DatabaseException(f"Failed to revoke user tokens: {str(e)}") from e
+
+    @monitor_transaction(op="db.revoked_token.is_revoked")
+    @circuit_breaker("mongodb.read")
+    @retryable(idempotent=True)
+    async def is_revoked(self, jti: str) -> bool:
+        try:
+            with timed("db"), operation_timeout():
+                return await self.collection.find_one({"jti": jti}, {"_id": 1}) is not None
+        except Exception as e:
+            raise DatabaseException(f"Failed to check revoked token: {str(e)}") from e
+
+    @monitor_transaction(op="db.revoked_token.changed_since")
+    @circuit_breaker("mongodb.read")
+    @retryable(idempotent=True)
+    async def changed_since(self, since: datetime) -> List[Dict[str, Any]]:
+        """Entries revoked at or after ``since``, oldest first."""
+        try:
+            with timed("db"), operation_timeout():
+                cursor = self.collection.find(
+                    {"revoked_at": {"$gte": since}, "expires_at": {"$gt": datetime.utcnow()}},
+                    {"_id": 0, "kind": 1, "jti": 1, "user_id": 1, "revoked_at": 1, "expires_at": 1}
+                ).sort("revoked_at", 1)
+                return await cursor.to_list(length=None)
+        except Exception as e:
+            raise DatabaseException(f"Failed to list revoked tokens: {str(e)}") from e
\ No newline at end of file
@@ -0,0 +1,60 @@
+from typing import TYPE_CHECKING, List
+from datetime import datetime
+from app.models.domain.signing_key import SigningKeyInDB
+from app.core.monitoring.decorators import monitor_transaction
+from app.core.monitoring.timing import timed
+from app.core.deadline import operation_timeout
+from app.core.circuit_breaker import circuit_breaker
+from app.core.retry import retryable
+from app.core.exceptions import DatabaseException
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+
+class SigningKeyRepository:
+    def __init__(self, client: "AsyncIOMotorClient"):
+        self.client: "AsyncIOMotorClient" = client
+        self.database: "AsyncIOMotorDatabase" = client[settings.db.MONGODB_DB_NAME]
+        self.collection: "AsyncIOMotorCollection" = self.database["signing_keys"]
+
+    async def ensure_indexes(self) -> None:
+        try:
+            await self.collection.create_index("generation", unique=True)
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        except Exception as e:
+            raise DatabaseException(f"Failed to create signing key indexes: {str(e)}") from e
+
+    @monitor_transaction(op="db.signing_key.insert_if_absent")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=True)
+    async def insert_if_absent(self, signing_key: SigningKeyInDB) -> bool:
+        """Store ``signing_key`` unless its generation already has one; True if it was stored."""
+        try:
+            with timed("pydantic"):
+                document = signing_key.dict()
+            with timed("db"), operation_timeout():
+                result = await self.collection.update_one(
+                    {"generation": signing_key.generation},
+                    {"$setOnInsert": document},
+                    upsert=True
+                )
+            return result.upserted_id is not None
+        except Exception as e:
+            raise DatabaseException(f"Failed to store signing key: {str(e)}") from e
+
+    @monitor_transaction(op="db.signing_key.list_published")
+    @circuit_breaker("mongodb.read")
+    @retryable(idempotent=True)
+    async def list_published(self) -> List[SigningKeyInDB]:
+        """Keys that have not expired, oldest generation first."""
+        try:
+            with timed("db"), operation_timeout():
+                cursor = self.collection.find(
+                    {"expires_at": {"$gt": datetime.utcnow()}}, {"_id": 0}
+                ).sort("generation", 1)
+                documents = await cursor.to_list(length=None)
+            with timed("pydantic"):
+                return [SigningKeyInDB(**document) for document in documents]
+        except Exception as e:
+            raise DatabaseException(f"Failed to list signing keys: {str(e)}") from e
\ No newline at end of file
@@ -1,11 +1,18 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from datetime import datetime
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
 from app.models.domain.user import UserInDB
 from app.core.monitoring.decorators import monitor_transaction
+from app.core.monitoring.timing import timed
+from app.core.deadline import operation_timeout
+from app.core.circuit_breaker import circuit_breaker
+from app.core.retry import retryable
 from app.core.exceptions import DatabaseException, NotFoundException
 from app.core.config import settings
 from bson import ObjectId
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+
 class UserRepository:
     def __init__(self, client: "AsyncIOMotorClient"):
         self.client: "AsyncIOMotorClient" = client
@@ -13,31 +20,46 @@ class UserRepository:
         self.collection: "AsyncIOMotorCollection" = self.database["users"]
 
     @monitor_transaction(op="db.user.create")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=False)
     async def create(self, user: UserInDB) -> UserInDB:
         try:
-            result = await self.collection.insert_one(user.dict())
+            with timed("pydantic"):
+                document = user.dict()
+            with timed("db"), operation_timeout():
+                result = await self.collection.insert_one(document)
             user.id = str(result.inserted_id)
             return user
         except Exception as e:
-            raise DatabaseException(f"Failed to create user: {str(e)}")
+            raise DatabaseException(f"Failed to create user: {str(e)}") from e
 
     @monitor_transaction(op="db.user.get_by_email")
+    @circuit_breaker("mongodb.read")
+    @retryable(idempotent=True)
     async def get_by_email(self, email: str) -> Optional[UserInDB]:
         try:
-            user_data = await self.collection.find_one({"email": email})
-            return UserInDB(**user_data) if user_data else None
+            with timed("db"), operation_timeout():
+                user_data = await self.collection.find_one({"email": email})
+            with timed("pydantic"):
+                return UserInDB(**user_data) if user_data else None
         except Exception as e:
-            raise DatabaseException(f"Failed to get user by email: {str(e)}")
+            raise DatabaseException(f"Failed to get user by email: {str(e)}") from e
 
     @monitor_transaction(op="db.user.get_by_refresh_token")
+    @circuit_breaker("mongodb.read")
+    @retryable(idempotent=True)
     async def user_by_refresh_token(self, refresh_token: str) -> Optional[UserInDB]:
         try:
-            user_data = await self.collection.find_one({"refresh_token": refresh_token})
-            return UserInDB(**user_data) if user_data else None
+            with timed("db"), operation_timeout():
+                user_data = await self.collection.find_one({"refresh_token": refresh_token})
+            with timed("pydantic"):
+                return UserInDB(**user_data) if user_data else None
         except Exception as e:
-            raise DatabaseException(f"Failed to get user by refresh token: {str(e)}")
+            raise DatabaseException(f"Failed to get user by refresh token: {str(e)}") from e
 
     @monitor_transaction(op="db.user.update_refresh_token")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=True)
     async def update_refresh_token(
         self, 
         user_id: str, 
@@ -45,32 +67,34 @@ class UserRepository:
         expires: Optional[datetime]
     ) -> None:
         try:
-            user = await self.collection.find_one({"_id": ObjectId(user_id)})
-            print("--USER--", user, user_id)
-            await self.collection.update_one(
-                {"_id": ObjectId(user_id)},
-                {
-                    "$set": {
-                        "refresh_token": refresh_token,
-                        "refresh_token_expires": expires,
-                        "updated_at": datetime.utcnow()
+            with timed("db"), operation_timeout():
+                await self.collection.update_one(
+                    {"_id": ObjectId(user_id)},
+                    {
+                        "$set": {
+                            "refresh_token": refresh_token,
+                            "refresh_token_expires": expires,
+                            "updated_at": datetime.utcnow()
+                        }
                     }
-                }
-            )
+                )
         except Exception as e:
-            raise DatabaseException(f"Failed to update refresh token: {str(e)}")
+            raise DatabaseException(f"Failed to update refresh token: {str(e)}") from e
 
     @monitor_transaction(op="db.user.update_last_login")
+    @circuit_breaker("mongodb.write")
+    @retryable(idempotent=True)
     async def update_last_login(self, user_id: str) -> None:
         try:
-            await self.collection.update_one(
-                {"_id": ObjectId(user_id)},
-                {
-                    "$set": {
-                        "last_login": datetime.utcnow(),
-                        "updated_at": datetime.utcnow()
+            with timed("db"), operation_timeout():
+                await self.collection.update_one(
+                    {"_id": ObjectId(user_id)},
+                    {
+                        "$set": {
+                            "last_login": datetime.utcnow(),
+                            "updated_at": datetime.utcnow()
+                        }
                     }
-                }
-            )
+                )
         except Exception as e:
-            raise DatabaseException(f"Failed to update last login: {str(e)}")
\ No newline at end of file
+            raise DatabaseException(f"Failed to update last login: {str(e)}") from e
\ No newline at end of file
@@ -11,4 +11,7 @@ class RefreshTokenRequest(BaseModel):
 
 class UserLogin(BaseModel):
     email: EmailStr
-    password: str
\ No newline at end of file
+    password: str
+
+class MessageResponse(BaseModel):
+    message: str
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""
+Production launcher.
+
+Pre-forks uvicorn workers that share one listening socket (or bind their
+own with SO_REUSEPORT), supervises them, and replaces workers that die,
+served ``SERVER_MAX_REQUESTS`` requests or grew past ``SERVER_MAX_RSS_MB``.
+The application is imported once in the master so workers share its memory
+copy-on-write.
+
+    python -m app.server
+"""
+from importlib.util import find_spec
+from math import ceil
+from multiprocessing.context import ForkProcess
+from typing import Any, Dict, List, Optional
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.log_queue import configure_logging
+
+logger = logging.getLogger("app.server")
+
+SUPERVISE_INTERVAL = 1.0
+RESTART_BACKOFF_MAX = 30.0
+
+def cpu_quota() -> Optional[float]:
+    """CPUs granted by the cgroup quota (v2 or v1), or None when unlimited."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as quota_file:
+            quota = int(quota_file.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as period_file:
+            period = int(period_file.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+def default_workers() -> int:
+    """One worker per usable CPU, limited by the container's CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, ceil(quota))
+    return max(1, cpus)
+
+def event_loop_and_http() -> Dict[str, str]:
+    return {
+        "loop": "uvloop" if find_spec("uvloop") else "asyncio",
+        "http": "httptools" if find_spec("httptools") else "h11"
+    }
+
+def resident_memory(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def bind_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(settings.app.SERVER_BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+def run_worker(app: Any, sock: Optional[socket.socket], config_kwargs: Dict[str, Any]) -> None:
+    # Signal handlers inherited from the master belong to the supervisor
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(sig, signal.SIG_DFL)
+
+    if sock is None:
+        sock = bind_socket(config_kwargs["host"], config_kwargs["port"], reuse_port=True)
+    max_requests = settings.app.SERVER_MAX_REQUESTS
+    if max_requests:
+        # Jitter so workers started together do not all recycle together
+        max_requests += random.randint(0, settings.app.SERVER_MAX_REQUESTS_JITTER)
+
+    config = uvicorn.Config(app, limit_max_requests=max_requests or None, **config_kwargs)
+    uvicorn.Server(config).run(sockets=[sock])
+
+class Supervisor:
+    """Keeps ``workers`` worker processes running until asked to stop."""
+
+    def __init__(self, app: Any, workers: int, config_kwargs: Dict[str, Any]):
+        self.app = app
+        self.workers = workers
+        self.config_kwargs = config_kwargs
+        self.reuse_port = settings.app.SERVER_REUSE_PORT
+        self.max_rss = settings.app.SERVER_MAX_RSS_MB * 1024 * 1024
+        self.stop_timeout = settings.app.SHUTDOWN_DRAIN_DELAY + settings.app.SHUTDOWN_TIMEOUT + 10
+        self.processes: List[ForkProcess] = []
+        self.retiring: List[ForkProcess] = []
+        self._socket: Optional[socket.socket] = None
+        self._context = multiprocessing.get_context("fork")
+        self._should_exit = False
+        self._should_reload = False
+        self._restart_backoff = 0.0
+
+    def run(self) -> None:
+        if not self.reuse_port:
+            self._socket = bind_socket(
+                self.config_kwargs["host"], self.config_kwargs["port"], reuse_port=False
+            )
+
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        logger.info(
+            "Starting workers",
+            extra={
+                "workers": self.workers,
+                "reuse_port": self.reuse_port,
+                **event_loop_and_http()
+            }
+        )
+        for _ in range(self.workers):
+            self.processes.append(self._spawn())
+
+        while not self._should_exit:
+            time.sleep(SUPERVISE_INTERVAL)
+            if self._should_reload:
+                self._should_reload = False
+                for process in list(self.processes):
+                    self._recycle(process, "reload")
+            self._supervise()
+
+        self._shutdown()
+
+    def _spawn(self) -> ForkProcess:
+        process = self._context.Process(
+            target=run_worker,
+            args=(self.app, self._socket, self.config_kwargs),
+            name="uvicorn-worker"
+        )
+        process.start()
+        logger.info("Worker started", extra={"pid": process.pid})
+        return process
+
+    def _supervise(self) -> None:
+        for process in list(self.processes):
+            if not process.is_alive():
+                self.processes.remove(process)
+                # Exit code 0 means the worker recycled itself after max requests
+                if process.exitcode != 0:
+                    logger.error(
+                        "Worker died",
+                        extra={"pid": process.pid, "exitcode": process.exitcode}
+                    )
+                    time.sleep(self._restart_backoff)
+                    self._restart_backoff = min(RESTART_BACKOFF_MAX, self._restart_backoff * 2 or 0.5)
+                else:
+                    self._restart_backoff = 0.0
+                self.processes.append(self._spawn())
+            elif self.max_rss and resident_memory(process.pid) > self.max_rss:
+                self._recycle(process, "rss_limit")
+
+        for process in list(self.retiring):
+            if not process.is_alive():
+                process.join()
+                self.retiring.remove(process)
+
+    def _recycle(self, process: ForkProcess, reason: str) -> None:
+        """Start the replacement first, then drain the old worker."""
+        logger.info("Recycling worker", extra={"pid": process.pid, "reason": reason})
+        self.processes.remove(process)
+        self.processes.append(self._spawn())
+        self.retiring.append(process)
+        # SIGINT goes straight to uvicorn's graceful shutdown: the worker
+        # stops accepting and finishes what it has, while siblings keep
+        # serving on the shared socket. SIGTERM would fail readiness for
+        # the whole pod during the drain delay; that is for pod shutdown only.
+        os.kill(process.pid, signal.SIGINT)
+
+    def _shutdown(self) -> None:
+        logger.info("Stopping workers", extra={"workers": len(self.processes)})
+        processes = self.processes + self.retiring
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.stop_timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning("Killing worker after stop timeout", extra={"pid": process.pid})
+                process.kill()
+                process.join()
+        if self._socket is not None:
+            self._socket.close()
+
+    def _handle_exit(self, sig: int, frame: Any) -> None:
+        self._should_exit = True
+
+    def _handle_reload(self, sig: int, frame: Any) -> None:
+        self._should_reload = True
+
+def run(app: Any = None) -> None:
+    # Configured here rather than on import of app.main, so the supervisor
+    # logs too and preloaded workers inherit the setup
+    configure_logging(settings.logging)
+
+    if settings.app.RELOAD:
+        # Development: uvicorn's reloader needs an import string
+        uvicorn.run(
+            "app.main:app",
+            host=settings.app.HOST,
+            port=settings.app.PORT,
+            reload=True,
+            log_config=None
+        )
+        return
+
+    if app is None:
+        if settings.app.SERVER_PRELOAD:
+            # Import once in the master so workers share it copy-on-write
+            from app.main import app
+        else:
+            app = "app.main:app"
+
+    config_kwargs = {
+        "host": settings.app.HOST,
+        "port": settings.app.PORT,
+        "log_config": None,  # logging is configured above
+        "access_log": False,  # RequestLoggingMiddleware writes access logs
+        "proxy_headers": False,  # forwarded-for is resolved by get_client_ip
+        "timeout_graceful_shutdown": int(settings.app.SHUTDOWN_TIMEOUT),
+        **event_loop_and_http()
+    }
+    workers = settings.app.WORKERS_COUNT or default_workers()
+    Supervisor(app, workers, config_kwargs).run()
+
+if __name__ == "__main__":
+    run()
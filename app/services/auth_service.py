@@ -1,15 +1,20 @@
 from datetime import datetime
-from typing import Tuple, Optional
+from math import ceil
+from typing import Any, Dict, Tuple, Optional
 from app.models.domain import UserInDB, UserResponse, SignupRequest, ProfileInDB
 from app.repositories import UserRepository, ProfileRepository
-from app.core.security.security import get_password_hash, verify_password, create_access_token, create_refresh_token
+from app.core.security.security import get_password_hash_async, verify_password_async, create_access_token, create_refresh_token
+from app.core.security.login_throttle import login_throttle
+from app.core.security.revocation import token_revocation_list
 from app.core.exceptions import (
     UnauthorizedException,
     ConflictException,
+    RateLimitException,
     ErrorDetail
 )
 from app.core.monitoring.decorators import monitor_transaction
-import sentry_sdk
+from app.core.monitoring.sentry import add_breadcrumb, capture_exception
+from app.core.config import settings
 
 class AuthService:
     def __init__(
@@ -30,7 +35,7 @@ class AuthService:
                     details=[ErrorDetail(field="email", message="Email already registered")]
                 )
 
-            hashed_password = get_password_hash(signup_data.password)
+            hashed_password = await get_password_hash_async(signup_data.password)
             refresh_token, refresh_expires = create_refresh_token()
             
             user = UserInDB(
@@ -62,7 +67,7 @@ class AuthService:
                 **created_profile.dict()
             }
 
-            sentry_sdk.add_breadcrumb(
+            add_breadcrumb(
                 category="auth",
                 message="User created successfully",
                 level="info",
@@ -72,7 +77,7 @@ class AuthService:
             return UserResponse(**response_data), access_token, refresh_token
 
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            capture_exception(e)
             raise
 
     @monitor_transaction(op="auth.refresh_token", tags={"service": "auth->refresh_token"})
@@ -93,25 +98,44 @@ class AuthService:
             return access_token, new_refresh_token
 
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            capture_exception(e)
             raise
     
     @monitor_transaction(op="auth.login", tags={"service": "auth->login"})
     async def login(self, email: str, password: str) -> Tuple[str, str]:
         """Login user and return tokens"""
         try:
-            user = await self.user_repository.get_by_email(email)
-            if not user:
-                raise UnauthorizedException(
-                    message="Invalid credentials",
-                    details=[ErrorDetail(field="email", message="Invalid email or password")]
-                )
-
-            if not verify_password(password, user.password):
-                raise UnauthorizedException(
-                    message="Invalid credentials",
-                    details=[ErrorDetail(field="password", message="Invalid email or password")]
-                )
+            # Refuse throttled accounts before the lookup and bcrypt cost anything,
+            # holding a slot so concurrent guesses cannot all pass the check
+            throttled = settings.security.LOGIN_THROTTLE_ENABLED
+            if throttled:
+                retry_after = login_throttle.acquire(email)
+                if retry_after:
+                    raise RateLimitException(
+                        message="Too many failed login attempts",
+                        headers={"Retry-After": str(ceil(retry_after))}
+                    )
+
+            try:
+                user = await self.user_repository.get_by_email(email)
+                if not user:
+                    login_throttle.record_failure(email)
+                    raise UnauthorizedException(
+                        message="Invalid credentials",
+                        details=[ErrorDetail(field="email", message="Invalid email or password")]
+                    )
+
+                if not await verify_password_async(password, user.password):
+                    login_throttle.record_failure(email)
+                    raise UnauthorizedException(
+                        message="Invalid credentials",
+                        details=[ErrorDetail(field="password", message="Invalid email or password")]
+                    )
+
+                login_throttle.record_success(email)
+            finally:
+                if throttled:
+                    login_throttle.release(email)
 
             await self.user_repository.update_last_login(user.id)
             
@@ -124,7 +148,7 @@ class AuthService:
                 refresh_expires
             )
 
-            sentry_sdk.add_breadcrumb(
+            add_breadcrumb(
                 category="auth",
                 message="User logged in successfully",
                 level="info",
@@ -134,5 +158,34 @@ class AuthService:
             return access_token, refresh_token
 
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            capture_exception(e)
+            raise
+
+    @monitor_transaction(op="auth.logout", tags={"service": "auth->logout"})
+    async def logout(self, claims: Dict[str, Any]) -> None:
+        """Revoke the presented access token and the user's refresh token"""
+        try:
+            await token_revocation_list.revoke_token(claims)
+            await self.user_repository.update_refresh_token(claims["sub"], None, None)
+
+        except Exception as e:
+            capture_exception(e)
             raise
+
+    @monitor_transaction(op="auth.logout_all", tags={"service": "auth->logout_all"})
+    async def revoke_all_sessions(self, user_id: str) -> None:
+        """Revoke every access token issued to the user so far and their refresh token"""
+        try:
+            await token_revocation_list.revoke_user(user_id)
+            await self.user_repository.update_refresh_token(user_id, None, None)
+
+            add_breadcrumb(
+                category="auth",
+                message="All sessions revoked",
+                level="info",
+                data={"user_id": user_id}
+            )
+
+        except Exception as e:
+            capture_exception(e)
+            raise
\ No newline at end of file
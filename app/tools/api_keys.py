@@ -0,0 +1,67 @@
+"""
+Issue and revoke API keys.
+
+    python -m app.tools.api_keys create billing-sync --scopes invoices:read,invoices:write --rate-limit 600
+    python -m app.tools.api_keys revoke <key id>
+
+The key is printed once on creation; only its HMAC is stored.
+"""
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import sys
+
+from app.core.config import settings
+from app.core.db import mongodb
+from app.core.security.api_keys import api_key_authenticator, generate_api_key
+from app.models.domain.api_key import ApiKeyInDB
+from app.repositories import ApiKeyRepository
+
+async def create(args: argparse.Namespace, repository: ApiKeyRepository) -> int:
+    key = generate_api_key()
+    api_key = ApiKeyInDB(
+        name=args.name,
+        scopes=[scope for scope in args.scopes.split(",") if scope],
+        rate_limit_per_minute=args.rate_limit,
+        owner_id=args.owner,
+        expires_at=datetime.utcnow() + timedelta(days=args.expires_in_days) if args.expires_in_days else None,
+        key_prefix=key[:len(settings.security.API_KEY_PREFIX) + 8],
+        key_hash=api_key_authenticator.hash_key(key)
+    )
+    await repository.ensure_indexes()
+    api_key = await repository.create(api_key)
+    print(f"id:  {api_key.id}")
+    print(f"key: {key}")
+    return 0
+
+async def revoke(args: argparse.Namespace, repository: ApiKeyRepository) -> int:
+    if not await repository.revoke(args.key_id):
+        print(f"No active key with id {args.key_id}", file=sys.stderr)
+        return 1
+    print(f"Revoked {args.key_id}; cached copies expire within {settings.security.API_KEY_CACHE_TTL:g}s")
+    return 0
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = commands.add_parser("create", help="issue a new key")
+    create_parser.add_argument("name")
+    create_parser.add_argument("--scopes", default="", help="comma-separated scopes")
+    create_parser.add_argument("--rate-limit", type=int, help="requests per minute for this key")
+    create_parser.add_argument("--owner", help="owning user id")
+    create_parser.add_argument("--expires-in-days", type=int)
+
+    revoke_parser = commands.add_parser("revoke", help="revoke a key by id")
+    revoke_parser.add_argument("key_id")
+
+    args = parser.parse_args()
+    await mongodb.connect_to_mongodb(settings.db.MONGODB_URL, **settings.db.mongodb_connection_params)
+    try:
+        repository = ApiKeyRepository(mongodb.client)
+        return await (create if args.command == "create" else revoke)(args, repository)
+    finally:
+        await mongodb.close_mongodb_connection()
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
\ No newline at end of file
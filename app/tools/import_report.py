@@ -0,0 +1,74 @@
+"""
+Import-time report.
+
+Imports a module in a fresh interpreter under ``python -X importtime`` and
+prints where the time went, grouped by top-level package. With ``--budget``
+it exits non-zero when the cold import takes longer, so CI can catch
+startup regressions:
+
+    python -m app.tools.import_report --budget 1500
+    python -m app.tools.import_report --module app.core.security.security --top 40
+"""
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import argparse
+import os
+import subprocess
+import sys
+
+def measure(module: str) -> List[Tuple[str, int, int]]:
+    """Import ``module`` cold; return (name, self_us, cumulative_us) per imported module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"Importing {module} failed")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+def group_by_package(rows: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    # Self times add up without double counting nested imports
+    packages: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    return packages
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main", help="module to import (default: app.main)")
+    parser.add_argument("--runs", type=int, default=3, help="imports to run; the fastest is reported")
+    parser.add_argument("--top", type=int, default=25, help="packages and modules to list")
+    parser.add_argument("--budget", type=float, help="fail when the import takes longer, in ms")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(max(args.runs, 1))]
+    rows = min(runs, key=lambda run: sum(self_us for _, self_us, _ in run))
+    total_ms = sum(self_us for _, self_us, _ in rows) / 1000
+
+    packages = sorted(group_by_package(rows).items(), key=lambda item: item[1], reverse=True)
+    print(f"{'package':<40} {'ms':>10} {'share':>7}")
+    for package, self_us in packages[:args.top]:
+        print(f"{package:<40} {self_us / 1000:>10.1f} {self_us / 10 / total_ms:>6.1f}%")
+
+    print(f"\n{'slowest modules (self)':<40} {'ms':>10} {'cumul.':>10}")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f"{name:<40} {self_us / 1000:>10.1f} {cumulative_us / 1000:>10.1f}")
+
+    print(f"\nimport {args.module}: {total_ms:.1f} ms over {len(rows)} modules (best of {len(runs)})")
+    if args.budget is not None and total_ms > args.budget:
+        print(f"Over budget: {total_ms:.1f} ms > {args.budget:.1f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,8 @@
+import os
+
+# Settings are read at import time; give the required ones test values
+# before anything under app/ is imported
+os.environ.setdefault("SECURITY_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DB_MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_MONGODB_DB_NAME", "test")
+os.environ.setdefault("LOG_LOG_TO_FILE", "false")
\ No newline at end of file
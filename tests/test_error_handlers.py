@@ -0,0 +1,76 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.core.exceptions import ErrorDetail, NotFoundException, ValidationException, setup_exception_handlers
+from app.core.exceptions.aggregator import ErrorLogAggregator
+from app.core.exceptions.base import ErrorResponse
+
+class Item(BaseModel):
+    name: str
+
+def _client():
+    app = FastAPI()
+    setup_exception_handlers(app)
+
+    @app.get("/missing")
+    async def missing():
+        raise NotFoundException("Item not found")
+
+    @app.get("/invalid")
+    async def invalid():
+        raise ValidationException("Invalid item", details=[ErrorDetail(field="name", message="required")])
+
+    @app.post("/items")
+    async def create(item: Item):
+        return item
+
+    return TestClient(app)
+
+def _matches_schema(body):
+    reference = ErrorResponse(**body).model_dump(mode="json")
+    assert body == {**reference, "timestamp": body["timestamp"]}
+
+def test_error_without_details_has_null_details():
+    response = _client().get("/missing")
+
+    body = response.json()
+    assert response.status_code == 404
+    assert body["details"] is None
+    assert (body["message"], body["path"], body["method"]) == ("Item not found", "/missing", "GET")
+    _matches_schema(body)
+
+def test_error_details_are_listed():
+    client = _client()
+
+    invalid = client.get("/invalid").json()
+    assert invalid["details"] == [{"field": "name", "message": "required"}]
+    _matches_schema(invalid)
+
+    validation = client.post("/items", json={}).json()
+    assert validation["status_code"] == 422
+    assert [detail["field"] for detail in validation["details"]] == ["name"]
+    _matches_schema(validation)
+
+def test_repeated_errors_are_logged_once_and_summarized(caplog):
+    aggregator = ErrorLogAggregator(interval=60.0, max_fingerprints=2)
+    caplog.set_level(logging.INFO, logger="app.core.exceptions.aggregator")
+
+    for _ in range(3):
+        aggregator.log(("NotFoundException", 404, "/items/{id}", "GET", "Not found"), logging.INFO, "Not found", extra={})
+    aggregator.log(("ConflictException", 409, "/items", "POST", "Exists"), logging.INFO, "Exists", extra={})
+    aggregator.log(("BadRequestException", 400, "/items", "POST", "Bad"), logging.INFO, "Bad", extra={})
+    assert [record.getMessage() for record in caplog.records] == ["Not found", "Exists"]
+
+    caplog.clear()
+    aggregator.flush()
+    assert [record.getMessage() for record in caplog.records] == [
+        "Not found (repeated 2 more times)",
+        "1 errors not logged: more than 2 distinct errors"
+    ]
+
+    caplog.clear()
+    aggregator.log(("NotFoundException", 404, "/items/{id}", "GET", "Not found"), logging.INFO, "Not found", extra={})
+    assert [record.getMessage() for record in caplog.records] == ["Not found"]
\ No newline at end of file
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_current_user
+from app.api.v1.endpoints.auth import AuthRouter
+from app.core.exceptions import setup_exception_handlers
+from app.core.idempotency import idempotency_store
+
+SIGNUP = {
+    "email": "alice@example.com",
+    "password": "Password1!",
+    "first_name": "Alice",
+    "last_name": "Example",
+    "address_one": "1 Example Street",
+    "accept_terms": True
+}
+
+class FakeIdempotencyRepository:
+    def __init__(self):
+        self.records = {}
+
+    async def reserve(self, record_id, owner, lease_until):
+        record = self.records.get(record_id)
+        if record is not None and not (
+            record["status"] == "pending" and (record["owner"] == owner or record["expires_at"] <= datetime.utcnow())
+        ):
+            return record
+        self.records[record_id] = {"status": "pending", "owner": owner, "expires_at": lease_until}
+        return None
+
+    async def complete(self, record_id, owner, response, expires_at):
+        if self.records.get(record_id, {}).get("owner") == owner:
+            self.records[record_id] = {"status": "complete", "response": response, "expires_at": expires_at}
+
+    async def release(self, record_id, owner):
+        record = self.records.get(record_id)
+        if record is not None and record["status"] == "pending" and record["owner"] == owner:
+            del self.records[record_id]
+
+class FakeAuthService:
+    def __init__(self):
+        self.calls = []
+
+    async def signup(self, user_data):
+        self.calls.append(("signup", user_data.email))
+        return None, f"access-{len(self.calls)}", f"refresh-{len(self.calls)}"
+
+    async def login(self, email, password):
+        self.calls.append(("login", email))
+        return f"access-{len(self.calls)}", f"refresh-{len(self.calls)}"
+
+    async def logout(self, claims):
+        self.calls.append(("logout", claims["sub"]))
+
+def _bearer_user(request: Request):
+    # The bearer token is the user id
+    return {"sub": request.headers["Authorization"].split()[1]}
+
+def _client(monkeypatch, auth_service):
+    monkeypatch.setattr(idempotency_store, "_repository", FakeIdempotencyRepository())
+    app = FastAPI()
+    setup_exception_handlers(app)
+    app.include_router(AuthRouter(auth_service).router, prefix="/auth")
+    app.dependency_overrides[get_current_user] = _bearer_user
+    return TestClient(app)
+
+def test_replayed_register_returns_the_stored_response_without_running_again(monkeypatch):
+    auth_service = FakeAuthService()
+    client = _client(monkeypatch, auth_service)
+
+    first = client.post("/auth/register", json=SIGNUP, headers={"Idempotency-Key": "signup-1"})
+    # A retry after a lost response never saw the cookies the first one set
+    client.cookies.clear()
+    retry = client.post("/auth/register", json=SIGNUP, headers={"Idempotency-Key": "signup-1"})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json() == {"message": "Registration successful"}
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.headers.get_list("set-cookie") == first.headers.get_list("set-cookie")
+    assert auth_service.calls == [("signup", "alice@example.com")]
+
+def test_replayed_login_does_not_verify_the_password_again(monkeypatch):
+    auth_service = FakeAuthService()
+    client = _client(monkeypatch, auth_service)
+    credentials = {"email": "alice@example.com", "password": "Password123"}
+
+    first = client.post("/auth/login", json=credentials, headers={"Idempotency-Key": "login-1"})
+    client.cookies.clear()
+    retry = client.post("/auth/login", json=credentials, headers={"Idempotency-Key": "login-1"})
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert auth_service.calls == [("login", "alice@example.com")]
+
+def test_a_key_reused_by_another_caller_is_a_different_request(monkeypatch):
+    auth_service = FakeAuthService()
+    client = _client(monkeypatch, auth_service)
+
+    alice = client.post("/auth/logout", headers={"Idempotency-Key": "logout", "Authorization": "Bearer alice"})
+    bob = client.post("/auth/logout", headers={"Idempotency-Key": "logout", "Authorization": "Bearer bob"})
+
+    assert alice.status_code == bob.status_code == 200
+    assert "idempotent-replayed" not in bob.headers
+    assert auth_service.calls == [("logout", "alice"), ("logout", "bob")]
+
+def test_a_key_abandoned_mid_request_is_free_once_its_lease_runs_out(monkeypatch):
+    auth_service = FakeAuthService()
+    client = _client(monkeypatch, auth_service)
+    repository = idempotency_store.repository
+    credentials = {"email": "alice@example.com", "password": "Password123"}
+
+    client.post("/auth/login", json=credentials, headers={"Idempotency-Key": "login-1"})
+    (record_id, record), = repository.records.items()
+    assert record["expires_at"] > datetime.utcnow() + idempotency_store.ttl - timedelta(minutes=1)
+
+    # Another worker claimed the key and died before finishing
+    repository.records[record_id] = {
+        "status": "pending", "owner": "dead-worker", "expires_at": datetime.utcnow() + idempotency_store.lease
+    }
+    client.cookies.clear()
+    blocked = client.post("/auth/login", json=credentials, headers={"Idempotency-Key": "login-1"})
+    assert blocked.status_code == 409
+
+    repository.records[record_id]["expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+    retry = client.post("/auth/login", json=credentials, headers={"Idempotency-Key": "login-1"})
+    assert retry.status_code == 200
+    assert "idempotent-replayed" not in retry.headers
+    assert repository.records[record_id]["status"] == "complete"
+    assert len(auth_service.calls) == 2
\ No newline at end of file
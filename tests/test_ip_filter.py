@@ -0,0 +1,53 @@
+from ipaddress import ip_address
+
+from app.core import ip_filter as ip_filter_module
+from app.core.ip_filter import CIDRSet, IPFilter, get_client_ip, parse_ip
+
+def test_cidr_set_matches_ipv4_and_ipv6_ranges():
+    cidr_set = CIDRSet(["10.0.0.0/8", "192.168.1.7/32", "2001:db8::/32"])
+
+    assert ip_address("10.20.30.40") in cidr_set
+    assert ip_address("192.168.1.7") in cidr_set
+    assert ip_address("192.168.1.8") not in cidr_set
+    assert ip_address("2001:db8::1") in cidr_set
+    assert ip_address("2001:db9::1") not in cidr_set
+    assert len(cidr_set) == 3
+
+def test_cidr_set_ignores_duplicates_and_invalid_lines():
+    cidr_set = CIDRSet.from_lines(["10.0.0.0/8  # office", "", "not-an-ip", "10.1.0.0/8"])
+
+    # 10.1.0.0/8 masks to 10.0.0.0/8
+    assert len(cidr_set) == 1
+
+def test_parse_ip_unmaps_ipv4_mapped_addresses():
+    assert parse_ip("::ffff:10.0.0.1") == ip_address("10.0.0.1")
+    assert parse_ip("garbage") is None
+
+def test_blacklist_wins_and_whitelist_restricts():
+    ip_filter = IPFilter(whitelist=["10.0.0.0/8"], blacklist=["10.0.0.66/32"])
+
+    assert ip_filter.check("10.0.0.1") is None
+    assert ip_filter.check("10.0.0.66") == "blacklist"
+    assert ip_filter.check("8.8.8.8") == "whitelist"
+    assert ip_filter.check(None) == "whitelist"
+
+async def test_reload_picks_up_file_ranges(tmp_path):
+    blacklist_file = tmp_path / "blacklist.txt"
+    blacklist_file.write_text("203.0.113.0/24\n")
+    ip_filter = IPFilter(blacklist_file=str(blacklist_file))
+
+    await ip_filter.reload()
+
+    assert ip_filter.check("203.0.113.9") == "blacklist"
+    assert ip_filter.check("198.51.100.1") is None
+
+def test_client_ip_trusts_forwarded_for_only_from_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(ip_filter_module, "trusted_proxies", CIDRSet(["10.0.0.0/8"]))
+    headers = [(b"x-forwarded-for", b"1.2.3.4, 198.51.100.7, 10.0.0.2")]
+
+    trusted = {"client": ("10.0.0.1", 1234), "headers": headers}
+    untrusted = {"client": ("198.51.100.9", 1234), "headers": headers}
+
+    # The client-supplied left-most value is never used
+    assert get_client_ip(trusted) == "198.51.100.7"
+    assert get_client_ip(untrusted) == "198.51.100.9"
\ No newline at end of file
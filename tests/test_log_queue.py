@@ -0,0 +1,62 @@
+import logging
+import multiprocessing
+import os
+
+from app.core.log_queue import CompressingRotatingFileHandler
+
+def _record(message):
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+def test_deferred_file_handler_writes_once_per_batch(tmp_path):
+    path = tmp_path / "app.log"
+    handler = CompressingRotatingFileHandler(path, maxBytes=1_000_000, backupCount=2, compress=False)
+    handler.deferred = True
+    try:
+        for i in range(10):
+            handler.handle(_record(f"record {i}"))
+        assert os.path.getsize(path) == 0
+
+        handler.flush_batch()
+        assert path.read_text().splitlines() == [f"record {i}" for i in range(10)]
+    finally:
+        handler.close()
+
+def test_rollover_uses_the_size_written_so_far(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("x" * 40 + "\n")
+    handler = CompressingRotatingFileHandler(path, maxBytes=100, backupCount=3, compress=False)
+    handler.deferred = True
+    try:
+        for i in range(6):
+            handler.handle(_record(f"record {i:02d} " + "y" * 10))  # 21 bytes a line
+        handler.flush_batch()
+    finally:
+        handler.close()
+
+    assert (tmp_path / "app.log.1").read_text().splitlines()[1:] == [
+        f"record {i:02d} " + "y" * 10 for i in range(2)
+    ]
+    assert path.read_text().splitlines() == [f"record {i:02d} " + "y" * 10 for i in range(2, 6)]
+
+def _log_from_worker():
+    logging.getLogger("worker").warning("from worker")
+
+def test_forked_workers_write_their_own_file(tmp_path):
+    path = tmp_path / "app.log"
+    handler = CompressingRotatingFileHandler(path, maxBytes=1_000_000, backupCount=2, compress=False)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    try:
+        handler.handle(_record("from parent"))
+        worker = multiprocessing.get_context("fork").Process(target=_log_from_worker)
+        worker.start()
+        worker.join(10)
+        handler.handle(_record("parent again"))
+    finally:
+        root.removeHandler(handler)
+        handler.close()
+
+    assert worker.exitcode == 0
+    assert path.read_text().splitlines() == ["from parent", "parent again"]
+    assert (tmp_path / f"app.{worker.pid}.log").read_text().splitlines() == ["from worker"]
\ No newline at end of file
@@ -0,0 +1,60 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core.exceptions import RateLimitException, UnauthorizedException
+from app.core.security.login_throttle import LoginThrottle
+from app.services import auth_service as auth_service_module
+from app.services.auth_service import AuthService
+
+def test_failures_past_the_free_attempts_lock_the_account():
+    throttle = LoginThrottle(free_attempts=2, base_delay=10.0)
+    for _ in range(3):
+        assert throttle.acquire("User@Example.com ") == 0
+        throttle.record_failure("user@example.com")
+        throttle.release("user@example.com")
+
+    assert throttle.acquire("USER@example.com") > 0
+
+def test_success_clears_the_account():
+    throttle = LoginThrottle(free_attempts=1, base_delay=10.0)
+    throttle.acquire("a@example.com")
+    throttle.record_failure("a@example.com")
+    throttle.record_success("a@example.com")
+    throttle.release("a@example.com")
+
+    assert throttle.acquire("a@example.com") == 0
+
+def test_concurrent_attempts_are_capped_before_any_failure_is_recorded():
+    throttle = LoginThrottle(free_attempts=3, base_delay=1.0)
+    admitted = [throttle.acquire("a@example.com") == 0 for _ in range(10)]
+
+    assert admitted.count(True) == 3
+    throttle.release("a@example.com")
+    assert throttle.acquire("a@example.com") == 0
+
+async def test_concurrent_logins_do_not_bypass_the_lockout(monkeypatch):
+    throttle = LoginThrottle(free_attempts=2, base_delay=60.0)
+    monkeypatch.setattr(auth_service_module, "login_throttle", throttle)
+    verifications = 0
+
+    async def slow_verify(password, hashed):
+        nonlocal verifications
+        verifications += 1
+        await asyncio.sleep(0.05)
+        return False
+
+    monkeypatch.setattr(auth_service_module, "verify_password_async", slow_verify)
+
+    class Users:
+        async def get_by_email(self, email):
+            return SimpleNamespace(id="u1", password="hash")
+
+    service = AuthService(Users(), None)
+    results = await asyncio.gather(
+        *(service.login("a@example.com", "guess") for _ in range(20)),
+        return_exceptions=True
+    )
+
+    assert verifications == 2
+    assert sum(isinstance(result, UnauthorizedException) for result in results) == 2
+    assert sum(isinstance(result, RateLimitException) for result in results) == 18
\ No newline at end of file
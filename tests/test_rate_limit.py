@@ -0,0 +1,70 @@
+import secrets
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.middlewares import RateLimitMiddleware
+from app.core.security.api_keys import api_key_authenticator, generate_api_key
+from app.models.domain.api_key import ApiKeyInDB
+
+def _client(**options):
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return {}
+
+    @app.post("/api/v1/auth/login")
+    async def login():
+        return {}
+
+    app.add_middleware(RateLimitMiddleware, **{"rate_limit": 60, "burst": 10, **options})
+    return TestClient(app)
+
+def test_rotating_unknown_api_keys_share_the_ip_bucket():
+    client = _client()
+
+    statuses = [
+        client.get("/items", headers={"X-API-Key": "ak_" + secrets.token_urlsafe(32)}).status_code
+        for _ in range(20)
+    ]
+
+    assert statuses.count(200) == 10
+    assert statuses[-1] == 429
+
+def test_a_validated_api_key_gets_its_own_bucket_and_limit():
+    key = generate_api_key()
+    key_hash = api_key_authenticator.hash_key(key)
+    api_key_authenticator._store(
+        key_hash, ApiKeyInDB(name="ci", key_prefix=key[:8], key_hash=key_hash, rate_limit_per_minute=30)
+    )
+    client = _client()
+    try:
+        for _ in range(10):
+            client.get("/items")
+        assert client.get("/items").status_code == 429
+
+        statuses = [client.get("/items", headers={"X-API-Key": key}).status_code for _ in range(31)]
+        assert statuses.count(200) == 30
+        assert statuses[-1] == 429
+    finally:
+        api_key_authenticator.invalidate(key_hash)
+
+def test_login_attempts_spend_their_route_cost_whatever_key_they_carry():
+    client = _client(
+        rate_limit=settings.app.RATE_LIMIT_PER_MINUTE,
+        burst=settings.app.RATE_LIMIT_BURST,
+        route_costs=settings.app.RATE_LIMIT_ROUTE_COSTS
+    )
+    attempts = int(settings.app.RATE_LIMIT_BURST // settings.app.RATE_LIMIT_ROUTE_COSTS["/api/v1/auth/login"])
+
+    statuses = [
+        client.post("/api/v1/auth/login", headers={"X-API-Key": "ak_" + secrets.token_urlsafe(32)}).status_code
+        for _ in range(attempts + 5)
+    ]
+
+    assert statuses.count(200) == attempts
+    assert statuses[attempts:] == [429] * 5
+    # The same bucket pays for everything else the client sends
+    assert client.get("/items").status_code == 429
\ No newline at end of file
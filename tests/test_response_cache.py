@@ -0,0 +1,56 @@
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from starlette.middleware.gzip import GZipMiddleware
+
+from app.core.middlewares import CacheMiddleware
+
+def _client():
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.get("/items")
+    async def items(response: Response):
+        app.state.calls += 1
+        response.headers["X-Request-ID"] = f"request-{app.state.calls}"
+        return {"items": ["item"] * 200}
+
+    @app.get("/session")
+    async def session(response: Response):
+        app.state.calls += 1
+        response.set_cookie("session", f"session-{app.state.calls}")
+        return {}
+
+    app.add_middleware(GZipMiddleware, minimum_size=100)
+    app.add_middleware(CacheMiddleware, cache_time=60)
+    return app, TestClient(app)
+
+def test_each_encoding_gets_its_own_entry():
+    app, client = _client()
+
+    gzipped = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/items", headers={"Accept-Encoding": "identity"})
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    assert identity.json() == gzipped.json() == {"items": ["item"] * 200}
+    assert app.state.calls == 2
+
+def test_hits_replay_only_headers_describing_the_body():
+    app, client = _client()
+    client.get("/items", headers={"Accept-Encoding": "identity"})
+
+    hit = client.get("/items", headers={"Accept-Encoding": "identity"})
+
+    assert app.state.calls == 1
+    assert hit.headers["content-type"] == "application/json"
+    assert "x-request-id" not in hit.headers
+    assert hit.json() == {"items": ["item"] * 200}
+
+def test_responses_setting_cookies_are_not_cached():
+    app, client = _client()
+
+    first = client.get("/session")
+    second = client.get("/session")
+
+    assert app.state.calls == 2
+    assert first.cookies["session"] != second.cookies["session"]
\ No newline at end of file
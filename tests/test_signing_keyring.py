@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import keyring as keyring_module
+from app.core.security.keyring import SigningKeyring
+from app.core.security.security import create_access_token, verify_token
+
+class FakeSigningKeyRepository:
+    def __init__(self):
+        self.records = {}
+
+    async def ensure_indexes(self):
+        pass
+
+    async def insert_if_absent(self, signing_key):
+        if signing_key.generation in self.records:
+            return False
+        self.records[signing_key.generation] = signing_key
+        return True
+
+    async def list_published(self):
+        return [self.records[generation] for generation in sorted(self.records)]
+
+def _keyring(repository=None):
+    return SigningKeyring(
+        secret=settings.security.derive_key("jwt-signing-key-encryption"),
+        rotation_interval=timedelta(days=30),
+        token_lifetime=settings.security.access_token_expires,
+        repository=repository or FakeSigningKeyRepository()
+    )
+
+async def test_tokens_round_trip_through_the_keyring(monkeypatch):
+    signing_keyring = _keyring()
+    await signing_keyring.refresh()
+    monkeypatch.setattr(keyring_module, "signing_keyring", signing_keyring)
+
+    token = create_access_token({"sub": "user"})
+    claims = verify_token(token)
+
+    assert jwt.get_unverified_header(token)["alg"] == "ES256"
+    assert claims["sub"] == "user"
+    header, payload, signature = token.split(".")
+    assert verify_token(".".join((header, payload, signature[::-1]))) is None
+
+async def test_other_workers_verify_with_keys_loaded_from_the_repository(monkeypatch):
+    repository = FakeSigningKeyRepository()
+    signer, verifier = _keyring(repository), _keyring(repository)
+    await signer.refresh()
+    await verifier.refresh()
+
+    monkeypatch.setattr(keyring_module, "signing_keyring", signer)
+    token = create_access_token({"sub": "user"})
+    monkeypatch.setattr(keyring_module, "signing_keyring", verifier)
+
+    assert verify_token(token)["sub"] == "user"
+    # A keyring that never saw the kid refuses the token
+    monkeypatch.setattr(keyring_module, "signing_keyring", _keyring())
+    assert verify_token(token) is None
+
+async def test_legacy_hs256_tokens_are_accepted_only_until_the_cutoff(monkeypatch):
+    signing_keyring = _keyring()
+    await signing_keyring.refresh()
+    monkeypatch.setattr(keyring_module, "signing_keyring", signing_keyring)
+    legacy = jwt.encode(
+        {"sub": "user", "type": "access", "exp": datetime.utcnow() + timedelta(minutes=5)},
+        settings.security.SECRET_KEY,
+        algorithm="HS256"
+    )
+
+    monkeypatch.setattr(settings.security, "JWT_LEGACY_HS256_ACCEPT_UNTIL", datetime.utcnow() + timedelta(minutes=1))
+    claims = verify_token(legacy)
+    assert claims["sub"] == "user"
+    # No jti in the token; logout revokes it by digest
+    assert claims["jti"] == verify_token(legacy)["jti"]
+
+    monkeypatch.setattr(settings.security, "JWT_LEGACY_HS256_ACCEPT_UNTIL", datetime.utcnow() - timedelta(seconds=1))
+    assert verify_token(legacy) is None
+
+def test_each_purpose_gets_its_own_key():
+    keys = {
+        settings.security.derive_key(purpose)
+        for purpose in ("jwt-signing-key-encryption", "api-key-hmac", "profile-token")
+    }
+
+    assert len(keys) == 3
+    assert settings.security.SECRET_KEY.encode() not in keys
\ No newline at end of file
@@ -0,0 +1,16 @@
+import os
+
+from app.tools.import_report import measure
+
+# Generous next to a typical cold import (under 1s) so only real regressions fail
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", "1500"))
+LAZY_PACKAGES = {"motor", "sentry_sdk", "passlib", "jose"}
+
+def test_cold_import_stays_within_budget():
+    runs = [measure("app.main") for _ in range(3)]
+    total_ms = min(sum(self_us for _, self_us, _ in rows) for rows in runs) / 1000
+    assert total_ms <= STARTUP_BUDGET_MS, f"import app.main took {total_ms:.1f} ms"
+
+def test_heavy_packages_are_not_imported_at_startup():
+    imported = {name.split(".")[0] for name, _, _ in measure("app.main")}
+    assert not imported & LAZY_PACKAGES
\ No newline at end of file
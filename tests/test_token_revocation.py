@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.security.revocation import BloomFilter, TokenRevocationList
+
+class FakeRevokedTokenRepository:
+    def __init__(self):
+        self.entries = []
+
+    async def revoke_token(self, jti, user_id, expires_at):
+        revoked_at = datetime.utcnow()
+        self.entries.append({"kind": "token", "jti": jti, "user_id": user_id, "revoked_at": revoked_at})
+        return revoked_at
+
+    async def revoke_user(self, user_id, expires_at):
+        # MongoDB keeps milliseconds
+        now = datetime.utcnow()
+        revoked_at = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        self.entries.append({"kind": "user", "user_id": user_id, "revoked_at": revoked_at})
+        return revoked_at
+
+    async def is_revoked(self, jti):
+        return any(entry.get("jti") == jti for entry in self.entries)
+
+    async def changed_since(self, since):
+        return [entry for entry in self.entries if entry["revoked_at"] >= since]
+
+def _claims(sub, issued_at, jti="jti", sub_second=True):
+    epoch = issued_at.replace(tzinfo=timezone.utc).timestamp()
+    claims = {"sub": sub, "jti": jti, "iat": int(epoch), "exp": int(epoch) + 1800}
+    if sub_second:
+        claims["iat_ms"] = int(epoch) * 1000 + issued_at.microsecond // 1000
+    return claims
+
+def _at(epoch: float) -> datetime:
+    return datetime.utcfromtimestamp(epoch)
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+
+    assert all(f"jti-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+async def test_revoked_token_is_rejected_and_others_pass():
+    revocations = TokenRevocationList(repository=FakeRevokedTokenRepository())
+    revoked = _claims("user", datetime.utcnow(), jti="revoked")
+
+    await revocations.revoke_token(revoked)
+
+    assert await revocations.is_revoked(revoked)
+    assert not await revocations.is_revoked(_claims("user", datetime.utcnow(), jti="fresh"))
+
+async def test_other_workers_pick_up_revocations_on_refresh():
+    repository = FakeRevokedTokenRepository()
+    revoking, other = TokenRevocationList(repository=repository), TokenRevocationList(repository=repository)
+    await other.refresh()
+    claims = _claims("user", datetime.utcnow() - timedelta(seconds=5), jti="revoked")
+
+    await revoking.revoke_token(claims)
+    await revoking.revoke_user("other-user")
+    await other.refresh()
+
+    assert await other.is_revoked(claims)
+    assert await other.is_revoked(_claims("other-user", datetime.utcnow() - timedelta(seconds=5)))
+
+async def test_revoke_all_cutoff_orders_tokens_within_the_same_second():
+    repository = FakeRevokedTokenRepository()
+    repository.entries.append({"kind": "user", "user_id": "user", "revoked_at": _at(1_700_000_000.250)})
+    revocations = TokenRevocationList(repository=repository)
+    await revocations.refresh()
+
+    assert await revocations.is_revoked(_claims("user", _at(1_699_999_999.900)))
+    assert await revocations.is_revoked(_claims("user", _at(1_700_000_000.100)))
+    assert await revocations.is_revoked(_claims("user", _at(1_700_000_000.250)))
+    # Logged in again later in the same second: not revoked for its lifetime
+    assert not await revocations.is_revoked(_claims("user", _at(1_700_000_000.400)))
+    assert not await revocations.is_revoked(_claims("user", _at(1_700_000_001.000)))
+    # Tokens without iat_ms were issued before the revoke
+    assert await revocations.is_revoked(_claims("user", _at(1_700_000_000.900), sub_second=False))
+    assert not await revocations.is_revoked(_claims("other", _at(1_699_999_000.000)))
\ No newline at end of file